@@ -0,0 +1,62 @@
+"""Add composite indexes for hot lookups
+
+Revision ID: c4e1a9d27f3b
+Revises: 5f688340f500
+Create Date: 2026-10-17 09:12:40.511302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a9d27f3b'
+down_revision: Union[str, Sequence[str], None] = '5f688340f500'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) - keep in sync with __table_args__ in all_models.py
+INDEXES = [
+    ('ix_messages_channel_id_sent_at', 'messages', ['channel_id', 'sent_at', 'message_id']),
+    ('ix_notifications_user_id_is_read_created_at', 'notifications', ['user_id', 'is_read', 'created_at']),
+    ('ix_team_members_user_id', 'team_members', ['user_id']),
+    ('ix_tasks_sprint_id_status', 'tasks', ['sprint_id', 'status']),
+    ('ix_sprints_team_id', 'sprints', ['team_id']),
+    ('ix_checkpoints_team_id_milestone_id', 'checkpoints', ['team_id', 'milestone_id']),
+    ('ix_checkpoints_milestone_id', 'checkpoints', ['milestone_id']),
+    ('ix_submissions_checkpoint_id_submitted_at', 'submissions', ['checkpoint_id', 'submitted_at']),
+    ('ix_peer_reviews_team_id_reviewee_id', 'peer_reviews', ['team_id', 'reviewee_id']),
+    ('ix_mentoring_logs_team_id_created_at', 'mentoring_logs', ['team_id', 'created_at']),
+    ('ix_resources_team_id_created_at', 'resources', ['team_id', 'created_at']),
+    ('ix_class_enrollments_class_id_student_id', 'class_enrollments', ['class_id', 'student_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so each
+    # index is built in autocommit mode without locking writes on live tables.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
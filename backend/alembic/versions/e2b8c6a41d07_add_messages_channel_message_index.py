@@ -0,0 +1,41 @@
+"""Add (channel_id, message_id) index on messages for reconnect sync
+
+Revision ID: e2b8c6a41d07
+Revises: d7a3f5b2c918
+Create Date: 2026-10-17 16:41:03.118245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8c6a41d07'
+down_revision: Union[str, Sequence[str], None] = 'd7a3f5b2c918'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_channel_id_message_id',
+            'messages',
+            ['channel_id', 'message_id'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_channel_id_message_id',
+            table_name='messages',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
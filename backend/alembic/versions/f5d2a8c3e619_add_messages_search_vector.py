@@ -0,0 +1,55 @@
+"""Add generated tsvector column and GIN index on messages for full-text search
+
+Revision ID: f5d2a8c3e619
+Revises: e2b8c6a41d07
+Create Date: 2026-10-17 18:12:47.503921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5d2a8c3e619'
+down_revision: Union[str, Sequence[str], None] = 'e2b8c6a41d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the table once
+    op.add_column(
+        'messages',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', coalesce(content, ''))", persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_search_vector',
+            'messages',
+            ['search_vector'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_search_vector',
+            table_name='messages',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+    op.drop_column('messages', 'search_vector')
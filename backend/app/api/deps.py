@@ -14,6 +14,7 @@ from sqlalchemy.orm import selectinload
 from app.core import config, security
 from app.db.session import AsyncSessionLocal
 from app.models.all_models import User
+from app.services.principal_cache import principal_cache
 
 # OAuth2 scheme
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -55,13 +56,19 @@ async def get_current_user(
             detail="Could not validate credentials",
         )
 
-    # Fetch user from DB with eager loading of role relationship
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.role))
-        .where(User.user_id == token_data)
-    )
-    user = result.scalars().first()
+    cached = principal_cache.get(token_data)
+    if cached is not None:
+        user = await principal_cache.restore(db, cached)
+    else:
+        # Fetch user from DB with eager loading of role relationship
+        result = await db.execute(
+            select(User)
+            .options(selectinload(User.role))
+            .where(User.user_id == token_data)
+        )
+        user = result.scalars().first()
+        if user:
+            principal_cache.put(user)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -28,7 +28,7 @@ async def login_access_token(
     user = result.scalars().first()
 
     # 2. Kiểm tra mật khẩu
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+    if not user or not await security.verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password",
@@ -66,7 +66,7 @@ async def register_user(
 
     # 2. Hash password và tạo User
     try:
-        hashed_password = security.get_password_hash(user_in.password)
+        hashed_password = await security.get_password_hash_async(user_in.password)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
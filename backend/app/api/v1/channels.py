@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
 from app.models.all_models import Channel, Message, TeamMember, User
+from app.services.cache_invalidation import cache_invalidation
 
 router = APIRouter()
 
@@ -215,4 +216,5 @@ async def delete_channel(
 
     await db.delete(channel)
     await db.commit()
+    cache_invalidation.channel_deleted(channel_id)
     return None
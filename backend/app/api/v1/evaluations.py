@@ -351,20 +351,24 @@ async def get_individual_scores(
         .where(TeamMember.team_id == evaluation.team_id)
     )
     
+    # Get average peer rating for every student in one grouped query
+    peer_rating_result = await db.execute(
+        select(
+            PeerReview.reviewee_id,
+            func.avg(PeerReview.score),
+            func.count(PeerReview.review_id)
+        )
+        .where(PeerReview.team_id == evaluation.team_id)
+        .group_by(PeerReview.reviewee_id)
+    )
+    ratings = {row[0]: (row[1], row[2]) for row in peer_rating_result.all()}
+    
     individual_scores = []
     
     for member, user in members_result.all():
-        # Get average peer rating for this student
-        peer_rating_result = await db.execute(
-            select(func.avg(PeerReview.score), func.count(PeerReview.review_id))
-            .where(
-                PeerReview.reviewee_id == user.user_id,
-                PeerReview.team_id == evaluation.team_id
-            )
-        )
-        row = peer_rating_result.first()
-        avg_rating = float(row[0]) if row[0] else 10.0  # Default to 10 if no reviews
-        review_count = row[1] or 0
+        avg, count = ratings.get(user.user_id, (None, 0))
+        avg_rating = float(avg) if avg else 10.0  # Default to 10 if no reviews
+        review_count = count or 0
         
         # Calculate individual score using BR-01 formula
         individual_score = IndividualScoreCalculation.calculate(
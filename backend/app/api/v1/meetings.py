@@ -7,8 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.db.session import get_db
-from app.models.all_models import Team, TeamMember, User, Meeting, Notification
+from app.models.all_models import Team, TeamMember, User, Meeting
 from app.schemas.meeting import MeetingCreate, MeetingUpdate, MeetingResponse
+from app.services.notification_service import NotificationService
 
 router = APIRouter()
 
@@ -83,18 +84,19 @@ async def create_meeting(
         remind_at = remind_at.replace(tzinfo=timezone.utc)
 
     if remind_at > now_utc():
-        members = (await db.execute(select(TeamMember).where(TeamMember.team_id == payload.team_id))).scalars().all()
-        for m in members:
-            db.add(
-                Notification(
-                    user_id=m.user_id,
-                    title="Meeting reminder",
-                    message=f"Meeting '{payload.title}' starts at {payload.start_time.isoformat()}",
-                    notification_type="info",
-                    related_entity_type="meeting",
-                    related_entity_id=meeting.meeting_id,
-                )
-            )
+        member_ids = (
+            await db.execute(select(TeamMember.user_id).where(TeamMember.team_id == payload.team_id))
+        ).scalars().all()
+        # Một câu INSERT cho cả team, cùng transaction với meeting
+        await NotificationService.create_bulk(
+            db,
+            member_ids,
+            title="Meeting reminder",
+            content=f"Meeting '{payload.title}' starts at {payload.start_time.isoformat()}",
+            notification_type="info",
+            related_entity_type="meeting",
+            related_entity_id=meeting.meeting_id,
+        )
 
     await db.commit()
     await db.refresh(meeting)
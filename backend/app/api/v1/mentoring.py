@@ -14,6 +14,7 @@ from uuid import UUID
 from datetime import datetime, timezone
 
 from app.api.deps import get_db, get_current_user
+from app.dao.user_loader import UserLoader
 from app.models.all_models import MentoringLog, Team, TeamMember, User, Task, Sprint, PeerReview
 from app.services.ai_service import ai_service
 from app.services.notification_service import NotificationService
@@ -232,14 +233,16 @@ async def list_mentoring_logs(
     )
     logs = result.scalars().all()
     
+    users = UserLoader(db)
+    await users.load_many(log.mentor_id for log in logs)
+    
     response = []
     for log in logs:
-        mentor = await db.get(User, log.mentor_id)
         response.append(MentoringLogResponse(
             log_id=log.log_id,
             team_id=log.team_id,
             mentor_id=log.mentor_id,
-            mentor_name=mentor.full_name if mentor else "Unknown",
+            mentor_name=users.name(log.mentor_id),
             session_notes=log.session_notes,
             discussion_points=log.discussion_points,
             ai_suggestions=log.ai_suggestions,
@@ -2,17 +2,22 @@
 Messages API Endpoints - Phase 3
 """
 
+import html
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field
-from sqlalchemy import desc, func, select
+from sqlalchemy import REAL, asc, cast, desc, func, literal_column, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
+from app.dao.user_loader import UserLoader
 from app.models.all_models import Channel, Message, TeamMember, User
+from app.services.events import MessageCreated, MessageDeleted, MessageUpdated, event_bus
+from app.services.message_cache import message_cache
 
 router = APIRouter()
 
@@ -41,10 +46,56 @@ class MessageResponse(BaseModel):
 
 class MessageListResponse(BaseModel):
     messages: List[MessageResponse]
-    total: int
+    total: Optional[int] = None
     has_more: bool
     skip: int
     limit: int
+    next_cursor: Optional[int] = None
+
+
+class MessageSearchHit(MessageResponse):
+    rank: float
+    highlight: str
+
+
+class MessageSearchResponse(BaseModel):
+    results: List[MessageSearchHit]
+    has_more: bool
+    limit: int
+    next_cursor: Optional[str] = None
+
+
+# Same text search config as the generated messages.search_vector column
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+# ts_headline marks matches with private-use characters; the fragment is
+# HTML-escaped afterwards and the markers become <mark> tags.
+_HL_START, _HL_STOP = "\ue000", "\ue001"
+_HEADLINE_OPTIONS = (
+    f"StartSel={_HL_START}, StopSel={_HL_STOP}, "
+    'MaxFragments=2, MaxWords=20, MinWords=8, FragmentDelimiter=" … "'
+)
+
+
+def _render_highlight(fragment: str) -> str:
+    escaped = html.escape(fragment or "", quote=False)
+    return escaped.replace(_HL_START, "<mark>").replace(_HL_STOP, "</mark>")
+
+
+def _parse_search_cursor(cursor: str):
+    """Cursor "<rank>:<message_id>" from the previous page's last hit"""
+    try:
+        rank, message_id = cursor.split(":", 1)
+        return float(rank), int(message_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor tìm kiếm không hợp lệ",
+        )
+
+
+def cached_message(message: MessageResponse) -> dict:
+    """Message as list_messages renders it, for the hot-channel cache."""
+    return jsonable_encoder(message.model_copy(update={"is_edited": False}))
 
 
 @router.post("/", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
@@ -70,6 +121,7 @@ async def send_message(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bạn phải là thành viên của team mới có thể gửi tin nhắn",
         )
+    message_cache.remember_member(channel.team_id, current_user.user_id)
 
     new_message = Message(
         channel_id=message_data.channel_id,
@@ -80,7 +132,7 @@ async def send_message(
     await db.commit()
     await db.refresh(new_message)
 
-    return MessageResponse(
+    response = MessageResponse(
         message_id=new_message.message_id,
         channel_id=new_message.channel_id,
         sender_id=new_message.sender_id,
@@ -89,6 +141,13 @@ async def send_message(
         sent_at=new_message.sent_at,
         is_edited=False,
     )
+    message_cache.put(response.channel_id, cached_message(response))
+    event_bus.publish(MessageCreated(
+        actor_id=current_user.user_id,
+        channel_id=response.channel_id,
+        message=response.model_dump(),
+    ))
+    return response
 
 
 @router.get("/", response_model=MessageListResponse)
@@ -96,9 +155,31 @@ async def list_messages(
     channel_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    before_id: Optional[int] = Query(None, ge=1, description="Cursor: messages older than this message_id"),
+    after_id: Optional[int] = Query(None, ge=1, description="Cursor: messages newer than this message_id"),
+    include_total: bool = Query(False, description="Run an exact count() over the channel"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    if before_id is not None and after_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Chỉ được dùng một trong before_id hoặc after_id",
+        )
+
+    # Newest page of a hot channel: served from memory, no SQL
+    use_cache = (
+        message_cache.enabled
+        and before_id is None
+        and after_id is None
+        and not skip
+        and not include_total
+        and limit <= message_cache.per_channel
+    )
+    cached = message_cache.newest_page(channel_id, limit) if use_cache else None
+    if cached is not None and message_cache.is_member(cached[0], current_user.user_id):
+        return _cached_list_response(cached, limit)
+
     channel = await db.get(Channel, channel_id)
     if not channel:
         raise HTTPException(
@@ -116,43 +197,92 @@ async def list_messages(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bạn không có quyền xem tin nhắn trong channel này",
         )
-
-    count_result = await db.execute(
-        select(func.count()).where(Message.channel_id == channel_id)
-    )
-    total = count_result.scalar() or 0
-
-    result = await db.execute(
-        select(Message)
-        .where(Message.channel_id == channel_id)
-        .order_by(desc(Message.sent_at))
-        .offset(skip)
-        .limit(limit + 1)
-    )
+    message_cache.remember_member(channel.team_id, current_user.user_id)
+    if cached is not None:
+        return _cached_list_response(cached, limit)
+
+    total = None
+    if include_total:
+        count_result = await db.execute(
+            select(func.count()).where(Message.channel_id == channel_id)
+        )
+        total = count_result.scalar() or 0
+
+    query = select(Message).where(Message.channel_id == channel_id)
+    cursor_id = before_id or after_id
+    newest_first = after_id is None
+
+    if cursor_id is not None:
+        anchor = await db.get(Message, cursor_id)
+        if not anchor or anchor.channel_id != channel_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor không hợp lệ cho channel này",
+            )
+        # Row comparison lets Postgres seek straight into the
+        # (channel_id, sent_at, message_id) index instead of skipping rows.
+        position = tuple_(Message.sent_at, Message.message_id)
+        anchor_position = tuple_(anchor.sent_at, anchor.message_id)
+        if before_id is not None:
+            query = query.where(position < anchor_position)
+        else:
+            query = query.where(position > anchor_position)
+
+    if newest_first:
+        query = query.order_by(desc(Message.sent_at), desc(Message.message_id))
+    else:
+        query = query.order_by(asc(Message.sent_at), asc(Message.message_id))
+
+    if cursor_id is None and skip:
+        query = query.offset(skip)
+
+    # A cache miss loads the whole ring buffer, not just this page
+    fetch_limit = message_cache.capacity if use_cache else limit + 1
+    if use_cache:
+        message_cache.begin_load(channel_id)
+    try:
+        result = await db.execute(query.limit(fetch_limit))
+    except Exception:
+        message_cache.abort_load(channel_id)
+        raise
     messages = result.scalars().all()
 
+    complete = len(messages) < fetch_limit
     has_more = len(messages) > limit
-    if has_more:
+    if not use_cache:
         messages = messages[:limit]
 
+    next_cursor = messages[limit - 1].message_id if has_more else None
+
+    users = UserLoader(db)
+    users.prime(current_user)
+    await users.load_many(msg.sender_id for msg in messages)
+
     response_messages = []
     for msg in messages:
-        sender = await db.get(User, msg.sender_id)
-        sender_name = sender.full_name if sender else "Unknown"
-
         response_messages.append(
             MessageResponse(
                 message_id=msg.message_id,
                 channel_id=msg.channel_id,
                 sender_id=msg.sender_id,
-                sender_name=sender_name,
+                sender_name=users.name(msg.sender_id),
                 content=msg.content,
                 sent_at=msg.sent_at,
                 is_edited=False,
             )
         )
 
-    response_messages.reverse()
+    if use_cache:
+        message_cache.load(
+            channel_id,
+            channel.team_id,
+            [jsonable_encoder(msg) for msg in response_messages],
+            complete,
+        )
+        response_messages = response_messages[:limit]
+
+    if newest_first:
+        response_messages.reverse()
 
     return MessageListResponse(
         messages=response_messages,
@@ -160,6 +290,122 @@ async def list_messages(
         has_more=has_more,
         skip=skip,
         limit=limit,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/search", response_model=MessageSearchResponse)
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=200, description="Web-search syntax: words, \"phrase\", -exclude, or"),
+    channel_id: Optional[int] = Query(None, description="Only search this channel"),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Full-text search over messages in channels of the caller's teams.
+
+    Matches come from the GIN index on messages.search_vector, narrowed to
+    the caller's channels, so the cost follows the number of hits the caller
+    can see rather than the size of the messages table. Results are ordered
+    by ts_rank_cd (newest first on ties) and paged with a keyset cursor;
+    ts_headline only runs for the rows of the returned page.
+    """
+    if channel_id is not None:
+        channel = await db.get(Channel, channel_id)
+        if not channel:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Channel không tồn tại"
+            )
+        member_check = await db.execute(
+            select(TeamMember).where(
+                TeamMember.team_id == channel.team_id,
+                TeamMember.user_id == current_user.user_id,
+            )
+        )
+        if not member_check.scalar():
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Bạn không có quyền xem tin nhắn trong channel này",
+            )
+        scope = Message.channel_id == channel_id
+    else:
+        scope = Message.channel_id.in_(
+            select(Channel.channel_id)
+            .join(TeamMember, TeamMember.team_id == Channel.team_id)
+            .where(TeamMember.user_id == current_user.user_id)
+        )
+
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(Message.search_vector, tsquery)
+    page = (
+        select(Message.message_id, rank.label("rank"))
+        .where(scope, Message.search_vector.op("@@")(tsquery))
+    )
+    if cursor is not None:
+        cursor_rank, cursor_id = _parse_search_cursor(cursor)
+        # ts_rank_cd returns real: compare at the same precision
+        page = page.where(
+            tuple_(rank, Message.message_id) < tuple_(cast(cursor_rank, REAL), cursor_id)
+        )
+    page = (
+        page.order_by(desc("rank"), desc(Message.message_id))
+        .limit(limit + 1)
+        .subquery()
+    )
+
+    # asyncpg reuses prepared statements; after five runs Postgres may switch
+    # to a generic plan that cannot see the query words or the caller, and
+    # ANDs the whole GIN posting list with the channel scope. A custom plan
+    # picks channel-first or index-first from the real selectivity.
+    await db.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+    result = await db.execute(
+        select(
+            Message,
+            page.c.rank,
+            func.ts_headline(SEARCH_CONFIG, Message.content, tsquery, _HEADLINE_OPTIONS),
+        )
+        .join(page, page.c.message_id == Message.message_id)
+        .order_by(desc(page.c.rank), desc(Message.message_id))
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    users = UserLoader(db)
+    users.prime(current_user)
+    await users.load_many(msg.sender_id for msg, _, _ in rows)
+
+    hits = [
+        MessageSearchHit(
+            message_id=msg.message_id,
+            channel_id=msg.channel_id,
+            sender_id=msg.sender_id,
+            sender_name=users.name(msg.sender_id),
+            content=msg.content,
+            sent_at=msg.sent_at,
+            is_edited=False,
+            rank=rank_value,
+            highlight=_render_highlight(headline),
+        )
+        for msg, rank_value, headline in rows
+    ]
+    next_cursor = f"{hits[-1].rank!r}:{hits[-1].message_id}" if has_more else None
+    return MessageSearchResponse(
+        results=hits, has_more=has_more, limit=limit, next_cursor=next_cursor
+    )
+
+
+def _cached_list_response(cached, limit: int) -> MessageListResponse:
+    _, messages, has_more = cached
+    return MessageListResponse(
+        messages=messages,
+        total=None,
+        has_more=has_more,
+        skip=0,
+        limit=limit,
+        next_cursor=messages[0]["message_id"] if has_more else None,
     )
 
 
@@ -212,7 +458,7 @@ async def edit_message(
     await db.commit()
     await db.refresh(message)
 
-    return MessageResponse(
+    response = MessageResponse(
         message_id=message.message_id,
         channel_id=message.channel_id,
         sender_id=message.sender_id,
@@ -221,6 +467,13 @@ async def edit_message(
         sent_at=message.sent_at,
         is_edited=True,
     )
+    message_cache.put(response.channel_id, cached_message(response))
+    event_bus.publish(MessageUpdated(
+        actor_id=current_user.user_id,
+        channel_id=response.channel_id,
+        message=response.model_dump(),
+    ))
+    return response
 
 
 @router.delete("/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -241,6 +494,11 @@ async def delete_message(
             detail="Bạn không có quyền xóa tin nhắn này",
         )
 
+    channel_id = message.channel_id
     await db.delete(message)
     await db.commit()
+    message_cache.remove(channel_id, message_id)
+    event_bus.publish(MessageDeleted(
+        actor_id=current_user.user_id, channel_id=channel_id, message_id=message_id
+    ))
     return None
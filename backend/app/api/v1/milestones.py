@@ -5,6 +5,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -27,6 +28,7 @@ from app.schemas.milestone import (
     MilestoneResponse,
     MilestoneUpdate,
 )
+from app.services.submission_export import export_milestone_submissions
 
 router = APIRouter(prefix="/milestones", tags=["milestones"])
 
@@ -277,6 +279,58 @@ async def delete_milestone(
     return None
 
 
+@router.get(
+    "/{milestone_id}/submissions/export",
+    summary="Download all submissions of a milestone as a ZIP",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/zip": {}}}},
+)
+async def export_milestone_submissions_zip(
+    milestone_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream one ZIP with every submitted file of the milestone, grouped by
+    team and checkpoint, plus `manifest.csv` (submitter, submitted_at,
+    due date, lateness, file status) for every submission.
+    
+    **Required permissions:** Lecturer of the class (or the milestone creator)
+    
+    The archive is built while it is sent: no temporary file, constant
+    memory whatever the number of teams. No Content-Length is sent.
+    """
+    query = (
+        select(Milestone)
+        .options(selectinload(Milestone.academic_class))
+        .where(Milestone.milestone_id == milestone_id)
+    )
+    result = await db.execute(query)
+    milestone = result.scalar_one_or_none()
+    
+    if not milestone:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Milestone not found"
+        )
+    
+    if current_user.user_id not in (milestone.academic_class.lecturer_id, milestone.created_by):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the class lecturer can export submissions"
+        )
+    
+    filename = f"milestone-{milestone_id}-submissions.zip"
+    return StreamingResponse(
+        export_milestone_submissions(milestone),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
 # ==========================================
 # CHECKPOINT ENDPOINTS
 # ==========================================
@@ -6,6 +6,7 @@ from uuid import UUID
 from datetime import datetime
 
 from app.api.deps import get_db, get_current_user
+from app.dao.user_loader import UserLoader
 from app.models.all_models import PeerReview, Team, TeamMember, User
 from app.schemas.peer_review import (
     PeerReviewCreate,
@@ -132,23 +133,26 @@ async def list_peer_reviews(
     result = await db.execute(query)
     reviews = result.scalars().all()
     
+    # Check permissions
+    # If student (not lecturer/admin):
+    # Allow if: I am reviewer OR I am reviewee
+    if not is_lecturer:
+        reviews = [
+            r for r in reviews
+            if r.reviewer_id == current_user.user_id or r.reviewee_id == current_user.user_id
+        ]
+    
+    # Reviewer is not needed for response structure used here (anonymous)
+    users = UserLoader(db)
+    await users.load_many(r.reviewee_id for r in reviews)
+    
     response = []
     for review in reviews:
-        # Check permissions
-        # If student (not lecturer/admin):
-        # Allow if: I am reviewer OR I am reviewee
-        if not is_lecturer:
-            if review.reviewer_id != current_user.user_id and review.reviewee_id != current_user.user_id:
-                continue
-
-        # reviewer = await db.get(User, review.reviewer_id) # Not needed for response structure used here (anonymous)
-        reviewee = await db.get(User, review.reviewee_id)
-        
         response.append(PeerReviewResponse(
             review_id=review.review_id,
             team_id=review.team_id,
             reviewee_id=review.reviewee_id,
-            reviewee_name=reviewee.full_name if reviewee else "Unknown",
+            reviewee_name=users.name(review.reviewee_id),
             score=review.score,
             comment=review.comment,
             criteria_name=review.criteria_name,
@@ -209,43 +213,44 @@ async def get_team_review_summary(
     )
     members = members_result.scalars().all()
     
-    summaries = []
-    for member in members:
-        user = await db.get(User, member.user_id)
-        
-        # Tính average score
-        avg_result = await db.execute(
-            select(func.avg(PeerReview.score)).where(
-                PeerReview.team_id == team_id,
-                PeerReview.reviewee_id == member.user_id
-            )
-        )
-        avg_score = avg_result.scalar() or 0.0
-        
-        # Đếm số reviews
-        count_result = await db.execute(
-            select(func.count(PeerReview.review_id)).where(
-                PeerReview.team_id == team_id,
-                PeerReview.reviewee_id == member.user_id
-            )
+    users = UserLoader(db)
+    await users.load_many(m.user_id for m in members)
+    
+    # Tính average score và đếm số reviews cho mọi member trong một query
+    stats_result = await db.execute(
+        select(
+            PeerReview.reviewee_id,
+            func.avg(PeerReview.score),
+            func.count(PeerReview.review_id),
         )
-        total_reviews = count_result.scalar() or 0
-        
-        # Lấy comments (feedback)
-        feedback_result = await db.execute(
-            select(PeerReview.comment).where(
-                PeerReview.team_id == team_id,
-                PeerReview.reviewee_id == member.user_id,
-                PeerReview.comment.isnot(None)
-            )
+        .where(PeerReview.team_id == team_id)
+        .group_by(PeerReview.reviewee_id)
+    )
+    stats_by_reviewee = {row[0]: (row[1], row[2]) for row in stats_result.all()}
+    
+    # Lấy comments (feedback) của cả team một lần
+    feedback_result = await db.execute(
+        select(PeerReview.reviewee_id, PeerReview.comment).where(
+            PeerReview.team_id == team_id,
+            PeerReview.comment.isnot(None)
         )
-        feedbacks = [f[0] for f in feedback_result.fetchall() if f[0]]
+    )
+    feedback_by_reviewee = {}
+    for reviewee_id, comment in feedback_result.all():
+        if comment:
+            feedback_by_reviewee.setdefault(reviewee_id, []).append(comment)
+    
+    summaries = []
+    for member in members:
+        user = users.get(member.user_id)
+        avg_score, total_reviews = stats_by_reviewee.get(member.user_id, (None, 0))
+        feedbacks = feedback_by_reviewee.get(member.user_id, [])
         
         summaries.append(PeerReviewSummary(
             reviewee_id=member.user_id,
             reviewee_name=user.full_name if user else "Unknown",
-            average_score=round(float(avg_score), 2),
-            total_reviews=total_reviews,
+            average_score=round(float(avg_score or 0.0), 2),
+            total_reviews=total_reviews or 0,
             feedback_summary=feedbacks[:5]  # Top 5 comments
         ))
     
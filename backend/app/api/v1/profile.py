@@ -12,6 +12,7 @@ from sqlalchemy.orm import selectinload
 from app.api import deps
 from app.models.all_models import User
 from app.schemas.user_profile import UserProfileResponse, UserProfileUpdate
+from app.services.cache_invalidation import cache_invalidation
 
 router = APIRouter()
 
@@ -112,6 +113,7 @@ async def update_current_user_profile(
     
     # Commit changes
     await db.commit()
+    cache_invalidation.user_changed(current_user.user_id)
     
     # Re-fetch with relationships loaded using joinedload and populate_existing
     from sqlalchemy.orm import joinedload
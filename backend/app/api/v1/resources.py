@@ -14,17 +14,13 @@ Role Permissions (from permission matrix):
 - Staff/Admin: Full access ✓
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, Query, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Depends, Request, status, Query, UploadFile, File
 from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, timezone
 import json
 import os
-import shutil
-from pathlib import Path
-import uuid
 
 from app.db.session import get_db
 from app.api.deps import get_current_user
@@ -32,6 +28,8 @@ from app.models.all_models import User, Resource, Team, TeamMember, AcademicClas
 from app.schemas.resource import (
     ResourceCreate, ResourceUpdate, ResourceResponse, ResourceListResponse
 )
+from app.services.file_downloads import object_response
+from app.services.file_storage import resource_files
 
 router = APIRouter()
 
@@ -90,10 +88,10 @@ async def upload_resource_file(
     
     Response:
         {
-            "filename": "resource_abc123.pdf",
+            "filename": "<digest>.pdf",
             "file_size": 1048576,
             "file_type": "application/pdf",
-            "file_url": "/api/v1/resources/download/resource_abc123.pdf",
+            "file_url": "/api/v1/resources/download/<digest>.pdf",
             "display_name": "document.pdf"
         }
     """
@@ -106,35 +104,23 @@ async def upload_resource_file(
             detail="Only lecturers, staff, or admins can upload files"
         )
     
-    # Create uploads directory if it doesn't exist
-    upload_dir = Path("uploads")
-    upload_dir.mkdir(exist_ok=True)
-    
-    # Generate unique filename
-    file_ext = Path(file.filename).suffix
-    unique_filename = f"resource_{uuid.uuid4().hex}{file_ext}"
-    file_path = upload_dir / unique_filename
-    
-    print(f"💾 Saving to: {file_path}")
-    
-    # Save file
+    # Save file: streamed to disk in chunks, named by content hash
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Get file size
-        file_size = file_path.stat().st_size
-        print(f"✅ File saved successfully - Size: {file_size} bytes")
+        stored = await resource_files.save_upload(file)
+        print(f"✅ File saved successfully - {stored.name}, Size: {stored.size} bytes"
+              f"{' (already stored)' if stored.deduplicated else ''}")
         
         response = {
-            "filename": unique_filename,
-            "file_size": file_size,
+            "filename": stored.name,
+            "file_size": stored.size,
             "file_type": file.content_type or "application/octet-stream",
-            "file_url": f"/api/v1/resources/download/{unique_filename}",
+            "file_url": f"/api/v1/resources/download/{stored.name}",
             "display_name": file.filename
         }
         print(f"📤 Returning response: {response}")
         return response
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Upload error: {str(e)}")
         raise HTTPException(
@@ -145,30 +131,24 @@ async def upload_resource_file(
         await file.close()
 
 
-@router.get("/download/{filename}")
-async def download_resource_file(filename: str):
+@router.api_route("/download/{filename}", methods=["GET", "HEAD"])
+async def download_resource_file(filename: str, request: Request):
     """
     Download a resource file.
+    
+    With object storage this redirects (307) to a short-lived presigned
+    URL; from local disk it supports Range requests (resume, video
+    seeking), ETag / 304 and long-lived caching for content-addressed names.
     """
     # Security: Prevent directory traversal
-    if ".." in filename or "/" in filename:
+    if ".." in filename or "/" in filename or filename.startswith("."):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid filename"
         )
     
-    file_path = Path("uploads") / filename
-    
-    if not file_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="File not found"
-        )
-    
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type="application/octet-stream"
+    return await object_response(
+        request, resource_files.key(filename), download_name=filename, attachment=True
     )
 
 
@@ -2,8 +2,7 @@
 
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from pathlib import Path
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
 from sqlalchemy import func, select
@@ -11,7 +10,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import get_current_user, get_db
-from app.core.config import settings
 from app.models.all_models import (
     Checkpoint,
     Evaluation,
@@ -31,13 +29,14 @@ from app.schemas.submission import (
     SubmissionStats,
     SubmissionUpdate,
     SubmissionWithEvaluation,
+    UploadSessionCreate,
+    UploadSessionResponse,
 )
+from app.services.file_storage import StoredFile, submission_files
+from app.services.upload_sessions import upload_sessions
 
 router = APIRouter(prefix="/submissions", tags=["submissions"])
 
-UPLOAD_ROOT = Path(settings.ROOT_DIR) / "uploads" / "submissions"
-UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
-
 
 # ==========================================
 # HELPER FUNCTIONS
@@ -81,6 +80,17 @@ async def verify_team_membership(
     return member is not None
 
 
+def uploaded_file_response(request: Request, stored: StoredFile, file_name: str) -> dict:
+    """Body returned for a stored submission file."""
+    base_url = str(request.base_url)
+    return {
+        "file_url": f"{base_url}uploads/submissions/{stored.name}",
+        "file_name": file_name,
+        "file_size": stored.size,
+        "sha256": stored.sha256,
+    }
+
+
 # ==========================================
 # SUBMISSION ENDPOINTS
 # ==========================================
@@ -103,22 +113,95 @@ async def upload_submission_file(
             detail="Missing file name"
         )
 
-    suffix = Path(file.filename).suffix
-    stored_name = f"{uuid4().hex}{suffix}"
-    file_path = UPLOAD_ROOT / stored_name
+    # Streamed to disk in chunks; identical files share one stored copy
+    try:
+        stored = await submission_files.save_upload(file)
+    finally:
+        await file.close()
 
-    contents = await file.read()
-    if not contents:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Empty file"
-        )
+    return uploaded_file_response(request, stored, file.filename)
 
-    file_path.write_bytes(contents)
 
-    base_url = str(request.base_url)
-    file_url = f"{base_url}uploads/submissions/{stored_name}"
-    return {"file_url": file_url, "file_name": file.filename}
+@router.post(
+    "/uploads",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a resumable upload"
+)
+async def create_upload_session(
+    upload_in: UploadSessionCreate,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a resumable upload for a large file.
+
+    PUT each chunk to `/uploads/{upload_id}/chunks/{index}` (`chunk_size` bytes,
+    the last one shorter), then POST `/uploads/{upload_id}/complete`. After a
+    dropped connection, GET `/uploads/{upload_id}` and resend `missing_chunks`.
+    """
+    session = await upload_sessions.create(
+        current_user.user_id, upload_in.file_name, upload_in.file_size, upload_in.sha256
+    )
+    return await upload_sessions.status(session)
+
+
+@router.get(
+    "/uploads/{upload_id}",
+    response_model=UploadSessionResponse,
+    summary="Resumable upload progress"
+)
+async def get_upload_session(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    session = await upload_sessions.get(upload_id, current_user.user_id)
+    return await upload_sessions.status(session)
+
+
+@router.put(
+    "/uploads/{upload_id}/chunks/{index}",
+    response_model=UploadSessionResponse,
+    summary="Upload one chunk"
+)
+async def upload_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """Raw request body = bytes of chunk `index`. Re-sending a chunk overwrites it."""
+    session = await upload_sessions.get(upload_id, current_user.user_id)
+    await upload_sessions.write_chunk(session, index, request.stream())
+    return await upload_sessions.status(session)
+
+
+@router.post(
+    "/uploads/{upload_id}/complete",
+    summary="Finish a resumable upload"
+)
+async def complete_upload_session(
+    upload_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """Returns the same body as POST /submissions/upload."""
+    session = await upload_sessions.get(upload_id, current_user.user_id)
+    stored = await upload_sessions.complete(session)
+    return uploaded_file_response(request, stored, session.file_name)
+
+
+@router.delete(
+    "/uploads/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Cancel a resumable upload"
+)
+async def delete_upload_session(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    session = await upload_sessions.get(upload_id, current_user.user_id)
+    await upload_sessions.abort(session)
+
 
 @router.post(
     "",
@@ -330,18 +413,22 @@ async def list_submissions(
     result = await db.execute(query)
     submissions = result.scalars().all()
     
+    # Check which submissions have an evaluation in one query
+    evaluated_ids = set()
+    if submissions:
+        eval_query = select(Evaluation.submission_id).where(
+            Evaluation.submission_id.in_([s.submission_id for s in submissions])
+        )
+        eval_result = await db.execute(eval_query)
+        evaluated_ids = set(eval_result.scalars().all())
+    
     # Build response with additional info
     submission_list = []
     for submission in submissions:
         # Check if late
         is_late = submission.submitted_at > submission.checkpoint.milestone.due_date
         
-        # Check if has evaluation
-        eval_query = select(Evaluation).where(
-            Evaluation.submission_id == submission.submission_id
-        )
-        eval_result = await db.execute(eval_query)
-        has_evaluation = eval_result.scalar_one_or_none() is not None
+        has_evaluation = submission.submission_id in evaluated_ids
         
         submission_list.append(
             SubmissionListResponse(
@@ -18,11 +18,32 @@ from typing import Optional
 
 from app.db.session import get_db
 from app.api.deps import get_current_user
+from app.dao.user_loader import UserLoader
 from app.models.all_models import User, Sprint, Task, Team, TeamMember
 from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.events import TaskChanged, event_bus
 
 router = APIRouter()
 
+
+def publish_task_change(task: Task, change: str, actor: User, assigned_to=None):
+    """Publish a TaskChanged event (call after commit)."""
+    event_bus.publish(TaskChanged(
+        actor_id=actor.user_id,
+        task_id=task.task_id,
+        sprint_id=task.sprint_id,
+        change=change,
+        task={
+            "title": task.title,
+            "status": task.status,
+            "priority": task.priority,
+            "assigned_to": task.assigned_to,
+            "due_date": task.due_date,
+            "updated_at": task.updated_at,
+        },
+        assigned_to=assigned_to,
+    ))
+
 # ============================================================================
 # SPRINTS ENDPOINTS
 # ============================================================================
@@ -272,6 +293,7 @@ async def create_task(
     db.add(new_task)
     await db.commit()
     await db.refresh(new_task)
+    publish_task_change(new_task, "created", current_user, assigned_to=new_task.assigned_to)
     
     # Get assigned user name if applicable
     assigned_name = None
@@ -361,21 +383,12 @@ async def get_tasks(
     result = await db.execute(query)
     tasks = result.scalars().all()
     
+    # Resolve assignee and creator names in one query
+    users = UserLoader(db)
+    await users.load_many([t.assigned_to for t in tasks] + [t.created_by for t in tasks])
+    
     tasks_response = []
     for t in tasks:
-        # Get assigned user name
-        assigned_name = None
-        if t.assigned_to:
-            user_query = select(User).where(User.user_id == t.assigned_to)
-            user_result = await db.execute(user_query)
-            assigned_user = user_result.scalar()
-            assigned_name = assigned_user.full_name if assigned_user else None
-        
-        # Get creator name
-        creator_query = select(User).where(User.user_id == t.created_by)
-        creator_result = await db.execute(creator_query)
-        creator = creator_result.scalar()
-        
         tasks_response.append({
             "task_id": t.task_id,
             "title": t.title,
@@ -383,8 +396,8 @@ async def get_tasks(
             "description": t.description,
             "status": t.status,
             "priority": t.priority,
-            "assigned_to": assigned_name,
-            "created_by": creator.full_name if creator else "Unknown",
+            "assigned_to": users.name(t.assigned_to, default=None),
+            "created_by": users.name(t.created_by),
             "created_at": t.created_at,
             "due_date": t.due_date
         })
@@ -429,18 +442,9 @@ async def get_task_detail(
             detail="Task not found"
         )
     
-    # Get assigned user name
-    assigned_name = None
-    if task.assigned_to:
-        user_query = select(User).where(User.user_id == task.assigned_to)
-        user_result = await db.execute(user_query)
-        assigned_user = user_result.scalar()
-        assigned_name = assigned_user.full_name if assigned_user else None
-    
-    # Get creator name
-    creator_query = select(User).where(User.user_id == task.created_by)
-    creator_result = await db.execute(creator_query)
-    creator = creator_result.scalar()
+    # Resolve assignee and creator names in one query
+    users = UserLoader(db)
+    await users.load_many([task.assigned_to, task.created_by])
     
     return {
         "task_id": task.task_id,
@@ -449,8 +453,8 @@ async def get_task_detail(
         "description": task.description,
         "status": task.status,
         "priority": task.priority,
-        "assigned_to": assigned_name,
-        "created_by": creator.full_name if creator else "Unknown",
+        "assigned_to": users.name(task.assigned_to, default=None),
+        "created_by": users.name(task.created_by),
         "created_at": task.created_at,
         "updated_at": task.updated_at,
         "blocked_reason": task.blocked_reason,
@@ -500,6 +504,9 @@ async def update_task(
             detail="Task not found"
         )
     
+    previous_assignee = task.assigned_to
+    previous_status = task.status
+    
     # Update fields if provided
     if task_update.title is not None:
         task.title = task_update.title
@@ -538,6 +545,11 @@ async def update_task(
     db.add(task)
     await db.commit()
     await db.refresh(task)
+    # A status edited here notifies like PATCH /status (e.g. completion)
+    publish_task_change(
+        task, "status_changed" if task.status != previous_status else "updated", current_user,
+        assigned_to=task.assigned_to if task.assigned_to != previous_assignee else None
+    )
     
     # Get assigned user name
     assigned_name = None
@@ -592,6 +604,7 @@ async def delete_task(
     # Delete
     await db.delete(task)
     await db.commit()
+    publish_task_change(task, "deleted", current_user)
     
     return {
         "task_id": task_id,
@@ -687,22 +700,18 @@ async def get_sprint_tasks(
     result = await db.execute(query)
     tasks = result.scalars().all()
     
+    # Resolve assignee names in one query
+    users = UserLoader(db)
+    await users.load_many(t.assigned_to for t in tasks)
+    
     tasks_response = []
     for t in tasks:
-        # Get assigned user name
-        assigned_name = None
-        if t.assigned_to:
-            user_query = select(User).where(User.user_id == t.assigned_to)
-            user_result = await db.execute(user_query)
-            assigned_user = user_result.scalar()
-            assigned_name = assigned_user.full_name if assigned_user else None
-        
         tasks_response.append({
             "task_id": t.task_id,
             "title": t.title,
             "status": t.status,
             "priority": t.priority,
-            "assigned_to": assigned_name,
+            "assigned_to": users.name(t.assigned_to, default=None),
             "created_at": t.created_at,
             "due_date": t.due_date
         })
@@ -784,6 +793,7 @@ async def change_task_status(
     db.add(task)
     await db.commit()
     await db.refresh(task)
+    publish_task_change(task, "status_changed", current_user)
     
     return {
         "task_id": task.task_id,
@@ -864,12 +874,17 @@ async def assign_task(
         )
     
     # Assign
+    previous_assignee = task.assigned_to
     task.assigned_to = target_user_id
     task.updated_at = datetime.now(timezone.utc)
     
     db.add(task)
     await db.commit()
     await db.refresh(task)
+    publish_task_change(
+        task, "assigned", current_user,
+        assigned_to=target_user_id if target_user_id != previous_assignee else None
+    )
     
     # Get assigned user name
     user_query = select(User).where(User.user_id == target_user_id)
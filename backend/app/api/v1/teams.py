@@ -21,8 +21,12 @@ import secrets
 
 from app.db.session import get_db
 from app.api.deps import get_current_user
+from app.dao.user_loader import UserLoader
 from app.models.all_models import User, Team, TeamMember, Project, Channel
 from app.schemas.team import TeamCreate, TeamResponse, TeamProjectSelect
+from app.services.cache_invalidation import cache_invalidation
+from app.services.events import TeamMemberJoined, TeamMemberLeft, TeamUpdated, event_bus
+from app.services.team_presence import team_presence
 
 router = APIRouter()
 
@@ -82,6 +86,13 @@ async def join_team_by_code(
     )
     db.add(new_member)
     await db.commit()
+    cache_invalidation.membership_changed(team.team_id, current_user.user_id)
+    event_bus.publish(TeamMemberJoined(
+        actor_id=current_user.user_id,
+        team_id=team.team_id,
+        user_id=current_user.user_id,
+        member={"full_name": current_user.full_name, "role": new_member.role, "joined_at": new_member.joined_at},
+    ))
 
     return {
         "team_id": team.team_id,
@@ -195,6 +206,7 @@ async def create_team(
             detail="Database integrity error: " + str(e)
         )
     await db.refresh(new_team)
+    cache_invalidation.membership_changed(new_team.team_id, current_user.user_id)
     
     return {
         "team_id": new_team.team_id,
@@ -245,17 +257,21 @@ async def get_teams(
     result = await db.execute(query)
     teams = result.scalars().all()
     
+    # Load members of all listed teams in one query
+    members_by_team = {t.team_id: [] for t in teams}
+    if teams:
+        member_query = select(TeamMember).where(TeamMember.team_id.in_(members_by_team.keys()))
+        member_result = await db.execute(member_query)
+        for m in member_result.scalars().all():
+            members_by_team[m.team_id].append(m)
+    
+    # Resolve creator names in one query
+    users = UserLoader(db)
+    await users.load_many(t.created_by for t in teams)
+    
     teams_response = []
     for t in teams:
-        # Count members
-        member_query = select(TeamMember).where(TeamMember.team_id == t.team_id)
-        member_result = await db.execute(member_query)
-        members = member_result.scalars().all()
-        
-        # Get creator name
-        creator_query = select(User).where(User.user_id == t.created_by)
-        creator_result = await db.execute(creator_query)
-        creator = creator_result.scalar()
+        members = members_by_team[t.team_id]
         
         teams_response.append({
             "team_id": t.team_id,
@@ -264,7 +280,7 @@ async def get_teams(
             "description": t.description,
             "member_count": len(members),
             "is_finalized": t.is_finalized,
-            "created_by": creator.full_name if creator else "Unknown",
+            "created_by": users.name(t.created_by),
             "created_at": t.created_at,
             "leader_id": t.leader_id,
             "is_member": any(m.user_id == current_user.user_id for m in members),
@@ -324,22 +340,18 @@ async def get_team_detail(
             detail="Team not found"
         )
     
-    # Get creator info
-    creator_query = select(User).where(User.user_id == team.created_by)
-    creator_result = await db.execute(creator_query)
-    creator = creator_result.scalar()
-    
     # Get members
     member_query = select(TeamMember).where(TeamMember.team_id == team_id)
     member_result = await db.execute(member_query)
     team_members = member_result.scalars().all()
     
+    # Resolve creator and member users in one query
+    users = UserLoader(db)
+    await users.load_many([team.created_by] + [tm.user_id for tm in team_members])
+    
     members_response = []
     for tm in team_members:
-        # Get user info
-        user_query = select(User).where(User.user_id == tm.user_id)
-        user_result = await db.execute(user_query)
-        user = user_result.scalar()
+        user = users.get(tm.user_id)
         
         members_response.append({
             "user_id": tm.user_id,
@@ -357,13 +369,37 @@ async def get_team_detail(
         "description": team.description,
         "join_code": team.join_code if not team.is_finalized else None,
         "is_finalized": team.is_finalized,
-        "created_by": creator.full_name if creator else "Unknown",
+        "created_by": users.name(team.created_by),
         "created_at": team.created_at,
         "members": members_response,
         "member_count": len(members_response)
     }
 
 
+@router.get("/{team_id}/presence")
+async def get_team_presence(
+    team_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get which members of a team are online (members only)
+    
+    Response:
+        {
+            "team_id": 1,
+            "online": ["uuid-1", "uuid-2"],
+            "member_count": 5
+        }
+    """
+    snapshot = await team_presence.snapshot(team_id, viewer_id=str(current_user.user_id))
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not a member of this team"
+        )
+    return snapshot
+
+
 @router.post("/{team_id}/join", status_code=200)
 async def join_team(
     team_id: int,
@@ -442,6 +478,13 @@ async def join_team(
     
     db.add(new_member)
     await db.commit()
+    cache_invalidation.membership_changed(team_id, current_user.user_id)
+    event_bus.publish(TeamMemberJoined(
+        actor_id=current_user.user_id,
+        team_id=team_id,
+        user_id=current_user.user_id,
+        member={"full_name": current_user.full_name, "role": new_member.role, "joined_at": new_member.joined_at},
+    ))
     
     return {
         "team_id": team_id,
@@ -497,6 +540,10 @@ async def leave_team(
     # Delete member record
     await db.delete(member)
     await db.commit()
+    cache_invalidation.membership_changed(team_id, current_user.user_id)
+    event_bus.publish(TeamMemberLeft(
+        actor_id=current_user.user_id, team_id=team_id, user_id=current_user.user_id
+    ))
     
     return {
         "team_id": team_id,
@@ -557,6 +604,9 @@ async def finalize_team(
     
     db.add(team)
     await db.commit()
+    event_bus.publish(TeamUpdated(
+        actor_id=current_user.user_id, team_id=team_id, changes={"is_finalized": True}
+    ))
     
     return {
         "team_id": team_id,
@@ -638,6 +688,9 @@ async def select_project(
     db.add(team)
     await db.commit()
     await db.refresh(team)
+    event_bus.publish(TeamUpdated(
+        actor_id=current_user.user_id, team_id=team.team_id, changes={"project_id": team.project_id}
+    ))
     
     return {
         "team_id": team.team_id,
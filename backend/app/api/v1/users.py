@@ -8,6 +8,7 @@ from app.api import deps
 from app.db.session import get_db
 from app.models.all_models import User, Role
 from app.schemas import user as user_schema
+from app.services.cache_invalidation import cache_invalidation
 
 router = APIRouter()
 
@@ -101,6 +102,7 @@ async def update_topic_permission(
     user.can_create_topics = payload.can_create_topics
     db.add(user)
     await db.commit()
+    cache_invalidation.user_changed(user.user_id)
     await db.refresh(user)
 
     return user_schema.UserAdminResponse(
@@ -137,6 +139,7 @@ async def toggle_user_active(
     user.is_active = not user.is_active
     db.add(user)
     await db.commit()
+    cache_invalidation.user_changed(user.user_id)
     await db.refresh(user)
 
     return user_schema.UserAdminResponse(
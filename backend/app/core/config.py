@@ -32,6 +32,13 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Socket.IO scale-out: "memory" (single worker, tests) or "redis" (REDIS_URL)
+    SOCKETIO_MANAGER: str = "memory"
+    # Presence entries of a crashed worker expire after this many seconds
+    SOCKETIO_PRESENCE_TTL_SECONDS: int = 90
+    # Team member rosters cached for presence lookups
+    PRESENCE_ROSTER_TTL_SECONDS: int = 60
+    
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
@@ -43,6 +50,91 @@ class Settings(BaseSettings):
     # Google Gemini API
     GOOGLE_GEMINI_API_KEY: str = ""
     
+    # Debug: expose X-DB-Queries / X-DB-Time-ms headers per request
+    DB_QUERY_STATS: bool = False
+    # Log a warning when one request repeats a statement shape more than N times
+    DB_N_PLUS_ONE_THRESHOLD: int = 10
+    
+    # Authenticated-user cache used by get_current_user (0 disables it)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    
+    # Password hashing executor: "process" or "thread"; 0 workers hashes inline
+    PASSWORD_HASH_EXECUTOR: str = "process"
+    PASSWORD_HASH_WORKERS: int = 2
+    
+    # Notification outbox dispatcher (real-time delivery after commit)
+    OUTBOX_DISPATCHER_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 200
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 2.0
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_BASE_SECONDS: float = 1.0
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 300.0
+    
+    # Domain event bus: per-subscriber queue bound (events beyond it are dropped)
+    EVENT_BUS_QUEUE_SIZE: int = 1000
+    
+    # Hot-channel message cache for newest-page reads (0 messages disables it)
+    MESSAGE_CACHE_PER_CHANNEL: int = 100
+    MESSAGE_CACHE_MAX_CHANNELS: int = 5000
+    MESSAGE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    MESSAGE_CACHE_MEMBERSHIP_TTL_SECONDS: int = 30
+    
+    # Socket `sync` (reconnect catch-up): batch size and per-channel/team caps
+    SYNC_BATCH_SIZE: int = 100
+    SYNC_MAX_MESSAGES_PER_CHANNEL: int = 500
+    SYNC_MAX_TASKS_PER_TEAM: int = 500
+    SYNC_MAX_CHANNELS: int = 100
+    SYNC_MAX_TEAMS: int = 50
+    # task_ids sent per team for deletion detection (sync_tasks)
+    SYNC_MAX_TASK_IDS_PER_TEAM: int = 5000
+    SYNC_MAX_CONCURRENT: int = 16
+    
+    # Socket `new_message`: max messages written per INSERT (group commit)
+    SOCKET_MESSAGE_BATCH_SIZE: int = 200
+    
+    # Typing indicators: one `typing_snapshot` per channel per interval; a
+    # user stays "typing" for TYPING_TTL_SECONDS after their last keystroke
+    TYPING_SNAPSHOT_INTERVAL_SECONDS: float = 1.5
+    TYPING_TTL_SECONDS: float = 3.0
+    
+    # Per-socket outbound queue (packets): droppable events are skipped above
+    # the high-water mark; sockets at MAX_QUEUE or above high water for longer
+    # than the grace period are disconnected
+    SOCKET_OUTBOUND_HIGH_WATER: int = 100
+    SOCKET_OUTBOUND_MAX_QUEUE: int = 1000
+    SOCKET_SLOW_CONSUMER_GRACE_SECONDS: float = 15.0
+    SOCKET_OUTBOUND_CHECK_INTERVAL_SECONDS: float = 1.0
+    
+    # File uploads: copied to disk in chunks; size limits per kind of file
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    UPLOAD_MAX_BYTES_DOCUMENT: int = 50 * 1024 * 1024
+    UPLOAD_MAX_BYTES_IMAGE: int = 20 * 1024 * 1024
+    UPLOAD_MAX_BYTES_ARCHIVE: int = 500 * 1024 * 1024
+    UPLOAD_MAX_BYTES_VIDEO: int = 1024 * 1024 * 1024
+    # Resumable uploads: chunk size clients PUT, and idle time before expiry
+    UPLOAD_SESSION_CHUNK_BYTES: int = 8 * 1024 * 1024
+    UPLOAD_SESSION_TTL_SECONDS: int = 24 * 60 * 60
+    
+    # File downloads: "python" streams from the worker; "x-accel" (nginx,
+    # internal location at FILE_ACCEL_PREFIX) or "x-sendfile" hand the bytes
+    # to the reverse proxy after the route's checks
+    FILE_SERVE_MODE: str = "python"
+    FILE_ACCEL_PREFIX: str = "/protected-uploads/"
+    FILE_STREAM_CHUNK_BYTES: int = 256 * 1024
+    
+    # Where uploaded files live: "local" (uploads/ on this machine) or "s3"
+    # (any S3-compatible bucket, e.g. MinIO); with "s3" downloads redirect to
+    # presigned URLs valid for STORAGE_PRESIGN_EXPIRE_SECONDS
+    STORAGE_BACKEND: str = "local"
+    STORAGE_PRESIGN_EXPIRE_SECONDS: int = 15 * 60
+    S3_BUCKET: str = "collabsphere-uploads"
+    S3_REGION: str = "us-east-1"
+    S3_ENDPOINT_URL: str = ""  # e.g., http://minio:9000 (empty for AWS)
+    S3_PUBLIC_ENDPOINT_URL: str = ""  # host browsers use, if different
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Convert CORS_ORIGINS string to list."""
@@ -1,6 +1,10 @@
 """Security utilities for password hashing and JWT tokens."""
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+from typing import Any, Callable, Optional, TypeVar, Union
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -25,6 +29,64 @@ pwd_context = CryptContext(
 )
 
 
+# Accounts created by bulk import (see import services). Use sha256_crypt to
+# avoid bcrypt 72-byte limit issues.
+import_pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+
+T = TypeVar("T")
+
+# Hashing is deliberately slow CPU work: a single PBKDF2 round trip is ~15ms and
+# an import sha256_crypt hash ~300ms. Running it inline stalls the event loop
+# (every HTTP request and Socket.IO connection on the worker), so async code
+# goes through a bounded executor instead. os_crypt (sha256_crypt) holds the
+# GIL, hence a process pool by default.
+_hash_executor: Optional[Executor] = None
+
+
+def _get_hash_executor() -> Optional[Executor]:
+    global _hash_executor
+    if _hash_executor is None and settings.PASSWORD_HASH_WORKERS > 0:
+        if settings.PASSWORD_HASH_EXECUTOR == "thread":
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+        else:
+            # spawn: never fork a process that owns an event loop and DB sockets
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _hash_executor
+
+
+async def run_hashing(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a hashing function on the hashing executor.
+
+    `func` must be a module-level function (it is pickled for the process
+    pool). With PASSWORD_HASH_WORKERS=0 it runs inline.
+    """
+    executor = _get_hash_executor()
+    if executor is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed): start a fresh pool and retry once
+        shutdown_hash_executor()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the hashing workers (called on application shutdown)."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Check if plain password matches hashed password."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -37,6 +99,26 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def get_import_password_hash(password: str) -> str:
+    """Hash the default password of a bulk-imported account."""
+    return import_pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password without blocking the event loop."""
+    return await run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash without blocking the event loop (raises the same ValueError)."""
+    return await run_hashing(get_password_hash, password)
+
+
+async def get_import_password_hash_async(password: str) -> str:
+    """get_import_password_hash without blocking the event loop."""
+    return await run_hashing(get_import_password_hash, password)
+
+
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     """Generate JWT access token."""
     if expires_delta:
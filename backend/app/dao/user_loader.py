@@ -0,0 +1,58 @@
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.all_models import User
+
+
+class UserLoader:
+    """
+    Request-scoped batch loader for User rows.
+
+    Handlers that render lists (messages, tasks, teams, mentoring logs, peer
+    reviews) collect every user id they need, resolve them with a single
+    `IN` query and reuse the memoized rows for the rest of the request,
+    instead of issuing one `db.get(User, ...)` per row.
+
+    Create one per request: `users = UserLoader(db)`.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._cache: Dict[UUID, Optional[User]] = {}
+
+    def prime(self, user: User) -> None:
+        """Seed the cache with an already loaded user (e.g. current_user)."""
+        self._cache[user.user_id] = user
+
+    async def load_many(self, user_ids: Iterable[Optional[UUID]]) -> Dict[UUID, Optional[User]]:
+        """Resolve all given ids (None ids are ignored) in at most one query."""
+        wanted = {uid for uid in user_ids if uid is not None}
+        missing = wanted - self._cache.keys()
+        if missing:
+            result = await self.db.execute(select(User).where(User.user_id.in_(missing)))
+            for user in result.scalars().all():
+                self._cache[user.user_id] = user
+            # Remember misses too so they are not queried again
+            for uid in missing:
+                self._cache.setdefault(uid, None)
+        return {uid: self._cache[uid] for uid in wanted}
+
+    async def load(self, user_id: Optional[UUID]) -> Optional[User]:
+        if user_id is None:
+            return None
+        users = await self.load_many([user_id])
+        return users[user_id]
+
+    def get(self, user_id: Optional[UUID]) -> Optional[User]:
+        """Return a user already resolved by load_many/load (no query)."""
+        if user_id is None:
+            return None
+        return self._cache.get(user_id)
+
+    def name(self, user_id: Optional[UUID], default: Optional[str] = "Unknown") -> Optional[str]:
+        """Full name of an already resolved user, or `default`."""
+        user = self.get(user_id)
+        return user.full_name if user else default
@@ -0,0 +1,119 @@
+"""
+Per-request SQL accounting: statement count, DB time and repeated statement
+shapes (the usual N+1 signature).
+
+Engine events are installed once in app.db.session. They only record while a
+`track_queries()` block is active in the current context, so the cost when
+nothing is tracking is a single ContextVar lookup per statement.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# All QueryStats currently tracking; blocks may nest (e.g. a test budget
+# around a request that the debug middleware also tracks).
+_active: ContextVar[Tuple["QueryStats", ...]] = ContextVar("query_stats_active", default=())
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Expanded IN lists differ in length per call: "IN ($1::UUID, $2::UUID)" -> "IN (...)"
+_IN_LIST_RE = re.compile(
+    r"IN \((?:\s*(?:\$\d+|%\(\w+\)s|\?|:\w+)(?:::\w+)?\s*,?)+\)", re.IGNORECASE
+)
+_START_KEY = "query_stats_start"
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so calls differing only in parameters match."""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    return _IN_LIST_RE.sub("IN (...)", shape)
+
+
+class QueryStats:
+    """Statements executed while a tracking block was active."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+
+    @property
+    def total_time_ms(self) -> float:
+        return self.total_time * 1000
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Record every statement executed in this context until the block exits."""
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by query_budget() when a block issues too many statements."""
+
+
+@contextmanager
+def query_budget(
+    max_queries: Optional[int] = None,
+    max_repeats: Optional[int] = None,
+) -> Iterator[QueryStats]:
+    """
+    Fail when the wrapped code exceeds a declared query budget.
+
+    Args:
+        max_queries: Maximum number of statements allowed in the block
+        max_repeats: Maximum times a single statement shape may repeat
+            (catches N+1 loops even when the total stays small)
+    """
+    with track_queries() as stats:
+        yield stats
+
+    problems = []
+    if max_queries is not None and stats.count > max_queries:
+        problems.append(f"{stats.count} queries executed, budget is {max_queries}")
+    if max_repeats is not None:
+        for shape, n in stats.repeated(max_repeats):
+            problems.append(f"statement repeated {n}x (max {max_repeats}): {shape[:200]}")
+    if problems:
+        raise QueryBudgetExceeded("; ".join(problems))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active.get():
+        conn.info[_START_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    active = _active.get()
+    if not active:
+        return
+    started = conn.info.pop(_START_KEY, None)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    for stats in active:
+        stats.record(statement, elapsed)
+
+
+def install(engine: Engine) -> None:
+    """Attach the accounting listeners to a (sync) engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
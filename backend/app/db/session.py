@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engin
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db import query_stats
 
 
 # Create async engine with connection pooling (Standard for Session Mode / Port 5432)
@@ -15,6 +16,9 @@ engine: AsyncEngine = create_async_engine(
     max_overflow=20,
 )
 
+# Per-request statement count / DB time accounting (see app.db.query_stats)
+query_stats.install(engine.sync_engine)
+
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     bind=engine,
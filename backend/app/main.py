@@ -1,12 +1,18 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from pathlib import Path
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from app.core.config import settings
+from app.core.security import shutdown_hash_executor
+from app.db.query_stats import track_queries
 from app.api.v1.api import api_router  # Import from v1 API router
-from app.services.socket_manager import socket_app  # Socket.IO - Phase 3 BE1
+from app.services.socket_manager import sio, socket_app, typing_coalescer  # Socket.IO - Phase 3 BE1
+from app.services.outbox_dispatcher import outbox_dispatcher
+from app.services.events import event_bus
+from app.services.event_subscribers import register_subscribers
+from app.services.message_cache import start_message_cache_sync, stop_message_cache_sync
+from app.services.cache_invalidation import start_cache_invalidation, stop_cache_invalidation
+from app.services.file_downloads import object_response, upload_key
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -27,6 +33,23 @@ async def startup_event():
     db_display = db_url.replace(db_url.split('@')[0].split('://')[1], '****:****')
     logger.info(f"🗄️ DATABASE_URL: {db_display}")
     logger.info(f"📍 Using API prefix: {settings.API_V1_STR}")
+    if settings.OUTBOX_DISPATCHER_ENABLED:
+        outbox_dispatcher.start()
+    if not event_bus.subscriptions:
+        register_subscribers(event_bus)
+    event_bus.start()
+    start_message_cache_sync()
+    start_cache_invalidation()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await event_bus.stop()
+    await stop_message_cache_sync()
+    await stop_cache_invalidation()
+    await typing_coalescer.stop()
+    await outbox_dispatcher.stop()
+    shutdown_hash_executor()
 
 # Configure CORS
 # Always fall back to permissive origins during local development if none are provided
@@ -48,16 +71,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count"],
+    expose_headers=["X-Total-Count", "X-DB-Queries", "X-DB-Time-ms"],
 )
 
+if settings.DB_QUERY_STATS:
+    @app.middleware("http")
+    async def db_query_stats(request: Request, call_next):
+        """Count SQL statements and DB time per request (debug only)."""
+        with track_queries() as stats:
+            response = await call_next(request)
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time-ms"] = f"{stats.total_time_ms:.1f}"
+        repeated = stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            shape, count = repeated[0]
+            logger.warning(
+                f"Possible N+1 on {request.method} {request.url.path}: "
+                f"{count}x {shape[:120]}"
+            )
+        return response
+
 # Mount API routes with /api/v1 prefix
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-# Serve uploaded files
-uploads_root = Path(settings.ROOT_DIR) / "uploads"
-uploads_root.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=uploads_root), name="uploads")
+# Serve uploaded files: presigned redirect to the bucket, or from local disk
+# (Range, ETag/304, immutable caching, optional proxy offload)
+@app.api_route("/uploads/{file_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def serve_upload(file_path: str, request: Request):
+    return await object_response(request, upload_key(file_path))
 
 # Mount Socket.IO at /socket.io path - Phase 3 BE1
 app.mount("/socket.io", socket_app)
@@ -77,4 +118,9 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/sockets")
+async def socket_health():
+    """Outbound queue depth and typing counters of this worker's sockets."""
+    return {"outbound": sio.eio.stats(), "typing": typing_coalescer.stats()}
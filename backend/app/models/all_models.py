@@ -8,16 +8,19 @@ from uuid import UUID, uuid4
 
 from sqlalchemy import (
     Boolean,
+    Computed,
     Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -215,6 +218,9 @@ class AcademicClass(Base):
 
 class ClassEnrollment(Base):
     __tablename__ = "class_enrollments"
+    __table_args__ = (
+        Index("ix_class_enrollments_class_id_student_id", "class_id", "student_id"),
+    )
     enrollment_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     class_id: Mapped[int] = mapped_column(Integer, ForeignKey("academic_classes.class_id", ondelete="CASCADE"))
     student_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="CASCADE"))
@@ -296,6 +302,10 @@ class Team(Base):
 
 class TeamMember(Base):
     __tablename__ = "team_members"
+    __table_args__ = (
+        # PK (team_id, user_id) covers team lookups; "my teams" needs user_id first
+        Index("ix_team_members_user_id", "user_id"),
+    )
     # FIX: Added ondelete=CASCADE
     team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.team_id", ondelete="CASCADE"), primary_key=True)
     user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True) # Changed from student_id to user_id to match API
@@ -315,6 +325,9 @@ class TeamMember(Base):
 
 class Sprint(Base):
     __tablename__ = "sprints"
+    __table_args__ = (
+        Index("ix_sprints_team_id", "team_id"),
+    )
     sprint_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.team_id", ondelete="CASCADE"))
     name: Mapped[Optional[str]] = mapped_column(String, nullable=True) # Added/Mapped title->name? API uses name
@@ -331,6 +344,9 @@ class Sprint(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_sprint_id_status", "sprint_id", "status"),
+    )
     task_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     sprint_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("sprints.sprint_id", ondelete="CASCADE"), nullable=True)
     title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -380,11 +396,27 @@ class Channel(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Channel history is read newest-first; message_id breaks sent_at ties
+        Index("ix_messages_channel_id_sent_at", "channel_id", "sent_at", "message_id"),
+        # Reconnect catch-up reads (channel_id, message_id > last seen)
+        Index("ix_messages_channel_id_message_id", "channel_id", "message_id"),
+        # Full-text search (GET /messages/search)
+        Index("ix_messages_search_vector", "search_vector", postgresql_using="gin"),
+    )
     message_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     channel_id: Mapped[int] = mapped_column(Integer, ForeignKey("channels.channel_id", ondelete="CASCADE"))
     sender_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id"))
     content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # 'simple' config: no stemming or stop words, so Vietnamese and English
+    # text are tokenized the same way. Deferred: history reads never need it.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(content, ''))", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
 
     channel: Mapped["Channel"] = relationship("Channel", back_populates="messages")
     sender: Mapped["User"] = relationship("User", back_populates="sent_messages")
@@ -411,6 +443,10 @@ class Milestone(Base):
 
 class Checkpoint(Base):
     __tablename__ = "checkpoints"
+    __table_args__ = (
+        Index("ix_checkpoints_team_id_milestone_id", "team_id", "milestone_id"),
+        Index("ix_checkpoints_milestone_id", "milestone_id"),
+    )
     checkpoint_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.team_id", ondelete="CASCADE"))
     milestone_id: Mapped[int] = mapped_column(Integer, ForeignKey("milestones.milestone_id", ondelete="CASCADE"))
@@ -424,6 +460,9 @@ class Checkpoint(Base):
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        Index("ix_submissions_checkpoint_id_submitted_at", "checkpoint_id", "submitted_at"),
+    )
     submission_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     checkpoint_id: Mapped[int] = mapped_column(Integer, ForeignKey("checkpoints.checkpoint_id", ondelete="CASCADE"))
     submitted_by: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id"))
@@ -487,6 +526,9 @@ class EvaluationDetail(Base):
 
 class PeerReview(Base):
     __tablename__ = "peer_reviews"
+    __table_args__ = (
+        Index("ix_peer_reviews_team_id_reviewee_id", "team_id", "reviewee_id"),
+    )
     review_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     reviewer_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id"))
     reviewee_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id"))
@@ -502,6 +544,9 @@ class PeerReview(Base):
 
 class MentoringLog(Base):
     __tablename__ = "mentoring_logs"
+    __table_args__ = (
+        Index("ix_mentoring_logs_team_id_created_at", "team_id", "created_at"),
+    )
     log_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.team_id", ondelete="CASCADE"))
     mentor_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id"))
@@ -519,6 +564,9 @@ class MentoringLog(Base):
 class Resource(Base):
     """Resource model for files, documents, links shared in teams/classes."""
     __tablename__ = "resources"
+    __table_args__ = (
+        Index("ix_resources_team_id_created_at", "team_id", "created_at"),
+    )
     resource_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     uploaded_by: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id"))
     class_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("academic_classes.class_id"), nullable=True)
@@ -537,6 +585,9 @@ class Resource(Base):
 class Notification(Base):
     """Notification model for user notifications."""
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_id_is_read_created_at", "user_id", "is_read", "created_at"),
+    )
     notification_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="CASCADE"))
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -550,6 +601,28 @@ class Notification(Base):
     user: Mapped["User"] = relationship("User", back_populates="notifications")
 
 
+class NotificationOutbox(Base):
+    """
+    Pending real-time deliveries, written in the same transaction as the
+    notifications themselves and drained by the outbox dispatcher.
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_pending", "next_attempt_at", postgresql_where=text("failed_at IS NULL")),
+    )
+    outbox_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="CASCADE"))
+    notification_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("notifications.notification_id", ondelete="CASCADE"), nullable=True
+    )
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # JSON string emitted over Socket.IO
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    failed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)  # gave up after max attempts
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class ImportLog(Base):
     """Import log model to track bulk import operations."""
     __tablename__ = "import_logs"
@@ -37,7 +37,8 @@ class MessageResponse(BaseModel):
 class MessageListResponse(BaseModel):
     """Schema for paginated message list"""
     messages: List[MessageResponse]
-    total: int
+    total: Optional[int] = None
     has_more: bool
     skip: int
     limit: int
+    next_cursor: Optional[int] = None
@@ -1,7 +1,7 @@
 """Schemas for Submission operations."""
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 from uuid import UUID
 
@@ -170,4 +170,31 @@ class SubmissionStats(BaseModel):
                 "average_score": 82.5
             }
         }
-    )
\ No newline at end of file
+    )
+
+
+# ==========================================
+# RESUMABLE UPLOAD SCHEMAS
+# ==========================================
+
+class UploadSessionCreate(BaseModel):
+    """Schema for starting a resumable upload."""
+    file_name: str = Field(..., min_length=1, max_length=255, description="Original file name")
+    file_size: int = Field(..., gt=0, description="Total size in bytes")
+    sha256: Optional[str] = Field(
+        None, pattern=r"^[0-9a-fA-F]{64}$",
+        description="Optional SHA-256 of the whole file, checked on complete"
+    )
+
+
+class UploadSessionResponse(BaseModel):
+    """Progress of a resumable upload."""
+    upload_id: str
+    file_name: str
+    file_size: int
+    chunk_size: int
+    chunk_count: int
+    offset: int = Field(..., description="Bytes received contiguously from the start")
+    received_chunks: int
+    missing_chunks: List[int]
+    expires_at: datetime
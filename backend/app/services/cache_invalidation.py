@@ -0,0 +1,89 @@
+"""
+Membership and principal cache invalidation shared by all workers.
+
+Several per-process caches remember who belongs to which team (presence
+rosters, channel membership checks) or who a user is (principal_cache).
+Every worker keeps its own copy, so a change made through one worker has to
+reach all of them:
+
+- after a membership change the API calls `membership_changed()` (or
+  `team_deleted()` / `channel_deleted()`), after an account change
+  `user_changed()`; the caches that subscribed drop the affected entries on
+  this worker right away;
+- with SOCKETIO_MANAGER=redis the change is also published on a Redis
+  channel and applied by the other workers (redis_relay). If the
+  subscription drops, every subscribed cache is cleared, since changes may
+  have been missed.
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.redis_relay import RedisRelay
+
+logger = logging.getLogger(__name__)
+
+# {"op": "member", "team_id", "user_id"} | {"op": "team", "team_id"} | {"op": "channel", "channel_id"}
+# | {"op": "user", "user_id"}
+Change = Dict[str, Any]
+
+
+class CacheInvalidation:
+    """Fan-out of membership changes to the caches of this worker (and the others)."""
+
+    def __init__(self):
+        self._subscribers: List[Tuple[str, Callable[[Change], None], Callable[[], None]]] = []
+        self.relay: Optional[RedisRelay] = None
+
+    def subscribe(self, name: str, apply: Callable[[Change], None], clear: Callable[[], None]) -> None:
+        """`apply(change)` drops the entries a change affects; `clear()` drops everything."""
+        self._subscribers.append((name, apply, clear))
+
+    def membership_changed(self, team_id: int, user_id) -> None:
+        """A user joined or left a team."""
+        self._send({"op": "member", "team_id": team_id, "user_id": str(user_id)})
+
+    def team_deleted(self, team_id: int) -> None:
+        self._send({"op": "team", "team_id": team_id})
+
+    def channel_deleted(self, channel_id: int) -> None:
+        self._send({"op": "channel", "channel_id": channel_id})
+
+    def user_changed(self, user_id) -> None:
+        """A user's account changed (is_active, role, permissions, profile)."""
+        self._send({"op": "user", "user_id": str(user_id)})
+
+    def _send(self, change: Change) -> None:
+        self.apply_remote(change)
+        if self.relay is not None:
+            self.relay.publish(change)
+
+    def apply_remote(self, change: Change) -> None:
+        for name, apply, _ in self._subscribers:
+            try:
+                apply(change)
+            except Exception as e:
+                logger.error(f"Cache invalidation of {name} failed: {e}")
+
+    def clear(self) -> None:
+        for _, _, clear in self._subscribers:
+            clear()
+
+
+cache_invalidation = CacheInvalidation()
+
+
+def start_cache_invalidation() -> None:
+    """Share membership changes across workers when Socket.IO runs on Redis."""
+    if settings.SOCKETIO_MANAGER == "redis" and cache_invalidation.relay is None:
+        cache_invalidation.relay = RedisRelay(
+            settings.REDIS_URL, "cache_invalidation",
+            cache_invalidation.apply_remote, cache_invalidation.clear,
+        )
+        cache_invalidation.relay.start()
+
+
+async def stop_cache_invalidation() -> None:
+    if cache_invalidation.relay is not None:
+        await cache_invalidation.relay.stop()
+        cache_invalidation.relay = None
@@ -0,0 +1,129 @@
+"""
+Default domain event subscribers - Phase 3 BE1
+Nối event bus với socket broadcast, notifications và audit log
+
+Author: BE1
+"""
+import logging
+from typing import Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+
+from app.db.session import AsyncSessionLocal
+from app.models.all_models import AuditLog, Sprint, User
+from app.services import socket_manager
+from app.services.events import (
+    DomainEvent,
+    EventBus,
+    MessageCreated,
+    MessageDeleted,
+    MessageUpdated,
+    TaskChanged,
+    TeamMemberJoined,
+    TeamMemberLeft,
+    TeamUpdated,
+)
+from app.services.notification_service import NotificationService
+from app.services.team_presence import team_presence
+
+logger = logging.getLogger(__name__)
+
+# sprint_id -> team_id (sprint không bao giờ đổi team)
+_sprint_teams: Dict[int, int] = {}
+_SPRINT_TEAMS_MAX = 10000
+
+
+async def _team_of_sprint(sprint_id: Optional[int]) -> Optional[int]:
+    if sprint_id is None:
+        return None
+    team_id = _sprint_teams.get(sprint_id)
+    if team_id is None:
+        async with AsyncSessionLocal() as db:
+            team_id = await db.scalar(select(Sprint.team_id).where(Sprint.sprint_id == sprint_id))
+        if team_id is not None:
+            if len(_sprint_teams) >= _SPRINT_TEAMS_MAX:
+                _sprint_teams.clear()
+            _sprint_teams[sprint_id] = team_id
+    return team_id
+
+
+# ============ SOCKET BROADCAST ============
+
+async def broadcast_event(event: DomainEvent):
+    """Đẩy thay đổi tới room channel/team để client không cần poll REST"""
+    if isinstance(event, MessageCreated):
+        if event.broadcast:
+            await socket_manager.broadcast_message(event.channel_id, jsonable_encoder(event.message))
+    elif isinstance(event, MessageUpdated):
+        await socket_manager.broadcast_message_updated(event.channel_id, jsonable_encoder(event.message))
+    elif isinstance(event, MessageDeleted):
+        await socket_manager.broadcast_message_deleted(event.channel_id, event.message_id)
+    elif isinstance(event, TaskChanged):
+        team_id = await _team_of_sprint(event.sprint_id)
+        if team_id is not None:
+            await socket_manager.broadcast_task_update(
+                team_id,
+                jsonable_encoder({"task_id": event.task_id, "sprint_id": event.sprint_id,
+                                  "change": event.change, **event.task}),
+            )
+    elif isinstance(event, TeamMemberJoined):
+        # Roster cache đã bỏ lúc commit (cache_invalidation.membership_changed)
+        await socket_manager.broadcast_team_member_joined(
+            event.team_id, jsonable_encoder({"user_id": event.user_id, **event.member})
+        )
+        await team_presence.publish(event.team_id)
+    elif isinstance(event, TeamMemberLeft):
+        await socket_manager.broadcast_team_member_left(event.team_id, str(event.user_id))
+        await team_presence.publish(event.team_id)
+    elif isinstance(event, TeamUpdated):
+        await socket_manager.emit_to_room('team_updated', {
+            'type': 'team:updated',
+            'team_id': event.team_id,
+            'changes': jsonable_encoder(event.changes)
+        }, f"team_{event.team_id}")
+
+
+# ============ NOTIFICATIONS ============
+
+async def notify_event(event: TaskChanged):
+    """Notification cho người được giao task và cho team khi task DONE"""
+    notify_assignee = event.assigned_to is not None and event.assigned_to != event.actor_id
+    completed = event.change == "status_changed" and event.task.get("status") == "DONE"
+    if not (notify_assignee or completed):
+        return
+
+    async with AsyncSessionLocal() as db:
+        actor = await db.get(User, event.actor_id) if event.actor_id else None
+        actor_name = actor.full_name if actor and actor.full_name else "Someone"
+        title = event.task.get("title") or f"#{event.task_id}"
+        if notify_assignee:
+            await NotificationService.notify_task_assigned(
+                db, event.task_id, title, event.assigned_to, actor_name
+            )
+        if completed:
+            team_id = await _team_of_sprint(event.sprint_id)
+            if team_id is not None:
+                await NotificationService.notify_task_completed(
+                    db, team_id, title, event.actor_id, actor_name
+                )
+
+
+# ============ AUDIT LOG ============
+
+async def audit_events(events: List[DomainEvent]):
+    """Ghi audit log theo lô: một INSERT cho cả batch"""
+    rows = [
+        {"actor_id": event.actor_id, "action": event.action, "target_entity": event.target}
+        for event in events
+    ]
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(AuditLog), rows)
+        await db.commit()
+
+
+def register_subscribers(bus: EventBus):
+    """Đăng ký subscribers mặc định (gọi một lần lúc startup)"""
+    bus.subscribe("socket", broadcast_event)
+    bus.subscribe("notifications", notify_event, TaskChanged)
+    bus.subscribe("audit", audit_events, batch_size=100)
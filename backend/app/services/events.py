@@ -0,0 +1,253 @@
+"""
+In-process domain event bus.
+
+API handlers publish typed events after their transaction commits; the
+subscribers (socket broadcast, notifications, audit log) consume them in
+background tasks, so a request never waits on Socket.IO or on extra writes.
+
+Each subscriber owns a bounded queue and a single worker, which keeps events
+in publish order per subscriber. `publish()` never blocks: when a queue is
+full the event is dropped for that subscriber and counted. Events are lost
+on shutdown/crash - durable deliveries go through the notification outbox.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ============ EVENTS ============
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """Base class; `name` is used for logging, `action` for the audit log."""
+    actor_id: Optional[UUID]
+
+    name = "event"
+
+    @property
+    def action(self) -> str:
+        return self.name
+
+    @property
+    def target(self) -> Optional[str]:
+        return None
+
+
+@dataclass(frozen=True)
+class MessageCreated(DomainEvent):
+    channel_id: int
+    message: Dict[str, Any]
+    broadcast: bool = True  # False when the publisher already emitted to the channel
+    name = "message.created"
+
+    @property
+    def target(self) -> str:
+        return f"message:{self.message.get('message_id')}"
+
+
+@dataclass(frozen=True)
+class MessageUpdated(DomainEvent):
+    channel_id: int
+    message: Dict[str, Any]
+    name = "message.updated"
+
+    @property
+    def target(self) -> str:
+        return f"message:{self.message.get('message_id')}"
+
+
+@dataclass(frozen=True)
+class MessageDeleted(DomainEvent):
+    channel_id: int
+    message_id: int
+    name = "message.deleted"
+
+    @property
+    def target(self) -> str:
+        return f"message:{self.message_id}"
+
+
+@dataclass(frozen=True)
+class TaskChanged(DomainEvent):
+    """A task was created, edited, re-assigned, moved or deleted."""
+    task_id: int
+    sprint_id: Optional[int]
+    change: str  # created | updated | status_changed | assigned | deleted
+    task: Dict[str, Any] = field(default_factory=dict)
+    assigned_to: Optional[UUID] = None  # set when `change` gave the task a new assignee
+    name = "task.changed"
+
+    @property
+    def action(self) -> str:
+        return f"task.{self.change}"
+
+    @property
+    def target(self) -> str:
+        return f"task:{self.task_id}"
+
+
+@dataclass(frozen=True)
+class TeamMemberJoined(DomainEvent):
+    team_id: int
+    user_id: UUID
+    member: Dict[str, Any] = field(default_factory=dict)
+    name = "team.member_joined"
+
+    @property
+    def target(self) -> str:
+        return f"team:{self.team_id}"
+
+
+@dataclass(frozen=True)
+class TeamMemberLeft(DomainEvent):
+    team_id: int
+    user_id: UUID
+    name = "team.member_left"
+
+    @property
+    def target(self) -> str:
+        return f"team:{self.team_id}"
+
+
+@dataclass(frozen=True)
+class TeamUpdated(DomainEvent):
+    """Team settings changed (finalized, project selected)."""
+    team_id: int
+    changes: Dict[str, Any] = field(default_factory=dict)
+    name = "team.updated"
+
+    @property
+    def target(self) -> str:
+        return f"team:{self.team_id}"
+
+
+# ============ BUS ============
+
+Handler = Callable[[Any], Awaitable[None]]
+
+
+class Subscription:
+    """One subscriber: bounded queue + worker task."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        event_types: Tuple[Type[DomainEvent], ...],
+        queue_size: int,
+        batch_size: int = 1,
+    ):
+        self.name = name
+        self.handler = handler
+        self.event_types = event_types
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.handled = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def accepts(self, event: DomainEvent) -> bool:
+        return isinstance(event, self.event_types)
+
+    async def run(self) -> None:
+        while True:
+            event = await self.queue.get()
+            batch = [event]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                # batch_size > 1: the handler receives a list of events
+                await self.handler(batch if self.batch_size > 1 else event)
+                self.handled += len(batch)
+            except Exception as e:
+                self.errors += len(batch)
+                logger.error(f"Event subscriber '{self.name}' failed on {batch[0].name}: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+class EventBus:
+    """Fan domain events out to subscribers, off the request path."""
+
+    def __init__(self, queue_size: int = 1000):
+        self.queue_size = queue_size
+        self.subscriptions: List[Subscription] = []
+        self.running = False
+
+    def subscribe(
+        self,
+        name: str,
+        handler: Handler,
+        *event_types: Type[DomainEvent],
+        batch_size: int = 1,
+    ) -> Subscription:
+        """Register `handler` for the given event types (all events if none)."""
+        subscription = Subscription(
+            name, handler, event_types or (DomainEvent,), self.queue_size, batch_size
+        )
+        self.subscriptions.append(subscription)
+        if self.running:
+            subscription.task = asyncio.create_task(subscription.run())
+        return subscription
+
+    def publish(self, event: DomainEvent) -> None:
+        """Queue an event for every matching subscriber; never blocks."""
+        if not self.running:
+            return
+        for subscription in self.subscriptions:
+            if not subscription.accepts(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.dropped += 1
+                logger.warning(f"Event subscriber '{subscription.name}' is full, dropped {event.name}")
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        for subscription in self.subscriptions:
+            subscription.task = asyncio.create_task(subscription.run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting events, give queued ones `timeout` seconds, then cancel."""
+        if not self.running:
+            return
+        self.running = False
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(s.queue.join() for s in self.subscriptions)), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Event bus stopped with undelivered events")
+        for subscription in self.subscriptions:
+            if subscription.task is not None:
+                subscription.task.cancel()
+        await asyncio.gather(
+            *(s.task for s in self.subscriptions if s.task is not None), return_exceptions=True
+        )
+        for subscription in self.subscriptions:
+            subscription.task = None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            s.name: {
+                "queued": s.queue.qsize(),
+                "handled": s.handled,
+                "dropped": s.dropped,
+                "errors": s.errors,
+            }
+            for s in self.subscriptions
+        }
+
+
+event_bus = EventBus(queue_size=settings.EVENT_BUS_QUEUE_SIZE)
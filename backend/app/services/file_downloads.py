@@ -0,0 +1,262 @@
+"""
+File Downloads - Phase 4
+Cache-friendly, range-aware responses for uploaded files
+
+object_response() answers GET /uploads/{key} and
+GET /resources/download/{filename}. With STORAGE_BACKEND=s3 it is a 307 to
+a presigned URL of the bucket; with local storage file_response() serves
+the file:
+
+- Cache: names that can never point at other bytes (`<digest>.ext` from
+  FileStorage, older random uuid names) get
+  `Cache-Control: public, max-age=31536000, immutable`; anything else must
+  revalidate (`no-cache`).
+- Validators: strong ETag (the digest itself for content-addressed names,
+  mtime+size otherwise) and Last-Modified; If-None-Match / If-Modified-Since
+  answer 304 without touching the file.
+- Range: a single `bytes=` range answers 206 with Content-Range (resumed
+  downloads, video seeking); unsatisfiable ranges answer 416; If-Range
+  falls back to the full file when the validator changed. Multi-range
+  requests get the whole file (allowed by RFC 9110).
+- Body: read in FILE_STREAM_CHUNK_BYTES pieces on a worker thread.
+
+FILE_SERVE_MODE = "x-accel" (nginx) or "x-sendfile" (Apache, lighttpd): after
+the route's own checks the response carries only headers and the proxy
+sends the bytes (and handles Range itself), so a large download never
+occupies a Python worker. nginx example for the default prefix:
+
+    location /protected-uploads/ {
+        internal;
+        alias /app/uploads/;
+    }
+
+Author: BE4
+"""
+
+import asyncio
+import mimetypes
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+
+from app.core.config import settings
+from app.services.file_storage import is_immutable_name, is_stored_name
+from app.services.object_storage import (
+    IMMUTABLE_CACHE_CONTROL,
+    UPLOADS_ROOT,
+    content_disposition,
+    object_storage,
+)
+
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Opened from our own origin these could run script; always download them
+_ACTIVE_CONTENT_TYPES = {"text/html", "application/xhtml+xml", "image/svg+xml", "text/xml", "application/xml"}
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def _etag(path: Path, st: os.stat_result) -> str:
+    if is_stored_name(path.name):
+        return f'"{path.name.split(".", 1)[0]}"'
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses the weak comparison"""
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (first, last) byte positions, inclusive, for a single `bytes=` range;
+    None to send the whole file (no header, malformed, multiple ranges).
+    Raises RangeNotSatisfiable when no byte of the range exists.
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[6:].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    first, _, last = spec.partition("-")
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+async def _iter_file(path: Path, start: int, length: int) -> AsyncIterator[bytes]:
+    chunk_size = settings.FILE_STREAM_CHUNK_BYTES
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        await asyncio.to_thread(f.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+def _proxy_headers(path: Path) -> dict:
+    mode = settings.FILE_SERVE_MODE
+    if mode == "x-accel":
+        relative = path.resolve().relative_to(UPLOADS_ROOT.resolve()).as_posix()
+        return {"X-Accel-Redirect": settings.FILE_ACCEL_PREFIX.rstrip("/") + "/" + quote(relative)}
+    if mode == "x-sendfile":
+        return {"X-Sendfile": str(path.resolve())}
+    return {}
+
+
+async def file_response(
+    request: Request,
+    path: Path,
+    download_name: Optional[str] = None,
+    attachment: bool = False,
+) -> Response:
+    """Serve `path` with validators, cache headers and Range support (404 if missing)"""
+    try:
+        st = await asyncio.to_thread(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+
+    name = download_name or path.name
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if media_type in _ACTIVE_CONTENT_TYPES:
+        attachment = True
+    etag = _etag(path, st)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": (
+            IMMUTABLE_CACHE_CONTROL if is_immutable_name(path.name) else REVALIDATE_CACHE_CONTROL
+        ),
+        "Accept-Ranges": "bytes",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if _not_modified(request, etag, st.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers["Content-Disposition"] = content_disposition(
+        "attachment" if attachment else "inline", name
+    )
+    proxy = _proxy_headers(path)
+    if proxy:
+        return Response(headers={**headers, **proxy}, media_type=media_type)
+
+    size = st.st_size
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() in (etag, headers["Last-Modified"]):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+
+    status_code = status.HTTP_200_OK
+    start, length = 0, size
+    if byte_range is not None:
+        first, last = byte_range
+        start, length = first, last - first + 1
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    headers["Content-Length"] = str(length)
+
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        _iter_file(path, start, length),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
+
+
+async def object_response(
+    request: Request,
+    key: str,
+    download_name: Optional[str] = None,
+    attachment: bool = False,
+) -> Response:
+    """Serve an object of the storage: presigned redirect, or the local file"""
+    name = download_name or key.rsplit("/", 1)[-1]
+    if mimetypes.guess_type(name)[0] in _ACTIVE_CONTENT_TYPES:
+        attachment = True
+    url = object_storage.presigned_url(key, download_name=name, attachment=attachment)
+    if url is None:
+        try:
+            path = object_storage.local_path(key)
+        except FileNotFoundError:
+            path = None
+        if path is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found"
+            )
+        return await file_response(request, path, download_name, attachment)
+    # The redirect may be reused while the signature is still valid
+    max_age = settings.STORAGE_PRESIGN_EXPIRE_SECONDS // 2
+    return RedirectResponse(
+        url,
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"Cache-Control": f"private, max-age={max_age}"},
+    )
+
+
+def upload_key(relative: str) -> str:
+    """Storage key of a path under /uploads/; 404 for traversal or hidden files"""
+    path = PurePosixPath(relative)
+    if (
+        not path.parts
+        or path.is_absolute()
+        or "\\" in relative
+        or any(part.startswith(".") for part in path.parts)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    return path.as_posix()
@@ -0,0 +1,188 @@
+"""
+File Storage - Phase 4
+Content-addressed, streaming storage for uploaded files (submissions, resources)
+
+Uploads are copied to disk in UPLOAD_CHUNK_BYTES chunks on a worker thread
+(never on the event loop) while a SHA-256 is computed over the same bytes. The
+stored name is `<digest><suffix>`, where digest is an HMAC of the SHA-256
+keyed with SECRET_KEY, so an identical file uploaded again - a re-submitted
+report, the same slides shared with two classes - resolves to the existing
+file and costs no extra disk. The names are served without authentication
+under /uploads/, and being keyed, they cannot be computed from a file's
+bytes: holding a copy of a file does not tell anyone whether (or where) it
+was uploaded. Changing SECRET_KEY keeps old names working; only files
+uploaded afterwards are de-duplicated against each other.
+
+- Size limits per kind of file (document / image / archive / video, from the
+  suffix), enforced while copying: the copy stops as soon as the limit is
+  passed and the partial file is removed.
+- Memory per upload is one chunk. The multipart parser has already spooled
+  the part to a temporary file (kept in memory only up to 1 MB), so nothing
+  holds the whole file in RAM.
+- Files are written to `.upload-*.part` in a local staging directory, then
+  handed to the configured object storage (renamed into place on local
+  disk, uploaded to the bucket with S3), so a half-written file is never
+  served.
+
+Author: BE4
+"""
+
+import asyncio
+import hashlib
+import hmac
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile, status
+
+from app.core.config import settings
+from app.services.object_storage import (
+    IMMUTABLE_CACHE_CONTROL,
+    UPLOADS_ROOT,
+    ObjectStorage,
+    object_storage,
+)
+
+FILE_KINDS = {
+    **dict.fromkeys((".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".bmp"), "image"),
+    **dict.fromkeys((".zip", ".rar", ".7z", ".tar", ".gz", ".tgz", ".bz2", ".xz"), "archive"),
+    **dict.fromkeys((".mp4", ".mov", ".webm", ".mkv", ".avi", ".m4v"), "video"),
+}
+
+_SUFFIX_RE = re.compile(r"^\.[a-z0-9]{1,10}$")
+_STORED_NAME_RE = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]{1,10})?$")
+# Names given by the upload endpoints before content addressing: a random
+# uuid4 hex, never reused or rewritten
+_LEGACY_NAME_RE = re.compile(r"^(resource_)?[0-9a-f]{32}(\.[A-Za-z0-9]{1,10})?$")
+
+
+def file_suffix(filename: Optional[str]) -> str:
+    """Lower-cased extension of the client file name ('' if unusable)"""
+    suffix = Path(filename or "").suffix.lower()
+    return suffix if _SUFFIX_RE.match(suffix) else ""
+
+
+def file_kind(suffix: str) -> str:
+    return FILE_KINDS.get(suffix, "document")
+
+
+def size_limit(kind: str) -> int:
+    return {
+        "image": settings.UPLOAD_MAX_BYTES_IMAGE,
+        "archive": settings.UPLOAD_MAX_BYTES_ARCHIVE,
+        "video": settings.UPLOAD_MAX_BYTES_VIDEO,
+    }.get(kind, settings.UPLOAD_MAX_BYTES_DOCUMENT)
+
+
+def stored_digest(sha256: str) -> str:
+    """Public name (without suffix) of the file with this SHA-256"""
+    return hmac.new(
+        settings.SECRET_KEY.encode(), b"upload-name:" + sha256.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def is_stored_name(name: str) -> bool:
+    """True for names produced by FileStorage (`<digest><suffix>`)"""
+    return bool(_STORED_NAME_RE.match(name))
+
+
+def is_immutable_name(name: str) -> bool:
+    """True if the bytes behind this name can never change"""
+    return is_stored_name(name) or bool(_LEGACY_NAME_RE.match(name))
+
+
+def file_too_large(kind: str, limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large: {kind} uploads are limited to {limit // (1024 * 1024)} MB",
+    )
+
+
+@dataclass
+class StoredFile:
+    name: str
+    sha256: str
+    size: int
+    kind: str
+    deduplicated: bool
+
+
+class FileStorage:
+    """Content-addressed files under one key prefix of the object storage"""
+
+    def __init__(self, prefix: str, storage: ObjectStorage, chunk_size: int = 1024 * 1024):
+        self.prefix = prefix
+        self.storage = storage
+        self.chunk_size = chunk_size
+        # Staging for uploads in progress; with the local driver also where
+        # the files end up, so the final rename never crosses filesystems
+        self.root = UPLOADS_ROOT / prefix
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}/{name}" if self.prefix else name
+
+    async def save_upload(self, upload: UploadFile) -> StoredFile:
+        """Stream an UploadFile into the store; 400 if empty, 413 if over the limit"""
+        suffix = file_suffix(upload.filename)
+        kind = file_kind(suffix)
+        limit = size_limit(kind)
+        # Size of the spooled part, when the parser recorded it
+        if upload.size is not None and upload.size > limit:
+            raise file_too_large(kind, limit)
+        return await asyncio.to_thread(self._store, upload.file, suffix, kind, limit)
+
+    def _store(self, source: BinaryIO, suffix: str, kind: str, limit: int) -> StoredFile:
+        source.seek(0)
+        digest = hashlib.sha256()
+        size = 0
+        part = self.root / f".upload-{uuid4().hex}.part"
+        try:
+            with open(part, "wb") as out:
+                while chunk := source.read(self.chunk_size):
+                    size += len(chunk)
+                    if size > limit:
+                        raise file_too_large(kind, limit)
+                    digest.update(chunk)
+                    out.write(chunk)
+            if size == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Empty file",
+                )
+            return self._commit(part, digest.hexdigest(), size, suffix, kind)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+
+    async def adopt(self, path: Path, suffix: str) -> StoredFile:
+        """Move a file assembled elsewhere on the same filesystem into the store"""
+        return await asyncio.to_thread(self._adopt, path, suffix)
+
+    def _adopt(self, path: Path, suffix: str) -> StoredFile:
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            while chunk := f.read(self.chunk_size):
+                size += len(chunk)
+                digest.update(chunk)
+        return self._commit(path, digest.hexdigest(), size, suffix, file_kind(suffix))
+
+    def _commit(self, part: Path, sha256: str, size: int, suffix: str, kind: str) -> StoredFile:
+        name = f"{stored_digest(sha256)}{suffix}"
+        key = self.key(name)
+        deduplicated = self.storage.exists(key)
+        if deduplicated:
+            part.unlink()
+        else:
+            self.storage.put(part, key, cache_control=IMMUTABLE_CACHE_CONTROL)
+        return StoredFile(name=name, sha256=sha256, size=size, kind=kind, deduplicated=deduplicated)
+
+
+# Submissions keep their own prefix; resources have always lived at the
+# top of uploads/
+submission_files = FileStorage("submissions", object_storage, settings.UPLOAD_CHUNK_BYTES)
+resource_files = FileStorage("", object_storage, settings.UPLOAD_CHUNK_BYTES)
@@ -17,10 +17,7 @@ from app.schemas.import_schemas import (
     ImportStats
 )
 from app.models.all_models import Subject, AcademicClass, User, Department, Semester, Role
-from passlib.context import CryptContext
-
-# Use sha256_crypt to avoid bcrypt 72-byte limit issues
-import_pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+from app.core.security import get_import_password_hash_async
 
 
 # ==========================================
@@ -400,7 +397,7 @@ async def import_users(db: AsyncSession, dataframe: pd.DataFrame) -> UserImportR
             new_user = User(
                 email=email,
                 full_name=full_name,
-                password_hash=import_pwd_context.hash(password),
+                password_hash=await get_import_password_hash_async(password),
                 role_id=role_id,
                 dept_id=dept_id,
                 phone=phone if phone else None,
@@ -0,0 +1,291 @@
+"""
+Hot-channel message cache for GET /messages.
+
+Nearly every read is the newest page of an active channel. This module keeps
+a ring buffer per channel with the last MESSAGE_CACHE_PER_CHANNEL messages,
+already serialized as MessageResponse dicts (sender names resolved), plus a
+short-lived cache of positive team-membership checks. A newest-page read
+that hits both needs no SQL at all.
+
+- Channels are evicted LRU once MESSAGE_CACHE_MAX_CHANNELS or the
+  approximate MESSAGE_CACHE_MAX_BYTES is exceeded.
+- send/edit/delete write through with `put()` / `remove()`. A buffer only
+  ever receives writes after it was loaded from the database; writes that
+  race with a load are queued and replayed on top of the loaded rows.
+- With SOCKETIO_MANAGER=redis every write is also published on a Redis
+  channel and applied by the other workers (redis_relay). If the
+  subscription drops, the local cache is cleared, since updates may have
+  been missed.
+- Membership checks and the buffers of deleted channels/teams are dropped
+  through cache_invalidation, which reaches every worker: a user who left a
+  team (or was removed) loses cached access everywhere at once.
+"""
+import time
+from bisect import insort
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.cache_invalidation import cache_invalidation
+from app.services.redis_relay import RedisRelay
+
+Message = Dict[str, Any]  # jsonable MessageResponse
+
+# Rough per-message overhead of the dict and its small fields
+_MESSAGE_OVERHEAD_BYTES = 400
+
+
+def _sort_key(message: Message) -> Tuple[str, int]:
+    # Same order as the (channel_id, sent_at, message_id) index
+    return (message["sent_at"], message["message_id"])
+
+
+def _size(message: Message) -> int:
+    return (_MESSAGE_OVERHEAD_BYTES + len(message.get("content") or "")
+            + len(message.get("sender_name") or ""))
+
+
+class ChannelBuffer:
+    """Newest messages of one channel, oldest first."""
+
+    __slots__ = ("team_id", "messages", "complete", "size")
+
+    def __init__(self, team_id: int, messages: List[Message], complete: bool):
+        self.team_id = team_id
+        self.messages = sorted(messages, key=_sort_key)
+        # True when the buffer holds every message of the channel
+        self.complete = complete
+        self.size = sum(_size(m) for m in self.messages)
+
+    def _index(self, message_id: int) -> Optional[int]:
+        for i in range(len(self.messages) - 1, -1, -1):
+            if self.messages[i]["message_id"] == message_id:
+                return i
+        return None
+
+    def put(self, message: Message, capacity: int) -> None:
+        i = self._index(message["message_id"])
+        if i is not None:
+            self.size -= _size(self.messages[i])
+            self.messages[i] = message
+        else:
+            insort(self.messages, message, key=_sort_key)
+        self.size += _size(message)
+        while len(self.messages) > capacity:
+            self.size -= _size(self.messages.pop(0))
+            self.complete = False
+
+    def remove(self, message_id: int) -> None:
+        i = self._index(message_id)
+        if i is not None:
+            self.size -= _size(self.messages.pop(i))
+
+    def newest_page(self, limit: int) -> Optional[Tuple[List[Message], bool]]:
+        """(page oldest-first, has_more), or None if the buffer cannot answer."""
+        if len(self.messages) > limit:
+            return self.messages[-limit:], True
+        if self.complete:
+            return list(self.messages), False
+        return None
+
+
+class MessageCache:
+    """Per-process LRU of channel buffers and membership checks."""
+
+    def __init__(self, per_channel: int, max_channels: int, max_bytes: int, membership_ttl: float):
+        self.per_channel = per_channel
+        self.max_channels = max_channels
+        self.max_bytes = max_bytes
+        self.membership_ttl = membership_ttl
+        self._channels: "OrderedDict[int, ChannelBuffer]" = OrderedDict()
+        # channel_id -> ops received while the channel was being loaded
+        self._loading: Dict[int, List[Tuple[str, Any]]] = {}
+        self._members: Dict[Tuple[int, str], float] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.sync: Optional[RedisRelay] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_channel > 0 and self.max_channels > 0
+
+    @property
+    def capacity(self) -> int:
+        # One extra message so a full page of per_channel still knows has_more
+        return self.per_channel + 1
+
+    # ---------- reads ----------
+
+    def newest_page(self, channel_id: int, limit: int) -> Optional[Tuple[int, List[Message], bool]]:
+        """
+        (team_id, page oldest-first, has_more) for a newest-page read, or None
+        (a miss) when the database has to be queried. The caller still checks
+        membership of team_id.
+        """
+        buffer = self._channels.get(channel_id)
+        page = buffer.newest_page(limit) if buffer is not None else None
+        if page is None:
+            self.misses += 1
+            return None
+        self._channels.move_to_end(channel_id)
+        self.hits += 1
+        return (buffer.team_id, *page)
+
+    def is_member(self, team_id: int, user_id) -> bool:
+        key = (team_id, str(user_id))
+        expires_at = self._members.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._members[key]
+            return False
+        return True
+
+    # ---------- loads ----------
+
+    def begin_load(self, channel_id: int) -> None:
+        """Call before querying the rows passed to `load()`."""
+        if self.enabled:
+            self._loading.setdefault(channel_id, [])
+
+    def abort_load(self, channel_id: int) -> None:
+        self._loading.pop(channel_id, None)
+
+    def load(self, channel_id: int, team_id: int, messages: List[Message], complete: bool) -> None:
+        """Install a buffer from the newest `messages` of a channel (any order)."""
+        pending = self._loading.pop(channel_id, None)
+        if not self.enabled or pending is None:
+            return
+        old = self._channels.pop(channel_id, None)
+        if old is not None:
+            self.bytes -= old.size
+        messages = sorted(messages, key=_sort_key)[-self.capacity:]
+        buffer = ChannelBuffer(team_id, messages, complete)
+        for op, arg in pending:
+            if op == "put":
+                buffer.put(arg, self.capacity)
+            else:
+                buffer.remove(arg)
+        self._channels[channel_id] = buffer
+        self.bytes += buffer.size
+        self._evict()
+
+    def remember_member(self, team_id: int, user_id) -> None:
+        if self.enabled and self.membership_ttl > 0:
+            if len(self._members) >= self.max_channels * 20:
+                self._members.clear()
+            self._members[(team_id, str(user_id))] = time.monotonic() + self.membership_ttl
+
+    # ---------- writes (local + other workers) ----------
+
+    def put(self, channel_id: int, message: Message) -> None:
+        """Insert or replace a message after commit."""
+        self._apply(channel_id, "put", message)
+        self._publish({"op": "put", "channel_id": channel_id, "message": message})
+
+    def remove(self, channel_id: int, message_id: int) -> None:
+        self._apply(channel_id, "remove", message_id)
+        self._publish({"op": "remove", "channel_id": channel_id, "message_id": message_id})
+
+    def apply_remote(self, data: Dict[str, Any]) -> None:
+        op = data.get("op")
+        if op == "put":
+            self._apply(data["channel_id"], "put", data["message"])
+        elif op == "remove":
+            self._apply(data["channel_id"], "remove", data["message_id"])
+
+    # ---------- membership (cache_invalidation, every worker) ----------
+
+    def apply_change(self, change: Dict[str, Any]) -> None:
+        op = change["op"]
+        if op == "member":
+            self._members.pop((change["team_id"], change["user_id"]), None)
+        elif op == "team":
+            team_id = change["team_id"]
+            for key in [key for key in self._members if key[0] == team_id]:
+                del self._members[key]
+            for channel_id in [c for c, buffer in self._channels.items() if buffer.team_id == team_id]:
+                self._drop(channel_id)
+        elif op == "channel":
+            self._drop(change["channel_id"])
+
+    def clear_members(self) -> None:
+        self._members.clear()
+
+    def _apply(self, channel_id: int, op: str, arg) -> None:
+        pending = self._loading.get(channel_id)
+        if pending is not None:
+            pending.append((op, arg))
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            return
+        self.bytes -= buffer.size
+        if op == "put":
+            buffer.put(arg, self.capacity)
+        else:
+            buffer.remove(arg)
+        self.bytes += buffer.size
+        self._evict()
+
+    def _drop(self, channel_id: int) -> None:
+        self._loading.pop(channel_id, None)
+        buffer = self._channels.pop(channel_id, None)
+        if buffer is not None:
+            self.bytes -= buffer.size
+
+    def _publish(self, data: Dict[str, Any]) -> None:
+        if self.sync is not None:
+            self.sync.publish(data)
+
+    def _evict(self) -> None:
+        while self._channels and (
+            len(self._channels) > self.max_channels or self.bytes > self.max_bytes
+        ):
+            _, buffer = self._channels.popitem(last=False)
+            self.bytes -= buffer.size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._channels.clear()
+        self._loading.clear()
+        self._members.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "channels": len(self._channels),
+            "max_channels": self.max_channels,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+message_cache = MessageCache(
+    per_channel=settings.MESSAGE_CACHE_PER_CHANNEL,
+    max_channels=settings.MESSAGE_CACHE_MAX_CHANNELS,
+    max_bytes=settings.MESSAGE_CACHE_MAX_BYTES,
+    membership_ttl=settings.MESSAGE_CACHE_MEMBERSHIP_TTL_SECONDS,
+)
+cache_invalidation.subscribe("message_cache", message_cache.apply_change, message_cache.clear_members)
+
+
+def start_message_cache_sync() -> None:
+    """Share cache writes across workers when Socket.IO runs on Redis."""
+    if settings.SOCKETIO_MANAGER == "redis" and message_cache.enabled and message_cache.sync is None:
+        message_cache.sync = RedisRelay(
+            settings.REDIS_URL, "message_cache", message_cache.apply_remote, message_cache.clear,
+        )
+        message_cache.sync.start()
+
+
+async def stop_message_cache_sync() -> None:
+    if message_cache.sync is not None:
+        await message_cache.sync.stop()
+        message_cache.sync = None
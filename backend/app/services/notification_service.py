@@ -6,14 +6,15 @@ Author: BE1
 Created: Feb 2026
 """
 
-from typing import Optional, List
+import json
+from typing import Iterable, Optional, List
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
-from app.models.all_models import Notification, User
-from app.services.socket_manager import send_notification, sio
+from app.models.all_models import Notification, NotificationOutbox, User
+from app.services.outbox_dispatcher import outbox_dispatcher
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,124 @@ class NotificationService:
     TYPE_MENTORING = "mentoring"
     TYPE_SYSTEM = "system"
     
+    @staticmethod
+    def _payload(notification: Notification, link: Optional[str] = None, metadata: Optional[dict] = None) -> dict:
+        """Dữ liệu gửi qua socket, cùng tên field với NotificationResponse"""
+        return {
+            "notification_id": notification.notification_id,
+            "user_id": str(notification.user_id),
+            "title": notification.title,
+            "message": notification.message,
+            "type": notification.notification_type,
+            "related_entity_type": notification.related_entity_type,
+            "related_entity_id": notification.related_entity_id,
+            "action_url": link,
+            "is_read": notification.is_read,
+            "created_at": notification.created_at.isoformat() if notification.created_at else None,
+            "metadata": metadata
+        }
+    
+    @staticmethod
+    async def create_bulk(
+        db: AsyncSession,
+        user_ids: Iterable[UUID],
+        title: str,
+        content: str,
+        notification_type: str = "system",
+        related_entity_type: Optional[str] = None,
+        related_entity_id: Optional[int] = None
+    ) -> List[Notification]:
+        """
+        Tạo notifications cho nhiều user bằng một câu INSERT ... RETURNING.
+        Không commit - caller commit cùng transaction của mình.
+        
+        Args:
+            db: Database session
+            user_ids: Danh sách user nhận (trùng lặp sẽ bị bỏ)
+            title: Tiêu đề notification
+            content: Nội dung notification
+            notification_type: Loại notification (message, task, team, etc.)
+            related_entity_type: Loại entity liên quan (optional)
+            related_entity_id: ID entity liên quan (optional)
+        
+        Returns:
+            List Notification đã insert (có notification_id, created_at)
+        """
+        recipients = list(dict.fromkeys(user_ids))
+        if not recipients:
+            return []
+        
+        rows = [
+            {
+                "user_id": user_id,
+                "title": title,
+                "message": content,
+                "notification_type": notification_type,
+                "is_read": False,
+                "related_entity_type": related_entity_type,
+                "related_entity_id": related_entity_id,
+            }
+            for user_id in recipients
+        ]
+        result = await db.scalars(insert(Notification).returning(Notification), rows)
+        return list(result.all())
+    
+    @staticmethod
+    async def enqueue(
+        db: AsyncSession,
+        notifications: List[Notification],
+        link: Optional[str] = None,
+        metadata: Optional[dict] = None
+    ):
+        """
+        Ghi outbox cho real-time delivery, cùng transaction với notifications.
+        Không commit - outbox_dispatcher gửi sau khi transaction commit,
+        emit lỗi thì retry nên không mất notification.
+        """
+        if not notifications:
+            return
+        rows = [
+            {
+                "user_id": notification.user_id,
+                "notification_id": notification.notification_id,
+                "payload": json.dumps(NotificationService._payload(notification, link, metadata)),
+            }
+            for notification in notifications
+        ]
+        await db.execute(insert(NotificationOutbox), rows)
+    
+    @staticmethod
+    async def create_and_send_bulk(
+        db: AsyncSession,
+        user_ids: Iterable[UUID],
+        title: str,
+        content: str,
+        notification_type: str = "system",
+        link: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        related_entity_type: Optional[str] = None,
+        related_entity_id: Optional[int] = None
+    ) -> List[Notification]:
+        """
+        Tạo notifications và outbox cho nhiều user trong một transaction,
+        commit rồi đánh thức outbox_dispatcher (request không chờ emit).
+        """
+        notifications = await NotificationService.create_bulk(
+            db,
+            user_ids,
+            title=title,
+            content=content,
+            notification_type=notification_type,
+            related_entity_type=related_entity_type,
+            related_entity_id=related_entity_id,
+        )
+        if not notifications:
+            return []
+        await NotificationService.enqueue(db, notifications, link=link, metadata=metadata)
+        await db.commit()
+        outbox_dispatcher.wake()
+        return notifications
+    
     @staticmethod
     async def create_and_send(
         db: AsyncSession,
@@ -57,38 +176,16 @@ class NotificationService:
         Returns:
             Notification object đã được tạo
         """
-        # Create notification in DB
-        notification = Notification(
-            user_id=user_id,
+        notifications = await NotificationService.create_and_send_bulk(
+            db,
+            [user_id],
             title=title,
             content=content,
-            type=notification_type,
+            notification_type=notification_type,
             link=link,
-            is_read=False
+            metadata=metadata,
         )
-        db.add(notification)
-        await db.commit()
-        await db.refresh(notification)
-        
-        # Send real-time notification
-        notification_data = {
-            "notification_id": notification.notification_id,
-            "title": notification.title,
-            "content": notification.content,
-            "type": notification.type,
-            "link": notification.link,
-            "is_read": notification.is_read,
-            "created_at": notification.created_at.isoformat() if notification.created_at else None,
-            "metadata": metadata
-        }
-        
-        try:
-            await send_notification(str(user_id), notification_data)
-            logger.info(f"Notification sent to user {user_id}")
-        except Exception as e:
-            logger.error(f"Failed to send real-time notification: {e}")
-        
-        return notification
+        return notifications[0]
     
     @staticmethod
     async def send_to_team(
@@ -97,7 +194,8 @@ class NotificationService:
         title: str,
         content: str,
         notification_type: str = "team",
-        exclude_user: Optional[UUID] = None
+        exclude_user: Optional[UUID] = None,
+        link: Optional[str] = None
     ) -> List[Notification]:
         """
         Gửi notification cho tất cả members trong team.
@@ -109,6 +207,7 @@ class NotificationService:
             content: Nội dung notification
             notification_type: Loại notification
             exclude_user: User ID để loại trừ (ví dụ: người gửi)
+            link: Link liên quan (optional)
         
         Returns:
             List of created notifications
@@ -116,26 +215,22 @@ class NotificationService:
         from app.models.all_models import TeamMember
         
         # Get all team members
-        result = await db.execute(
-            select(TeamMember.user_id).where(TeamMember.team_id == team_id)
-        )
+        query = select(TeamMember.user_id).where(TeamMember.team_id == team_id)
+        if exclude_user:
+            query = query.where(TeamMember.user_id != exclude_user)
+        result = await db.execute(query)
         member_ids = [row[0] for row in result.fetchall()]
         
-        notifications = []
-        for user_id in member_ids:
-            if exclude_user and user_id == exclude_user:
-                continue
-            
-            notification = await NotificationService.create_and_send(
-                db=db,
-                user_id=user_id,
-                title=title,
-                content=content,
-                notification_type=notification_type
-            )
-            notifications.append(notification)
-        
-        return notifications
+        return await NotificationService.create_and_send_bulk(
+            db,
+            member_ids,
+            title=title,
+            content=content,
+            notification_type=notification_type,
+            link=link,
+            related_entity_type="team",
+            related_entity_id=team_id,
+        )
     
     @staticmethod
     async def notify_new_message(
@@ -166,15 +261,16 @@ class NotificationService:
         )
         member_ids = [row[0] for row in result.fetchall()]
         
-        for user_id in member_ids:
-            await NotificationService.create_and_send(
-                db=db,
-                user_id=user_id,
-                title=f"New message from {sender_name}",
-                content=message_preview[:100] + "..." if len(message_preview) > 100 else message_preview,
-                notification_type=NotificationService.TYPE_MESSAGE,
-                link=f"/channels/{channel_id}"
-            )
+        await NotificationService.create_and_send_bulk(
+            db,
+            member_ids,
+            title=f"New message from {sender_name}",
+            content=message_preview[:100] + "..." if len(message_preview) > 100 else message_preview,
+            notification_type=NotificationService.TYPE_MESSAGE,
+            link=f"/channels/{channel_id}",
+            related_entity_type="channel",
+            related_entity_id=channel_id,
+        )
     
     @staticmethod
     async def notify_task_assigned(
@@ -0,0 +1,252 @@
+"""
+Object Storage - Phase 4
+Where uploaded files live: local disk or an S3-compatible bucket
+
+STORAGE_BACKEND picks the driver used by every upload and download path
+(FileStorage, GET /uploads/{key}, resource downloads, submission exports):
+
+- "local": files under uploads/ on this machine, served by the API (or by
+  the reverse proxy with FILE_SERVE_MODE). One replica, or a shared volume.
+- "s3": one bucket on AWS S3, MinIO or any S3-compatible server. Downloads
+  answer 307 to a presigned GET URL, so file bytes go from the bucket to
+  the browser and never through a Python worker; any number of replicas
+  can serve the API. Requires boto3.
+
+Keys are paths relative to uploads/ ("submissions/<digest>.pdf",
+"<digest>.png" for resources), so URLs already stored in the database
+(/uploads/..., /api/v1/resources/download/...) keep working after a switch
+once the existing files are copied into the bucket (`mc mirror uploads/
+<alias>/<bucket>` or `aws s3 sync uploads/ s3://<bucket>/`).
+
+Driver methods block (disk or network I/O): call them via asyncio.to_thread.
+
+Author: BE4
+"""
+
+import mimetypes
+import os
+import shutil
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+from urllib.parse import quote
+
+from app.core.config import settings
+
+UPLOADS_ROOT = Path(settings.ROOT_DIR) / "uploads"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def content_disposition(disposition: str, filename: str) -> str:
+    fallback = filename.encode("ascii", "replace").decode().replace('"', "").replace("?", "_")
+    return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+class ObjectStorage(ABC):
+    """Storage driver interface"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def size(self, key: str) -> Optional[int]:
+        """Size in bytes, None if there is no such object"""
+
+    def sizes(self, keys: Iterable[str]) -> Dict[str, int]:
+        """Sizes of the objects that exist among `keys`"""
+        found = {}
+        for key in set(keys):
+            size = self.size(key)
+            if size is not None:
+                found[key] = size
+        return found
+
+    @abstractmethod
+    def put(self, path: Path, key: str, cache_control: Optional[str] = None):
+        """Store a finished local file under `key`; the local file is consumed"""
+
+    @abstractmethod
+    def open(self, key: str) -> Tuple[BinaryIO, int]:
+        """Readable stream and size of an object; FileNotFoundError if missing"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Path on this machine, for drivers that keep files on local disk"""
+        return None
+
+    def presigned_url(self, key: str, download_name: Optional[str] = None,
+                      attachment: bool = False) -> Optional[str]:
+        """Time-limited URL the client downloads from directly (None: serve locally)"""
+        return None
+
+
+class LocalStorage(ObjectStorage):
+    """Files under one directory of the local filesystem"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def local_path(self, key: str) -> Path:
+        root = self.root.resolve()
+        path = (root / key).resolve()
+        if not path.is_relative_to(root):
+            raise FileNotFoundError(key)
+        return path
+
+    def exists(self, key: str) -> bool:
+        return self.local_path(key).is_file()
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            path = self.local_path(key)
+            return path.stat().st_size if path.is_file() else None
+        except OSError:
+            return None
+
+    def put(self, path: Path, key: str, cache_control: Optional[str] = None):
+        target = self.local_path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(path, target)
+        except OSError:
+            # Staged on another filesystem
+            shutil.move(path, target)
+
+    def open(self, key: str) -> Tuple[BinaryIO, int]:
+        f = open(self.local_path(key), "rb")
+        return f, os.fstat(f.fileno()).st_size
+
+    def delete(self, key: str):
+        self.local_path(key).unlink(missing_ok=True)
+
+
+class S3Storage(ObjectStorage):
+    """Objects in one bucket of an S3-compatible service (AWS S3, MinIO...)"""
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None,
+                 public_endpoint_url: Optional[str] = None, region: str = "us-east-1",
+                 access_key_id: Optional[str] = None, secret_access_key: Optional[str] = None,
+                 presign_expire_seconds: int = 900, part_size: int = 8 * 1024 * 1024,
+                 max_concurrency: int = 16):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+        except ImportError as e:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from e
+
+        def client(endpoint: Optional[str]):
+            return boto3.client(
+                "s3",
+                endpoint_url=endpoint or None,
+                region_name=region,
+                aws_access_key_id=access_key_id or None,
+                aws_secret_access_key=secret_access_key or None,
+                # Path-style addressing: MinIO and most self-hosted servers
+                config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+            )
+
+        self.bucket = bucket
+        self.presign_expire_seconds = presign_expire_seconds
+        self.client = client(endpoint_url)
+        # Browsers may reach the bucket under another host name than the API
+        # does (docker network vs. published port); the signature covers it
+        self.presign_client = (
+            client(public_endpoint_url) if public_endpoint_url else self.client
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=part_size, multipart_chunksize=part_size
+        )
+        # HEAD requests in flight at once for sizes()
+        self.max_concurrency = max_concurrency
+
+    def _head(self, key: str) -> Optional[dict]:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self._head(key) is not None
+
+    def size(self, key: str) -> Optional[int]:
+        head = self._head(key)
+        return head["ContentLength"] if head is not None else None
+
+    def sizes(self, keys: Iterable[str]) -> Dict[str, int]:
+        # One HEAD per key, max_concurrency at a time (boto3 clients are
+        # thread-safe): a batch costs a few round-trips, not one per key
+        keys = list(set(keys))
+        if len(keys) <= 1:
+            return super().sizes(keys)
+        with ThreadPoolExecutor(min(self.max_concurrency, len(keys))) as pool:
+            found = zip(keys, pool.map(self.size, keys))
+            return {key: size for key, size in found if size is not None}
+
+    def put(self, path: Path, key: str, cache_control: Optional[str] = None):
+        extra = {"ContentType": mimetypes.guess_type(key)[0] or "application/octet-stream"}
+        if cache_control:
+            extra["CacheControl"] = cache_control
+        # Multipart in part_size pieces: memory stays bounded for large files
+        self.client.upload_file(
+            str(path), self.bucket, key, ExtraArgs=extra, Config=self.transfer_config
+        )
+        path.unlink(missing_ok=True)
+
+    def open(self, key: str) -> Tuple[BinaryIO, int]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                raise FileNotFoundError(key) from e
+            raise
+        return response["Body"], response["ContentLength"]
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def presigned_url(self, key: str, download_name: Optional[str] = None,
+                      attachment: bool = False) -> str:
+        params = {"Bucket": self.bucket, "Key": key}
+        if download_name:
+            params["ResponseContentDisposition"] = content_disposition(
+                "attachment" if attachment else "inline", download_name
+            )
+        # Signing is local computation, no request to the bucket
+        return self.presign_client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=self.presign_expire_seconds
+        )
+
+
+def create_object_storage() -> ObjectStorage:
+    """Driver selected by STORAGE_BACKEND"""
+    backend = settings.STORAGE_BACKEND.lower()
+    if backend == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            public_endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            presign_expire_seconds=settings.STORAGE_PRESIGN_EXPIRE_SECONDS,
+            part_size=settings.UPLOAD_SESSION_CHUNK_BYTES,
+        )
+    if backend != "local":
+        raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+    return LocalStorage(UPLOADS_ROOT)
+
+
+object_storage = create_object_storage()
@@ -0,0 +1,159 @@
+"""
+Notification outbox dispatcher.
+
+NotificationService writes one `notification_outbox` row per recipient in the
+same transaction as the notifications, so a committed notification always has
+a pending delivery and a request never waits on Socket.IO. This dispatcher
+drains the outbox in the background:
+
+- batches are claimed with FOR UPDATE SKIP LOCKED, so several workers can
+  drain the same table without emitting a row twice
+- delivered rows are deleted; failed rows are retried with exponential
+  backoff and parked (failed_at set) after OUTBOX_MAX_ATTEMPTS
+- `wake()` is called after a commit to deliver immediately; otherwise the
+  table is polled every OUTBOX_POLL_INTERVAL_SECONDS (also how rows written
+  by other workers are picked up)
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.all_models import NotificationOutbox
+from app.services.socket_manager import send_notification
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxDispatcher:
+    """Background task delivering notification_outbox rows over Socket.IO."""
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        batch_size: int = 200,
+        poll_interval: float = 2.0,
+        max_attempts: int = 8,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        """Deliver pending rows now instead of at the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds to wait before retry number `attempts` (1-based)."""
+        return min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                more = await self.dispatch_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox dispatch failed: {e}")
+                more = False
+            if more:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def dispatch_batch(self) -> bool:
+        """
+        Deliver one batch of due rows.
+
+        Returns:
+            True when the batch was full (more rows are probably due)
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(NotificationOutbox)
+                .where(
+                    NotificationOutbox.failed_at.is_(None),
+                    NotificationOutbox.next_attempt_at <= func.now(),
+                )
+                .order_by(NotificationOutbox.outbox_id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                return False
+
+            delivered_ids = []
+            now = datetime.now(timezone.utc)
+            for row in rows:
+                try:
+                    await send_notification(str(row.user_id), json.loads(row.payload))
+                    delivered_ids.append(row.outbox_id)
+                except Exception as e:
+                    row.attempts += 1
+                    row.last_error = str(e)[:1000]
+                    if row.attempts >= self.max_attempts:
+                        row.failed_at = now
+                        self.failed += 1
+                        logger.error(
+                            f"Giving up on outbox row {row.outbox_id} after {row.attempts} attempts: {e}"
+                        )
+                    else:
+                        row.next_attempt_at = now + timedelta(seconds=self.backoff(row.attempts))
+                        self.retried += 1
+
+            if delivered_ids:
+                await db.execute(
+                    delete(NotificationOutbox).where(NotificationOutbox.outbox_id.in_(delivered_ids))
+                )
+            await db.commit()
+            self.delivered += len(delivered_ids)
+            return len(rows) == self.batch_size
+
+
+outbox_dispatcher = OutboxDispatcher(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    backoff_base=settings.OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.OUTBOX_BACKOFF_MAX_SECONDS,
+)
@@ -0,0 +1,207 @@
+"""
+Presence store - who is online, shared across uvicorn workers.
+
+Each worker only sees its own sockets, so "is user X online" and "which
+sockets does X have" must be answered from a store all workers write to.
+
+- MemoryPresenceStore: single process / tests
+- RedisPresenceStore: one sorted set per user (sid -> last heartbeat) plus a
+  sorted set of online users. Every worker refreshes the scores of its own
+  sockets periodically, so entries left behind by a crashed worker simply
+  age out after `ttl` seconds.
+
+Both also count the sockets that chose the msgpack encoding (socket_codec),
+so a broadcast is encoded and published a second time only when some worker
+has such a socket.
+"""
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+
+
+class PresenceStore(ABC):
+    """Interface shared by the presence backends."""
+
+    # Seconds between heartbeats; None = backend never goes stale
+    heartbeat_interval: Optional[float] = None
+
+    @abstractmethod
+    async def add(self, user_id: str, sid: str) -> None:
+        ...
+
+    @abstractmethod
+    async def remove(self, user_id: str, sid: str) -> None:
+        ...
+
+    @abstractmethod
+    async def user_sockets(self, user_id: str) -> Set[str]:
+        ...
+
+    @abstractmethod
+    async def is_online(self, user_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def online_users(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    async def online_among(self, user_ids: List[str]) -> Set[str]:
+        """The subset of `user_ids` that is online; cost grows with len(user_ids)."""
+
+    @abstractmethod
+    async def add_compact(self, sid: str) -> None:
+        """Mark a socket as using the msgpack encoding."""
+
+    @abstractmethod
+    async def remove_compact(self, sid: str) -> None:
+        ...
+
+    @abstractmethod
+    async def has_compact(self) -> bool:
+        """Whether any worker has a live msgpack socket."""
+
+    async def refresh(self, connections: Dict[str, Set[str]], compact: Set[str] = frozenset()) -> None:
+        """Heartbeat for the sockets owned by this worker (user_id -> sids, msgpack sids)."""
+
+
+class MemoryPresenceStore(PresenceStore):
+    """Process-local presence (single worker, tests)."""
+
+    def __init__(self):
+        self._users: Dict[str, Set[str]] = {}
+        self._compact: Set[str] = set()
+
+    async def add(self, user_id: str, sid: str) -> None:
+        self._users.setdefault(user_id, set()).add(sid)
+
+    async def remove(self, user_id: str, sid: str) -> None:
+        sockets = self._users.get(user_id)
+        if sockets is not None:
+            sockets.discard(sid)
+            if not sockets:
+                del self._users[user_id]
+
+    async def user_sockets(self, user_id: str) -> Set[str]:
+        return set(self._users.get(user_id, ()))
+
+    async def is_online(self, user_id: str) -> bool:
+        return bool(self._users.get(user_id))
+
+    async def online_users(self) -> List[str]:
+        return list(self._users.keys())
+
+    async def online_among(self, user_ids: List[str]) -> Set[str]:
+        return {user_id for user_id in user_ids if self._users.get(user_id)}
+
+    async def add_compact(self, sid: str) -> None:
+        self._compact.add(sid)
+
+    async def remove_compact(self, sid: str) -> None:
+        self._compact.discard(sid)
+
+    async def has_compact(self) -> bool:
+        return bool(self._compact)
+
+
+# Remove one sid and drop the user from the online set once no live sid is left,
+# atomically so a concurrent connect on another worker is never lost.
+_REMOVE_SCRIPT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+if redis.call('ZCARD', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[3])
+end
+return 1
+"""
+
+
+class RedisPresenceStore(PresenceStore):
+    """Presence shared by all workers through Redis."""
+
+    def __init__(self, url: str, ttl: int = 90, prefix: str = "presence"):
+        import redis.asyncio as redis  # optional: only needed in multi-worker mode
+
+        self.redis = redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.heartbeat_interval = max(1.0, ttl / 3)
+        self.prefix = prefix
+        self._remove = self.redis.register_script(_REMOVE_SCRIPT)
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.prefix}:user:{user_id}"
+
+    @property
+    def _online_key(self) -> str:
+        return f"{self.prefix}:online"
+
+    @property
+    def _compact_key(self) -> str:
+        return f"{self.prefix}:compact"
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl
+
+    async def add(self, user_id: str, sid: str) -> None:
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self._user_key(user_id), {sid: now})
+            pipe.expire(self._user_key(user_id), self.ttl)
+            pipe.zadd(self._online_key, {user_id: now})
+            await pipe.execute()
+
+    async def remove(self, user_id: str, sid: str) -> None:
+        await self._remove(
+            keys=[self._user_key(user_id), self._online_key],
+            args=[sid, self._cutoff(), user_id],
+        )
+
+    async def user_sockets(self, user_id: str) -> Set[str]:
+        return set(await self.redis.zrangebyscore(self._user_key(user_id), self._cutoff(), "+inf"))
+
+    async def is_online(self, user_id: str) -> bool:
+        return await self.redis.zcount(self._user_key(user_id), self._cutoff(), "+inf") > 0
+
+    async def online_users(self) -> List[str]:
+        return await self.redis.zrangebyscore(self._online_key, self._cutoff(), "+inf")
+
+    async def online_among(self, user_ids: List[str]) -> Set[str]:
+        if not user_ids:
+            return set()
+        # Scores are last heartbeats: users of a crashed worker age out
+        scores = await self.redis.zmscore(self._online_key, user_ids)
+        cutoff = self._cutoff()
+        return {user_id for user_id, score in zip(user_ids, scores) if score is not None and score >= cutoff}
+
+    async def add_compact(self, sid: str) -> None:
+        await self.redis.zadd(self._compact_key, {sid: time.time()})
+
+    async def remove_compact(self, sid: str) -> None:
+        await self.redis.zrem(self._compact_key, sid)
+
+    async def has_compact(self) -> bool:
+        return await self.redis.zcount(self._compact_key, self._cutoff(), "+inf") > 0
+
+    async def refresh(self, connections: Dict[str, Set[str]], compact: Set[str] = frozenset()) -> None:
+        if not connections:
+            return
+        now = time.time()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id, sids in connections.items():
+                pipe.zadd(self._user_key(user_id), {sid: now for sid in sids})
+                pipe.expire(self._user_key(user_id), self.ttl)
+                pipe.zadd(self._online_key, {user_id: now})
+            if compact:
+                pipe.zadd(self._compact_key, {sid: now for sid in compact})
+            pipe.zremrangebyscore(self._online_key, "-inf", self._cutoff())
+            pipe.zremrangebyscore(self._compact_key, "-inf", self._cutoff())
+            await pipe.execute()
+
+
+def create_presence_store() -> PresenceStore:
+    """Presence backend matching the Socket.IO client manager (SOCKETIO_MANAGER)."""
+    if settings.SOCKETIO_MANAGER == "redis":
+        return RedisPresenceStore(settings.REDIS_URL, ttl=settings.SOCKETIO_PRESENCE_TTL_SECONDS)
+    return MemoryPresenceStore()
@@ -0,0 +1,124 @@
+"""
+Principal cache for get_current_user.
+
+Every authenticated request used to load the User row (plus its Role) before
+any handler logic ran. This module keeps a bounded LRU of recently seen
+principals with a TTL, keyed by user_id, so the common case costs no SQL.
+
+Entries hold plain column snapshots, not ORM instances, so nothing is shared
+between sessions. `restore()` rebuilds a persistent User (with role) inside
+the caller's session via merge(load=False), which issues no statement.
+
+The cache is per process. Code that changes is_active, can_create_topics,
+role_id or profile fields must call `cache_invalidation.user_changed(user_id)`
+after commit; the entry is dropped on this worker right away and, with
+SOCKETIO_MANAGER=redis, on every other worker through the shared relay.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models.all_models import Role, User
+from app.services.cache_invalidation import cache_invalidation
+
+_Snapshot = Tuple[Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+def _columns(obj) -> Dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+def _detached(model, values: Dict[str, Any]):
+    obj = model(**values)
+    make_transient_to_detached(obj)
+    return obj
+
+
+class PrincipalCache:
+    """Bounded LRU/TTL cache of authenticated users."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, _Snapshot]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, user_id) -> Optional[_Snapshot]:
+        """Return the cached snapshot for user_id, or None (counted as a miss)."""
+        key = str(user_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, snapshot = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return snapshot
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, user: User) -> None:
+        """Snapshot a loaded user; `user.role` must already be loaded."""
+        if not self.enabled:
+            return
+        role = user.role
+        snapshot = (_columns(user), _columns(role) if role is not None else None)
+        key = str(user.user_id)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        """Drop a user so the next request reloads it from the database."""
+        if self._entries.pop(str(user_id), None) is not None:
+            self.invalidations += 1
+
+    def apply_change(self, change: Dict[str, Any]) -> None:
+        """cache_invalidation change from this or another worker."""
+        if change["op"] == "user":
+            self.invalidate(change["user_id"])
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    @staticmethod
+    async def restore(db: AsyncSession, snapshot: _Snapshot) -> User:
+        """Attach a cached snapshot to `db` as a persistent User without a query."""
+        user_values, role_values = snapshot
+        user = _detached(User, user_values)
+        # Committed value, not an assignment: no backref append, nothing dirty
+        set_committed_value(
+            user, "role", _detached(Role, role_values) if role_values is not None else None
+        )
+        return await db.merge(user, load=False)
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+cache_invalidation.subscribe("principal_cache", principal_cache.apply_change, principal_cache.clear)
@@ -0,0 +1,85 @@
+"""
+Redis pub/sub relay for per-process caches.
+
+Each worker keeps its own copy of some caches (message_cache buffers,
+cache_invalidation subscribers). A relay publishes the changes one worker
+makes on a Redis channel and hands the changes of the other workers to
+`apply`; a worker's own messages are recognised by an origin id and skipped.
+
+Publishing never blocks the caller: messages go through an in-process queue
+and a background task. If the subscription drops, changes may have been
+missed, so `lost()` is called (callers clear their cache) and the relay
+resubscribes.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RedisRelay:
+    """Relay dict messages between workers over one Redis pub/sub channel."""
+
+    def __init__(
+        self,
+        url: str,
+        channel: str,
+        apply: Callable[[Dict[str, Any]], None],
+        lost: Callable[[], None],
+    ):
+        import redis.asyncio as redis  # optional: only needed in multi-worker mode
+
+        self.redis = redis.from_url(url, decode_responses=True)
+        self.channel = channel
+        self.apply = apply
+        self.lost = lost
+        self.origin = uuid.uuid4().hex
+        self._outbox: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def publish(self, data: Dict[str, Any]) -> None:
+        if self._outbox is not None:
+            self._outbox.put_nowait(json.dumps({"origin": self.origin, **data}))
+
+    def start(self) -> None:
+        self._outbox = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._send()), asyncio.create_task(self._listen())]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._outbox = None
+        await self.redis.aclose()
+
+    async def _send(self) -> None:
+        while True:
+            payload = await self._outbox.get()
+            try:
+                await self.redis.publish(self.channel, payload)
+            except Exception as e:
+                # Other workers stay stale until their TTLs run out or their
+                # own subscription notices the outage
+                logger.error(f"Publish on {self.channel} failed: {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for item in pubsub.listen():
+                        if item.get("type") != "message":
+                            continue
+                        data = json.loads(item["data"])
+                        if data.pop("origin", None) != self.origin:
+                            self.apply(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Subscription to {self.channel} lost, clearing caches: {e}")
+                self.lost()
+                await asyncio.sleep(1)
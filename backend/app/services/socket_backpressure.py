@@ -0,0 +1,186 @@
+"""
+Socket Backpressure - Phase 3 BE1
+Giới hạn hàng đợi gửi (outbound) của từng socket
+
+Engine.IO giữ một asyncio.Queue không giới hạn cho mỗi socket: client bị treo
+(mạng di động yếu, tab ngủ) không đọc nữa thì queue - và RAM của server - tăng
+mãi. BoundedEngineIOServer kiểm tra độ sâu queue trước mỗi packet gửi đi (kể
+cả packet nhận qua Redis từ worker khác):
+
+- >= SOCKET_OUTBOUND_HIGH_WATER: bỏ các event chỉ mang trạng thái mới nhất
+  (DROPPABLE_EVENTS - typing/presence snapshot), snapshot kế tiếp sẽ thay thế;
+  bản msgpack (header BINARY_EVENT + attachment) bị bỏ cả cụm, không bao giờ
+  chỉ một nửa
+- >= SOCKET_OUTBOUND_MAX_QUEUE: bỏ packet và ngắt kết nối client
+- vượt high-water liên tục quá SOCKET_SLOW_CONSUMER_GRACE_SECONDS: ngắt kết nối
+
+Client bị ngắt sẽ reconnect và lấy lại phần bỏ lỡ qua `sync`.
+stats() trả về độ sâu queue hiện tại (tổng, max, phân bố) và các counter.
+
+Author: BE1
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+import logging
+
+import engineio
+from engineio import packet as eio_packet
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Event chỉ mang trạng thái mới nhất: bỏ được khi client đang chậm
+DROPPABLE_EVENTS: Set[str] = {"typing_snapshot", "presence_snapshot"}
+
+
+def _event_header(pkt: eio_packet.Packet) -> Tuple[Optional[str], int]:
+    """
+    (tên event, số binary attachment) của một Socket.IO packet đã encode:
+    EVENT '2["name",...]' hoặc BINARY_EVENT '5<n>-["name",{"_placeholder":...}]'
+    (n packet bytes theo ngay sau); (None, 0) với packet khác
+    """
+    data = pkt.data
+    if pkt.packet_type != eio_packet.MESSAGE or not isinstance(data, str):
+        return None, 0
+    attachments = 0
+    if data[:1] == "5":
+        dash = data.find("-")
+        if dash == -1 or not data[1:dash].isdigit():
+            return None, 0
+        attachments = int(data[1:dash])
+    elif data[:1] != "2":
+        return None, 0
+    start = data.find('["')
+    if start == -1:
+        return None, attachments
+    end = data.find('"', start + 2)
+    return (data[start + 2:end] if end != -1 else None), attachments
+
+
+class BoundedEngineIOServer(engineio.AsyncServer):
+    """engineio.AsyncServer với hàng đợi outbound có giới hạn theo socket"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.high_water = settings.SOCKET_OUTBOUND_HIGH_WATER
+        self.max_queue = settings.SOCKET_OUTBOUND_MAX_QUEUE
+        self.grace = settings.SOCKET_SLOW_CONSUMER_GRACE_SECONDS
+        self.check_interval = settings.SOCKET_OUTBOUND_CHECK_INTERVAL_SECONDS
+        # eio sid -> thời điểm bắt đầu vượt high-water
+        self._over_since: Dict[str, float] = {}
+        self._evicting: Set[str] = set()
+        # eio sid -> [số attachment còn chờ, giữ hay bỏ]: header BINARY_EVENT
+        # và các attachment của nó được gửi hoặc bỏ cùng nhau
+        self._attachments: Dict[str, list] = {}
+        self._monitor_task: Optional[asyncio.Task] = None
+        # Counters
+        self.dropped = 0
+        self.overflowed = 0
+        self.evicted = 0
+
+    async def send_packet(self, sid, pkt):
+        socket = self.sockets.get(sid)
+        if socket is not None and not self._admit(sid, socket.queue.qsize(), pkt):
+            return
+        await super().send_packet(sid, pkt)
+
+    def _admit(self, sid: str, depth: int, pkt: eio_packet.Packet) -> bool:
+        pending = self._attachments.get(sid)
+        if pending is not None and pkt.binary:
+            pending[0] -= 1
+            if pending[0] <= 0:
+                del self._attachments[sid]
+            return pending[1]
+        event, attachments = _event_header(pkt)
+        admitted = self._admit_event(sid, depth + attachments, event)
+        if attachments:
+            self._attachments[sid] = [attachments, admitted]
+        return admitted
+
+    def _admit_event(self, sid: str, depth: int, event: Optional[str]) -> bool:
+        if depth >= self.max_queue:
+            self.overflowed += 1
+            if sid not in self._evicting:
+                asyncio.create_task(self.evict(sid, f"queue full ({depth} packets)"))
+            return False
+        if depth >= self.high_water and event in DROPPABLE_EVENTS:
+            self.dropped += 1
+            return False
+        return True
+
+    def ensure_monitor(self):
+        """Bắt đầu kiểm tra slow consumer (dừng khi không còn socket)"""
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._monitor())
+
+    async def _monitor(self):
+        while self.sockets:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check_slow_consumers()
+            except Exception as e:
+                logger.error(f"Slow consumer check failed: {e}")
+
+    async def check_slow_consumers(self) -> int:
+        """Ngắt các socket vượt high-water lâu hơn grace; trả về số socket bị ngắt"""
+        now = time.monotonic()
+        slow = []
+        for sid, socket in list(self.sockets.items()):
+            if socket.queue.qsize() < self.high_water:
+                self._over_since.pop(sid, None)
+            elif now - self._over_since.setdefault(sid, now) >= self.grace:
+                slow.append(sid)
+        for state in (self._over_since, self._attachments):
+            for sid in [sid for sid in state if sid not in self.sockets]:
+                del state[sid]
+        for sid in slow:
+            await self.evict(sid, f"over {self.high_water} queued packets for {self.grace:g}s")
+        return len(slow)
+
+    async def evict(self, sid: str, reason: str):
+        """Ngắt kết nối ngay, bỏ các packet còn trong queue"""
+        socket = self.sockets.get(sid)
+        if socket is None or sid in self._evicting:
+            return
+        self._evicting.add(sid)
+        try:
+            self.evicted += 1
+            logger.warning(f"Evicting slow socket {sid}: {reason}")
+            self._discard_queue(socket)
+            # abort: không chờ gửi CLOSE qua kết nối đang nghẽn
+            await socket.close(wait=False, abort=True)
+            self._discard_queue(socket)
+            socket.queue.put_nowait(None)  # cho writer task thoát
+            self.sockets.pop(sid, None)
+        finally:
+            self._evicting.discard(sid)
+            self._over_since.pop(sid, None)
+            self._attachments.pop(sid, None)
+
+    @staticmethod
+    def _discard_queue(socket):
+        while True:
+            try:
+                socket.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            socket.queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        depths = [socket.queue.qsize() for socket in self.sockets.values()]
+        return {
+            "sockets": len(depths),
+            "queued_packets": sum(depths),
+            "max_depth": max(depths, default=0),
+            "idle": sum(1 for d in depths if d == 0),
+            "backlogged": sum(1 for d in depths if 0 < d < self.high_water),
+            "over_high_water": sum(1 for d in depths if d >= self.high_water),
+            "high_water": self.high_water,
+            "max_queue": self.max_queue,
+            "dropped": self.dropped,
+            "overflowed": self.overflowed,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,185 @@
+"""
+Socket Chat - Phase 3 BE1
+Gửi tin nhắn trực tiếp qua Socket.IO (event `new_message`) có ack
+
+So với POST /messages/ (HTTP round-trip, decode JWT, load user, load channel,
+kiểm tra membership, INSERT, refresh cho mỗi tin nhắn):
+- user đã xác thực lúc connect; tên người gửi và quyền vào từng channel được
+  cache cho cả vòng đời connection (ConnectionManager.socket_profiles /
+  socket_channels); quyền bị bỏ khi user rời team hoặc team/channel bị xoá,
+  trên mọi worker (cache_invalidation)
+- các tin nhắn gửi đồng thời được gom vào một INSERT ... RETURNING mỗi batch
+  (MessageWriter, group commit) thay vì một transaction mỗi tin
+- ack trả message_id ngay sau commit, sau đó broadcast tới `channel_{id}`
+
+Author: BE1
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import logging
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.all_models import Channel, Message, TeamMember, User
+from app.services.events import MessageCreated, event_bus
+from app.services.message_cache import message_cache
+from app.services.socket_manager import broadcast_message, manager, typing_coalescer
+
+logger = logging.getLogger(__name__)
+
+MAX_CONTENT_LENGTH = 5000  # cùng giới hạn với MessageCreate
+
+# Giữ reference tới các broadcast task đang chạy
+_background: Set[asyncio.Task] = set()
+
+
+class MessageWriter:
+    """
+    Group commit cho tin nhắn: mọi tin gửi tới trong lúc một batch đang ghi
+    sẽ được ghi chung ở batch kế tiếp (một INSERT ... RETURNING, một commit).
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, max_batch: int = 200):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.written = 0
+
+    async def write(self, channel_id: int, sender_id: UUID, content: str) -> Tuple[int, datetime]:
+        """Ghi một tin nhắn, trả về (message_id, sent_at) sau khi commit"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((
+            {"channel_id": channel_id, "sender_id": sender_id, "content": content},
+            future,
+        ))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        while self._pending:
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            try:
+                async with self.session_factory() as db:
+                    result = await db.execute(
+                        insert(Message).returning(
+                            Message.message_id, Message.sent_at, sort_by_parameter_order=True
+                        ),
+                        [row for row, _ in batch],
+                    )
+                    rows = result.all()
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Message batch insert failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.written += len(batch)
+            for (_, future), (message_id, sent_at) in zip(batch, rows):
+                if not future.done():
+                    future.set_result((message_id, sent_at))
+
+
+message_writer = MessageWriter(max_batch=settings.SOCKET_MESSAGE_BATCH_SIZE)
+
+
+async def _sender_name(sid: str, user_id: str) -> Optional[str]:
+    """Tên người gửi, load một lần cho mỗi connection; None nếu user bị khóa"""
+    if sid not in manager.socket_profiles:
+        async with AsyncSessionLocal() as db:
+            user = await db.get(User, UUID(user_id))
+        if user is None or not user.is_active:
+            return None
+        manager.socket_profiles[sid] = user.full_name or ""
+    return manager.socket_profiles[sid]
+
+
+async def channel_team(sid: str, user_id: str, channel_id: int) -> Optional[int]:
+    """team_id của channel nếu user là thành viên; kết quả dương được cache theo connection"""
+    channels = manager.socket_channels.setdefault(sid, {})
+    if channel_id not in channels:
+        async with AsyncSessionLocal() as db:
+            team_id = await db.scalar(
+                select(Channel.team_id)
+                .join(TeamMember, TeamMember.team_id == Channel.team_id)
+                .where(Channel.channel_id == channel_id, TeamMember.user_id == UUID(user_id))
+            )
+        if team_id is None:
+            return None
+        channels[channel_id] = team_id
+    return channels[channel_id]
+
+
+async def send_from_socket(sid: str, data: Any) -> Dict[str, Any]:
+    """
+    Xử lý event `new_message`.
+
+    data = {"channel_id": 123, "content": "Hello", "client_id": "tmp-1"}
+
+    Returns:
+        Ack: {"message_id", "sent_at", "client_id"} hoặc {"error", "client_id"}
+    """
+    data = data if isinstance(data, dict) else {}
+    client_id = data.get("client_id")
+    user_id = manager.socket_to_user.get(sid)
+    if not user_id:
+        return {"error": "unauthorized", "client_id": client_id}
+
+    content = data.get("content")
+    try:
+        channel_id = int(data.get("channel_id"))
+    except (TypeError, ValueError):
+        return {"error": "invalid_channel", "client_id": client_id}
+    if not isinstance(content, str) or not 1 <= len(content) <= MAX_CONTENT_LENGTH:
+        return {"error": "invalid_content", "client_id": client_id}
+
+    sender_name = await _sender_name(sid, user_id)
+    if sender_name is None:
+        return {"error": "unauthorized", "client_id": client_id}
+    team_id = await channel_team(sid, user_id, channel_id)
+    if team_id is None:
+        return {"error": "forbidden", "client_id": client_id}
+
+    try:
+        message_id, sent_at = await message_writer.write(channel_id, UUID(user_id), content)
+    except Exception:
+        return {"error": "write_failed", "client_id": client_id}
+
+    message = jsonable_encoder({
+        "message_id": message_id,
+        "channel_id": channel_id,
+        "sender_id": user_id,
+        "sender_name": sender_name,
+        "content": content,
+        "sent_at": sent_at,
+        "is_edited": False,
+    })
+    typing_coalescer.release(channel_id, user_id)
+    message_cache.remember_member(team_id, user_id)
+    message_cache.put(channel_id, message)
+    # Socket path broadcast ngay (không qua hàng đợi của event bus), sau ack
+    task = asyncio.create_task(_broadcast(channel_id, message))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    event_bus.publish(MessageCreated(
+        actor_id=UUID(user_id), channel_id=channel_id, message=message, broadcast=False
+    ))
+    return {"message_id": message_id, "sent_at": message["sent_at"], "client_id": client_id}
+
+
+async def _broadcast(channel_id: int, message: dict):
+    try:
+        await broadcast_message(channel_id, message)
+    except Exception as e:
+        logger.error(f"Broadcast of message {message['message_id']} failed: {e}")
@@ -0,0 +1,111 @@
+"""
+Socket Payload Codec - Phase 3 BE1
+Chế độ payload nhị phân (msgpack) cho các event broadcast, opt-in theo connection
+
+Mặc định mọi event là JSON (dict lồng nhau, datetime dạng chuỗi ISO, UUID dạng
+chuỗi 36 ký tự). Client gửi auth = {"token": ..., "encoding": "msgpack"} lúc
+connect thì nhận các event broadcast (message_received, task_updated,
+notification, ...) dưới dạng một binary attachment duy nhất:
+
+    socket.on('message_received', (buf) => decode(buf))   // @msgpack/msgpack
+
+- cùng cấu trúc dict với bản JSON
+- UUID -> ext type 1, 16 bytes: field `*_id`, `*_ids`, `*_by`, `*_to`,
+  `online`, `stopped` (trừ client_id)
+- datetime -> msgpack timestamp (ext type -1), decode thành Date: field
+  `*_at`, `*_date`
+- các field khác (content, title, ...) giữ nguyên, kể cả khi trông như UUID
+
+Socket msgpack join room `<room>#mp` thay cho `<room>` (channel_12#mp,
+team_7#mp, user_<id>#mp), nên mỗi broadcast emit JSON một lần và msgpack một
+lần, chạy được qua Redis giữa các worker. Server không có thư viện msgpack
+thì connection rơi về JSON; event `connected` trả về encoding đã chọn.
+
+Author: BE1
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for the msgpack encoding
+    msgpack = None
+
+JSON = "json"
+MSGPACK = "msgpack"
+COMPACT_ROOM_SUFFIX = "#mp"
+EXT_UUID = 1
+
+
+def negotiate(requested: Any) -> str:
+    """Encoding cho một connection từ auth["encoding"]"""
+    return MSGPACK if requested == MSGPACK and msgpack is not None else JSON
+
+
+def compact_room(room: str) -> str:
+    return room + COMPACT_ROOM_SUFFIX
+
+
+# Chỉ các field có kiểu đã biết mới được chuyển, theo tên key: content, title,
+# client_id... giữ nguyên dạng chuỗi dù trông giống UUID/ISO datetime
+_DATETIME_SUFFIXES = ("_at", "_date")
+_UUID_SUFFIXES = ("_id", "_ids", "_by", "_to")
+_UUID_KEYS = {"online", "stopped"}
+_OPAQUE_KEYS = {"client_id"}
+
+
+def _field_type(key: Any) -> Any:
+    if not isinstance(key, str) or key in _OPAQUE_KEYS:
+        return None
+    if key.endswith(_DATETIME_SUFFIXES):
+        return datetime
+    if key in _UUID_KEYS or key.endswith(_UUID_SUFFIXES):
+        return UUID
+    return None
+
+
+def _typed_str(value: str, kind: Any) -> Any:
+    if kind is UUID:
+        if len(value) != 36:
+            return value
+        try:
+            return msgpack.ExtType(EXT_UUID, UUID(value).bytes)
+        except ValueError:
+            return value
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _compact(value: Any, kind: Any = None) -> Any:
+    if isinstance(value, str):
+        return _typed_str(value, kind) if kind is not None else value
+    if isinstance(value, dict):
+        return {k: _compact(v, _field_type(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_compact(v, kind) for v in value]
+    if isinstance(value, UUID):
+        return msgpack.ExtType(EXT_UUID, value.bytes)
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def encode_compact(data: Any) -> bytes:
+    """Payload (dict jsonable) -> msgpack với UUID/datetime dạng gọn"""
+    return msgpack.packb(_compact(data), datetime=True)
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_UUID:
+        return UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+def decode_compact(payload: bytes) -> Any:
+    """Ngược lại của encode_compact (client Python, benchmark)"""
+    return msgpack.unpackb(payload, timestamp=3, ext_hook=_ext_hook)
@@ -6,20 +6,100 @@ Author: BE1
 Created: Feb 2026
 """
 
+import asyncio
 import socketio
-from typing import Dict, Set, Optional
+import time
+from typing import Dict, Set, Optional, Tuple
 from uuid import UUID
 import json
 import logging
 
 from app.core.config import settings
+from app.services.cache_invalidation import cache_invalidation
+from app.services.presence import PresenceStore, create_presence_store
+from app.services.socket_backpressure import BoundedEngineIOServer
+from app.services.socket_codec import MSGPACK, compact_room, encode_compact, msgpack, negotiate
+from app.services.typing_coalescer import TypingCoalescer
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Redis: số socket msgpack trên các worker khác được hỏi lại sau mỗi chừng này giây
+COMPACT_CHECK_INTERVAL_SECONDS = 1.0
+
+
+class RoomIndexMixin:
+    """
+    Reverse index (namespace, sid) -> rooms cho client manager của python-socketio.
+
+    BaseManager.basic_disconnect và get_rooms copy/duyệt toàn bộ rooms của
+    namespace cho mỗi socket (mỗi socket còn có room riêng của nó), nên một
+    đợt reconnect hàng chục nghìn socket thành O(n^2). Với index này
+    disconnect chỉ đụng tới các room socket đó đã vào.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sid_rooms: Dict[tuple, Set] = {}
+    
+    def basic_enter_room(self, sid, namespace, room, eio_sid=None):
+        super().basic_enter_room(sid, namespace, room, eio_sid=eio_sid)
+        self.sid_rooms.setdefault((namespace, sid), set()).add(room)
+    
+    def basic_leave_room(self, sid, namespace, room):
+        super().basic_leave_room(sid, namespace, room)
+        rooms = self.sid_rooms.get((namespace, sid))
+        if rooms is not None:
+            rooms.discard(room)
+            if not rooms:
+                del self.sid_rooms[(namespace, sid)]
+    
+    def basic_disconnect(self, sid, namespace, **kwargs):
+        # Same as BaseManager.basic_disconnect, minus the scan over all rooms
+        for room in list(self.sid_rooms.get((namespace, sid), ())):
+            self.basic_leave_room(sid, namespace, room)
+        if sid in self.callbacks:
+            del self.callbacks[sid]
+        if namespace in self.pending_disconnect and \
+                sid in self.pending_disconnect[namespace]:
+            self.pending_disconnect[namespace].remove(sid)
+            if len(self.pending_disconnect[namespace]) == 0:
+                del self.pending_disconnect[namespace]
+    
+    def get_rooms(self, sid, namespace):
+        return [room for room in self.sid_rooms.get((namespace, sid), ()) if room is not None]
+
+
+class IndexedAsyncManager(RoomIndexMixin, socketio.AsyncManager):
+    pass
+
+
+class IndexedAsyncRedisManager(RoomIndexMixin, socketio.AsyncRedisManager):
+    pass
+
+
+def create_client_manager() -> socketio.AsyncManager:
+    """
+    Client manager quyết định emit/room được chia sẻ giữa các worker thế nào.
+    - "memory": AsyncManager, chỉ trong 1 process (dev, tests)
+    - "redis": AsyncRedisManager qua REDIS_URL, emit tới room đi tới mọi worker
+    """
+    if settings.SOCKETIO_MANAGER == "redis":
+        return IndexedAsyncRedisManager(settings.REDIS_URL)
+    return IndexedAsyncManager()
+
+
+class BoundedAsyncServer(socketio.AsyncServer):
+    """AsyncServer dùng Engine.IO server có giới hạn outbound queue mỗi socket"""
+
+    def _engineio_server_class(self):
+        return BoundedEngineIOServer
+
+
 # Create Socket.IO server với async mode
-sio = socketio.AsyncServer(
+sio = BoundedAsyncServer(
     async_mode='asgi',
+    client_manager=create_client_manager(),
     cors_allowed_origins=settings.cors_origins_list,
     logger=True,
     engineio_logger=False
@@ -29,10 +109,20 @@ sio = socketio.AsyncServer(
 socket_app = socketio.ASGIApp(sio)
 
 
+def user_room(user_id: str) -> str:
+    """Room chứa mọi socket của một user (trên mọi worker)"""
+    return f"user_{user_id}"
+
+
 class ConnectionManager:
-    """Quản lý connections và rooms cho Socket.IO"""
+    """
+    Quản lý connections và rooms cho Socket.IO.
+
+    Các dict bên dưới chỉ chứa socket của worker hiện tại. Trạng thái online
+    dùng chung giữa các worker nằm trong `presence` (memory hoặc Redis).
+    """
     
-    def __init__(self):
+    def __init__(self, presence: Optional[PresenceStore] = None):
         # user_id -> set of socket ids (một user có thể có nhiều connections)
         self.user_connections: Dict[str, Set[str]] = {}
         # socket_id -> user_id
@@ -41,13 +131,37 @@ class ConnectionManager:
         self.channel_rooms: Dict[int, Set[str]] = {}
         # team_id -> set of socket ids
         self.team_rooms: Dict[int, Set[str]] = {}
+        # channel_id -> team_id của các channel đang có socket join
+        self.channel_teams: Dict[int, int] = {}
+        # socket_id -> {("channel"|"team", id)}: reverse index để disconnect
+        # chỉ đụng tới các room socket đã join, không duyệt toàn bộ rooms
+        self.socket_rooms: Dict[str, Set[Tuple[str, int]]] = {}
+        # socket_id -> tên người gửi, socket_id -> {channel_id: team_id} đã
+        # kiểm tra membership; cache cho vòng đời connection (socket_chat),
+        # bỏ khi membership đổi ở bất kỳ worker nào (cache_invalidation)
+        self.socket_profiles: Dict[str, str] = {}
+        self.socket_channels: Dict[str, Dict[int, int]] = {}
+        # Socket nhận broadcast dạng msgpack (socket_codec), join room `<room>#mp`
+        self.compact_sockets: Set[str] = set()
+        # Presence dùng chung giữa các worker
+        self.presence = presence or create_presence_store()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # Cache của presence.has_compact(): (kết quả, hết hạn lúc)
+        self._compact_any: Tuple[bool, float] = (False, 0.0)
     
-    async def connect(self, sid: str, user_id: str):
+    async def connect(self, sid: str, user_id: str, encoding: str = "json"):
         """Register a new connection"""
         if user_id not in self.user_connections:
             self.user_connections[user_id] = set()
         self.user_connections[user_id].add(sid)
         self.socket_to_user[sid] = user_id
+        if encoding == MSGPACK:
+            self.compact_sockets.add(sid)
+            await self.presence.add_compact(sid)
+        await sio.enter_room(sid, self.room_for(sid, user_room(user_id)))
+        await self.presence.add(user_id, sid)
+        self._ensure_heartbeat()
+        sio.eio.ensure_monitor()
         logger.info(f"User {user_id} connected with socket {sid}")
     
     async def disconnect(self, sid: str):
@@ -57,62 +171,198 @@ class ConnectionManager:
             self.user_connections[user_id].discard(sid)
             if not self.user_connections[user_id]:
                 del self.user_connections[user_id]
+        if user_id:
+            await self.presence.remove(user_id, sid)
+            if user_id not in self.user_connections:
+                typing_coalescer.release_user(user_id)
         
-        # Remove from all channel rooms
-        for channel_id, sockets in list(self.channel_rooms.items()):
-            sockets.discard(sid)
-            if not sockets:
-                del self.channel_rooms[channel_id]
+        # Remove from the channel/team rooms this socket joined
+        for kind, room_id in self.socket_rooms.pop(sid, ()):
+            self._discard_member(kind, room_id, sid)
+        self.socket_profiles.pop(sid, None)
+        self.socket_channels.pop(sid, None)
+        if sid in self.compact_sockets:
+            self.compact_sockets.discard(sid)
+            await self.presence.remove_compact(sid)
         
-        # Remove from all team rooms
-        for team_id, sockets in list(self.team_rooms.items()):
+        logger.info(f"Socket {sid} disconnected")
+    
+    def room_for(self, sid: str, room: str) -> str:
+        """Tên room Socket.IO thực tế của socket (biến thể #mp nếu dùng msgpack)"""
+        return compact_room(room) if sid in self.compact_sockets else room
+    
+    def _rooms(self, kind: str) -> Dict[int, Set[str]]:
+        return self.channel_rooms if kind == "channel" else self.team_rooms
+    
+    def _add_member(self, kind: str, room_id: int, sid: str):
+        self._rooms(kind).setdefault(room_id, set()).add(sid)
+        self.socket_rooms.setdefault(sid, set()).add((kind, room_id))
+    
+    def _discard_member(self, kind: str, room_id: int, sid: str):
+        rooms = self._rooms(kind)
+        sockets = rooms.get(room_id)
+        if sockets is not None:
             sockets.discard(sid)
             if not sockets:
-                del self.team_rooms[team_id]
-        
-        logger.info(f"Socket {sid} disconnected")
+                del rooms[room_id]
+                if kind == "channel":
+                    self.channel_teams.pop(room_id, None)
+    
+    def _remove_member(self, kind: str, room_id: int, sid: str):
+        self._discard_member(kind, room_id, sid)
+        joined = self.socket_rooms.get(sid)
+        if joined is not None:
+            joined.discard((kind, room_id))
+            if not joined:
+                del self.socket_rooms[sid]
     
-    async def join_channel(self, sid: str, channel_id: int):
-        """Join a channel room"""
-        if channel_id not in self.channel_rooms:
-            self.channel_rooms[channel_id] = set()
-        self.channel_rooms[channel_id].add(sid)
-        await sio.enter_room(sid, f"channel_{channel_id}")
+    async def join_channel(self, sid: str, channel_id: int, team_id: int):
+        """Join a channel room (membership đã được kiểm tra)"""
+        self._add_member("channel", channel_id, sid)
+        self.channel_teams[channel_id] = team_id
+        await sio.enter_room(sid, self.room_for(sid, f"channel_{channel_id}"))
         logger.info(f"Socket {sid} joined channel_{channel_id}")
     
     async def leave_channel(self, sid: str, channel_id: int):
         """Leave a channel room"""
-        if channel_id in self.channel_rooms:
-            self.channel_rooms[channel_id].discard(sid)
-        await sio.leave_room(sid, f"channel_{channel_id}")
+        self._remove_member("channel", channel_id, sid)
+        await sio.leave_room(sid, self.room_for(sid, f"channel_{channel_id}"))
         logger.info(f"Socket {sid} left channel_{channel_id}")
     
     async def join_team(self, sid: str, team_id: int):
-        """Join a team room"""
-        if team_id not in self.team_rooms:
-            self.team_rooms[team_id] = set()
-        self.team_rooms[team_id].add(sid)
-        await sio.enter_room(sid, f"team_{team_id}")
+        """Join a team room (membership đã được kiểm tra)"""
+        self._add_member("team", team_id, sid)
+        await sio.enter_room(sid, self.room_for(sid, f"team_{team_id}"))
         logger.info(f"Socket {sid} joined team_{team_id}")
     
     async def leave_team(self, sid: str, team_id: int):
         """Leave a team room"""
-        if team_id in self.team_rooms:
-            self.team_rooms[team_id].discard(sid)
-        await sio.leave_room(sid, f"team_{team_id}")
+        self._remove_member("team", team_id, sid)
+        await sio.leave_room(sid, self.room_for(sid, f"team_{team_id}"))
         logger.info(f"Socket {sid} left team_{team_id}")
     
-    def get_user_sockets(self, user_id: str) -> Set[str]:
-        """Get all socket ids for a user"""
-        return self.user_connections.get(user_id, set())
+    def forget_team(self, user_id: str, team_id: int):
+        """Bỏ cache membership các channel của team cho mọi socket của user (worker này)"""
+        for sid in self.user_connections.get(user_id, ()):
+            channels = self.socket_channels.get(sid)
+            if channels:
+                for channel_id in [c for c, t in channels.items() if t == team_id]:
+                    del channels[channel_id]
+    
+    def _evict(self, sid: str, kind: str, room_id: int):
+        """Đưa socket ra khỏi room ngay (đồng bộ, socket của worker này)"""
+        self._remove_member(kind, room_id, sid)
+        sio.manager.basic_leave_room(sid, '/', self.room_for(sid, f"{kind}_{room_id}"))
+    
+    def _evict_team(self, team_id: int, sids):
+        """Bỏ các socket khỏi room team và room các channel của team"""
+        for sid in list(sids):
+            for kind, room_id in list(self.socket_rooms.get(sid, ())):
+                owner = room_id if kind == "team" else self.channel_teams.get(room_id)
+                if owner == team_id:
+                    self._evict(sid, kind, room_id)
+    
+    def apply_change(self, change: dict):
+        """
+        Thay đổi membership từ cache_invalidation (worker này hoặc worker khác):
+        bỏ cache quyền vào channel và đưa socket không còn quyền ra khỏi room,
+        để không nhận tiếp broadcast của team.
+        """
+        op = change["op"]
+        if op == "member":
+            # User vừa join thì chưa ở room nào của team, chỉ người rời bị ảnh hưởng
+            self._evict_team(change["team_id"], self.user_connections.get(change["user_id"], ()))
+            self.forget_team(change["user_id"], change["team_id"])
+            return
+        if op == "team":
+            self._evict_team(change["team_id"], self.socket_rooms)
+        elif op == "channel":
+            for sid in list(self.channel_rooms.get(change["channel_id"], ())):
+                self._evict(sid, "channel", change["channel_id"])
+        for channels in self.socket_channels.values():
+            if op == "team":
+                for channel_id in [c for c, t in channels.items() if t == change["team_id"]]:
+                    del channels[channel_id]
+            elif op == "channel":
+                channels.pop(change["channel_id"], None)
+    
+    def clear_channels(self):
+        for channels in self.socket_channels.values():
+            channels.clear()
+    
+    async def has_compact_sockets(self) -> bool:
+        """
+        Có socket msgpack nào trên mọi worker không. Kết quả của worker khác
+        được cache COMPACT_CHECK_INTERVAL_SECONDS: socket msgpack vừa connect ở
+        worker khác có thể lỡ broadcast trong khoảng đó (lấy lại qua `sync`).
+        """
+        if self.compact_sockets:
+            return True
+        found, expires_at = self._compact_any
+        now = time.monotonic()
+        if now >= expires_at:
+            found = await self.presence.has_compact()
+            self._compact_any = (found, now + COMPACT_CHECK_INTERVAL_SECONDS)
+        return found
+    
+    async def get_user_sockets(self, user_id: str) -> Set[str]:
+        """Get all socket ids for a user (across workers)"""
+        return await self.presence.user_sockets(user_id)
     
-    def is_user_online(self, user_id: str) -> bool:
-        """Check if user has any active connections"""
-        return user_id in self.user_connections and len(self.user_connections[user_id]) > 0
+    async def is_user_online(self, user_id: str) -> bool:
+        """Check if user has any active connections (across workers)"""
+        return await self.presence.is_online(user_id)
+    
+    def _ensure_heartbeat(self):
+        """Start refreshing this worker's presence entries (Redis backend only)"""
+        if self.presence.heartbeat_interval is None:
+            return
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+    
+    async def _heartbeat(self):
+        # Worker chết thì không còn heartbeat -> entry hết hạn sau TTL
+        while True:
+            await asyncio.sleep(self.presence.heartbeat_interval)
+            try:
+                await self.presence.refresh(self.user_connections, self.compact_sockets)
+            except Exception as e:
+                logger.error(f"Presence heartbeat failed: {e}")
 
 
 # Global connection manager instance
 manager = ConnectionManager()
+cache_invalidation.subscribe("socket_channels", manager.apply_change, manager.clear_channels)
+
+
+async def emit_to_room(event: str, data: dict, room: str):
+    """
+    Emit một event broadcast tới room: JSON cho socket thường, msgpack cho
+    socket đã chọn encoding msgpack (room `<room>#mp`).
+    """
+    await sio.emit(event, data, room=room)
+    if msgpack is None:
+        return
+    compact = compact_room(room)
+    # Memory manager: chỉ encode khi room #mp có socket; Redis: socket có thể ở
+    # worker khác, chỉ encode + publish lần hai khi có socket msgpack ở đâu đó
+    if settings.SOCKETIO_MANAGER == "redis":
+        if not await manager.has_compact_sockets():
+            return
+    elif not sio.manager.rooms.get('/', {}).get(compact):
+        return
+    await sio.emit(event, encode_compact(data), room=compact)
+
+
+async def _emit_typing_snapshot(channel_id: int, snapshot: dict):
+    await emit_to_room('typing_snapshot', snapshot, f"channel_{channel_id}")
+
+
+typing_coalescer = TypingCoalescer(
+    _emit_typing_snapshot,
+    interval=settings.TYPING_SNAPSHOT_INTERVAL_SECONDS,
+    ttl=settings.TYPING_TTL_SECONDS,
+)
 
 
 # ============ SOCKET.IO EVENT HANDLERS ============
@@ -121,7 +371,7 @@ manager = ConnectionManager()
 async def connect(sid, environ, auth):
     """
     Handle new socket connection.
-    Expects auth = {"token": "jwt_token"}
+    Expects auth = {"token": "jwt_token", "encoding": "json" | "msgpack"}
     """
     logger.info(f"New connection attempt: {sid}")
     
@@ -147,12 +397,17 @@ async def connect(sid, environ, auth):
             return False
         
         # Register connection
-        await manager.connect(sid, user_id)
+        encoding = negotiate(auth.get('encoding'))
+        await manager.connect(sid, user_id, encoding)
+        if len(manager.user_connections.get(user_id, ())) == 1:
+            from app.services.team_presence import team_presence  # avoid circular import
+            team_presence.announce_later(user_id)
         
         # Send connection success
         await sio.emit('connected', {
             'message': 'Connected successfully',
-            'user_id': user_id
+            'user_id': user_id,
+            'encoding': encoding
         }, room=sid)
         
         return True
@@ -165,22 +420,37 @@ async def connect(sid, environ, auth):
 @sio.event
 async def disconnect(sid):
     """Handle socket disconnection"""
+    user_id = manager.socket_to_user.get(sid)
     await manager.disconnect(sid)
+    if user_id and user_id not in manager.user_connections:
+        from app.services.team_presence import team_presence  # avoid circular import
+        team_presence.announce_later(user_id)
 
 
 @sio.event
 async def join_channel(sid, data):
     """
-    Join a channel room.
+    Join a channel room (chỉ thành viên team của channel).
     data = {"channel_id": 123}
+    ack = {"error": "..."} nếu bị từ chối
     """
-    channel_id = data.get('channel_id')
-    if channel_id:
-        await manager.join_channel(sid, channel_id)
-        await sio.emit('joined_channel', {
-            'channel_id': channel_id,
-            'message': f'Joined channel {channel_id}'
-        }, room=sid)
+    user_id = manager.socket_to_user.get(sid)
+    if not user_id:
+        return {'error': 'unauthorized'}
+    try:
+        channel_id = int(data.get('channel_id'))
+    except (AttributeError, TypeError, ValueError):
+        return {'error': 'invalid_channel'}
+    
+    from app.services.socket_chat import channel_team  # avoid circular import
+    team_id = await channel_team(sid, user_id, channel_id)
+    if team_id is None:
+        return {'error': 'forbidden'}
+    await manager.join_channel(sid, channel_id, team_id)
+    await sio.emit('joined_channel', {
+        'channel_id': channel_id,
+        'message': f'Joined channel {channel_id}'
+    }, room=sid)
 
 
 @sio.event
@@ -197,16 +467,26 @@ async def leave_channel(sid, data):
 @sio.event
 async def join_team(sid, data):
     """
-    Join a team room for team-wide updates.
+    Join a team room for team-wide updates (chỉ thành viên team).
     data = {"team_id": 123}
+    ack = {"error": "..."} nếu bị từ chối
     """
-    team_id = data.get('team_id')
-    if team_id:
-        await manager.join_team(sid, team_id)
-        await sio.emit('joined_team', {
-            'team_id': team_id,
-            'message': f'Joined team {team_id}'
-        }, room=sid)
+    user_id = manager.socket_to_user.get(sid)
+    if not user_id:
+        return {'error': 'unauthorized'}
+    try:
+        team_id = int(data.get('team_id'))
+    except (AttributeError, TypeError, ValueError):
+        return {'error': 'invalid_team'}
+    
+    from app.services.team_presence import team_presence  # avoid circular import
+    if team_id not in await team_presence.user_teams(user_id):
+        return {'error': 'forbidden'}
+    await manager.join_team(sid, team_id)
+    await sio.emit('joined_team', {
+        'team_id': team_id,
+        'message': f'Joined team {team_id}'
+    }, room=sid)
 
 
 @sio.event
@@ -220,35 +500,78 @@ async def leave_team(sid, data):
         await manager.leave_team(sid, team_id)
 
 
+@sio.event
+async def sync(sid, data):
+    """
+    Reconnect catch-up: stream các message/task bị bỏ lỡ.
+    data = {"channels": {"12": last_message_id}, "teams": {"7": last_marker}}
+    Kết quả qua `sync_messages` / `sync_tasks`, ack trả về tóm tắt.
+    """
+    user_id = manager.socket_to_user.get(sid)
+    if not user_id:
+        return {'error': 'unauthorized'}
+    
+    from app.services.sync_service import sync_client  # avoid circular import
+    try:
+        return await sync_client(sid, user_id, data)
+    except Exception as e:
+        logger.error(f"Sync failed for {sid}: {e}")
+        return {'error': 'sync_failed'}
+
+
+@sio.event
+async def presence(sid, data):
+    """
+    Thành viên đang online của một team.
+    data = {"team_id": 7}
+    ack = {"team_id": 7, "online": ["uuid", ...], "member_count": 5} hoặc {"error": "..."}
+    """
+    user_id = manager.socket_to_user.get(sid)
+    if not user_id:
+        return {'error': 'unauthorized'}
+    try:
+        team_id = int(data.get('team_id'))
+    except (AttributeError, TypeError, ValueError):
+        return {'error': 'invalid_team'}
+    
+    from app.services.team_presence import team_presence  # avoid circular import
+    snapshot = await team_presence.snapshot(team_id, viewer_id=user_id)
+    return snapshot if snapshot is not None else {'error': 'forbidden'}
+
+
 @sio.event
 async def typing(sid, data):
     """
-    Broadcast typing indicator.
+    Typing indicator, gom thành `typing_snapshot` định kỳ (typing_coalescer).
     data = {"channel_id": 123}
     """
-    channel_id = data.get('channel_id')
     user_id = manager.socket_to_user.get(sid)
+    try:
+        channel_id = int(data.get('channel_id'))
+    except (AttributeError, TypeError, ValueError):
+        channel_id = None
     
-    if channel_id and user_id:
-        # Broadcast to channel except sender
-        await sio.emit('user_typing', {
-            'channel_id': channel_id,
-            'user_id': user_id
-        }, room=f"channel_{channel_id}", skip_sid=sid)
+    # Socket phải đã join channel (không tốn query) và còn là thành viên team,
+    # cùng kiểm tra với new_message (cache theo connection)
+    if not user_id or channel_id is None or manager.room_for(sid, f"channel_{channel_id}") not in sio.rooms(sid):
+        typing_coalescer.reject()
+        return
+    from app.services.socket_chat import channel_team  # avoid circular import
+    if await channel_team(sid, user_id, channel_id) is None:
+        typing_coalescer.reject()
+        return
+    typing_coalescer.touch(channel_id, user_id)
 
 
 @sio.event
 async def new_message(sid, data):
     """
-    Handle new message (called from API after saving to DB).
-    This is an internal event, typically triggered by the API endpoint.
-    data = {"channel_id": 123, "content": "Hello"}
+    Gửi tin nhắn qua socket: lưu DB, ack message_id, broadcast tới channel.
+    data = {"channel_id": 123, "content": "Hello", "client_id": "tmp-1"}
+    ack = {"message_id": 1, "sent_at": "...", "client_id": "tmp-1"} hoặc {"error": "..."}
     """
-    # Note: Actual message creation should go through REST API
-    # This just demonstrates the event structure
-    channel_id = data.get('channel_id')
-    if channel_id:
-        await sio.emit('message_received', data, room=f"channel_{channel_id}")
+    from app.services.socket_chat import send_from_socket  # avoid circular import
+    return await send_from_socket(sid, data)
 
 
 # ============ BROADCAST FUNCTIONS (called from API endpoints) ============
@@ -258,29 +581,29 @@ async def broadcast_message(channel_id: int, message_data: dict):
     Broadcast a new message to all users in a channel.
     Called from messages API after saving message to DB.
     """
-    await sio.emit('message_received', {
+    await emit_to_room('message_received', {
         'type': 'message:new',
         'channel_id': channel_id,
         'message': message_data
-    }, room=f"channel_{channel_id}")
+    }, f"channel_{channel_id}")
 
 
 async def broadcast_message_updated(channel_id: int, message_data: dict):
     """Broadcast when a message is edited"""
-    await sio.emit('message_updated', {
+    await emit_to_room('message_updated', {
         'type': 'message:updated',
         'channel_id': channel_id,
         'message': message_data
-    }, room=f"channel_{channel_id}")
+    }, f"channel_{channel_id}")
 
 
 async def broadcast_message_deleted(channel_id: int, message_id: int):
     """Broadcast when a message is deleted"""
-    await sio.emit('message_deleted', {
+    await emit_to_room('message_deleted', {
         'type': 'message:deleted',
         'channel_id': channel_id,
         'message_id': message_id
-    }, room=f"channel_{channel_id}")
+    }, f"channel_{channel_id}")
 
 
 async def broadcast_task_update(team_id: int, task_data: dict):
@@ -288,60 +611,59 @@ async def broadcast_task_update(team_id: int, task_data: dict):
     Broadcast task status change to team.
     Called from tasks API after updating task.
     """
-    await sio.emit('task_updated', {
+    await emit_to_room('task_updated', {
         'type': 'task:updated',
         'team_id': team_id,
         'task': task_data
-    }, room=f"team_{team_id}")
+    }, f"team_{team_id}")
 
 
 async def broadcast_team_member_joined(team_id: int, member_data: dict):
     """Broadcast when new member joins team"""
-    await sio.emit('team_member_joined', {
+    await emit_to_room('team_member_joined', {
         'type': 'team:member_joined',
         'team_id': team_id,
         'member': member_data
-    }, room=f"team_{team_id}")
+    }, f"team_{team_id}")
 
 
 async def broadcast_team_member_left(team_id: int, user_id: str):
     """Broadcast when member leaves team"""
-    await sio.emit('team_member_left', {
+    await emit_to_room('team_member_left', {
         'type': 'team:member_left',
         'team_id': team_id,
         'user_id': user_id
-    }, room=f"team_{team_id}")
+    }, f"team_{team_id}")
 
 
 async def send_notification(user_id: str, notification_data: dict):
     """
     Send notification to specific user.
     Called from notification service.
+    Emit một lần tới room của user, client manager chuyển tới mọi worker.
     """
-    sockets = manager.get_user_sockets(user_id)
-    for sid in sockets:
-        await sio.emit('notification', {
-            'type': 'notification:new',
-            'notification': notification_data
-        }, room=sid)
+    await emit_to_room('notification', {
+        'type': 'notification:new',
+        'notification': notification_data
+    }, user_room(user_id))
 
 
 async def broadcast_meeting_started(team_id: int, meeting_data: dict):
     """Broadcast when a meeting starts"""
-    await sio.emit('meeting_started', {
+    await emit_to_room('meeting_started', {
         'type': 'meeting:started',
         'team_id': team_id,
         'meeting': meeting_data
-    }, room=f"team_{team_id}")
+    }, f"team_{team_id}")
 
 
 # ============ UTILITY FUNCTIONS ============
 
-def get_online_users() -> list:
-    """Get list of online user IDs"""
-    return list(manager.user_connections.keys())
+async def get_online_users() -> list:
+    """Get list of online user IDs (across workers)"""
+    return await manager.presence.online_users()
 
 
-def is_user_online(user_id: str) -> bool:
-    """Check if a user is currently online"""
-    return manager.is_user_online(user_id)
+async def is_user_online(user_id: str) -> bool:
+    """Check if a user is currently online (across workers)"""
+    return await manager.is_user_online(user_id)
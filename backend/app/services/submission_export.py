@@ -0,0 +1,273 @@
+"""
+Submission Export - Phase 4
+One ZIP with every submission of a milestone, streamed while it is built
+
+GET /milestones/{milestone_id}/submissions/export answers with
+
+    manifest.csv                                   one row per submission
+    team-<id>-<name>/checkpoint-<id>-<title>/submission-<id><ext>
+
+The archive is never materialised: zipfile writes into a sink that is
+drained after every FILE_STREAM_CHUNK_BYTES piece of input, and the drained
+bytes go straight to the client. Because the sink cannot seek, zipfile
+writes sizes and CRCs in data descriptors after each entry (ZIP64 where an
+entry may pass 4 GB), which every unzip tool understands.
+
+Memory stays constant whatever the class size:
+- rows are read EXPORT_BATCH_SIZE at a time by keyset on submission_id, each
+  batch in its own short session, so no connection is held while a slow
+  client downloads gigabytes;
+- the manifest is written in a first pass over the rows (file sizes looked
+  up per batch, concurrently with S3), the files in a second pass, one
+  chunk at a time; reading (local disk or bucket) and
+  compressing run on a worker thread, never on the event loop.
+
+Only files served from /uploads/ (the object storage) are included. Links
+to other sites are listed in the manifest (`file_status` = external) but
+not fetched.
+
+Author: BE4
+"""
+
+import asyncio
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+from urllib.parse import unquote, urlparse
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.all_models import Checkpoint, Milestone, Submission, Team, User
+from app.services.file_downloads import upload_key
+from app.services.file_storage import file_kind, file_suffix
+from app.services.object_storage import object_storage
+
+EXPORT_BATCH_SIZE = 500
+
+MANIFEST_COLUMNS = [
+    "team_id",
+    "team_name",
+    "checkpoint_id",
+    "checkpoint_title",
+    "submission_id",
+    "submitted_by",
+    "submitted_at",
+    "due_date",
+    "is_late",
+    "late_by_minutes",
+    "file",
+    "file_size",
+    "file_status",
+    "file_url",
+]
+
+# Entries that may pass the 4 GB limit of a classic ZIP header
+_ZIP64_THRESHOLD = 2 ** 32 - 1
+# Already compressed: deflating them again only burns CPU
+_STORED_KINDS = {"image", "archive", "video"}
+_STORED_SUFFIXES = {".pdf", ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp", ".epub"}
+_UNSAFE_NAME_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+class _ZipSink:
+    """Write-only, non-seekable target for zipfile; hands out what was written"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _safe_name(value: Optional[str], limit: int = 60) -> str:
+    cleaned = _UNSAFE_NAME_RE.sub("_", value or "").strip(" ._")
+    return cleaned[:limit]
+
+
+def _folder(prefix: str, item_id: int, name: Optional[str]) -> str:
+    safe = _safe_name(name)
+    return f"{prefix}-{item_id}-{safe}" if safe else f"{prefix}-{item_id}"
+
+
+def _storage_key(file_url: Optional[str]) -> Optional[str]:
+    """Storage key behind a /uploads/ URL (absolute or relative); None for anything else"""
+    if not file_url:
+        return None
+    path = unquote(urlparse(file_url).path)
+    if not path.startswith("/uploads/"):
+        return None
+    try:
+        return upload_key(path[len("/uploads/"):])
+    except HTTPException:
+        return None
+
+
+def _late_by_minutes(submitted_at: Optional[datetime], due_date: Optional[datetime]) -> Optional[int]:
+    if submitted_at is None or due_date is None or submitted_at <= due_date:
+        return None
+    return int((submitted_at - due_date).total_seconds() // 60)
+
+
+def _zip_time(value: Optional[datetime]):
+    value = (value or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    return max(value.timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+
+
+async def _batches(milestone_id: int) -> AsyncIterator[list]:
+    """Submission rows of a milestone, EXPORT_BATCH_SIZE per short-lived session"""
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(
+                    Submission.submission_id,
+                    Submission.file_url,
+                    Submission.submitted_at,
+                    Checkpoint.checkpoint_id,
+                    Checkpoint.title.label("checkpoint_title"),
+                    Team.team_id,
+                    Team.team_name,
+                    User.email.label("submitted_by"),
+                )
+                .join(Checkpoint, Checkpoint.checkpoint_id == Submission.checkpoint_id)
+                .outerjoin(Team, Team.team_id == Checkpoint.team_id)
+                .outerjoin(User, User.user_id == Submission.submitted_by)
+                .where(
+                    Checkpoint.milestone_id == milestone_id,
+                    Submission.submission_id > last_id,
+                )
+                .order_by(Submission.submission_id)
+                .limit(EXPORT_BATCH_SIZE)
+            )
+            rows = result.all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < EXPORT_BATCH_SIZE:
+            return
+        last_id = rows[-1].submission_id
+
+
+def _arcname(row) -> str:
+    team = _folder("team", row.team_id, row.team_name) if row.team_id else "no-team"
+    checkpoint = _folder("checkpoint", row.checkpoint_id, row.checkpoint_title)
+    suffix = file_suffix(urlparse(row.file_url or "").path)
+    return f"{team}/{checkpoint}/submission-{row.submission_id}{suffix}"
+
+
+def _manifest_row(row, key: Optional[str], size: Optional[int], due_date: Optional[datetime]) -> list:
+    if not row.file_url:
+        file_status, arcname = "none", ""
+    elif key is None:
+        file_status, arcname = "external", ""
+    elif size is None:
+        file_status, arcname = "missing", ""
+    else:
+        file_status, arcname = "included", _arcname(row)
+    late_by = _late_by_minutes(row.submitted_at, due_date)
+    return [
+        row.team_id or "",
+        row.team_name or "",
+        row.checkpoint_id,
+        row.checkpoint_title or "",
+        row.submission_id,
+        row.submitted_by or "",
+        row.submitted_at.isoformat() if row.submitted_at else "",
+        due_date.isoformat() if due_date else "",
+        "yes" if late_by is not None else "no",
+        late_by if late_by is not None else "",
+        arcname,
+        size if size is not None else "",
+        file_status,
+        row.file_url or "",
+    ]
+
+
+def _write_manifest_rows(entry, rows: list, due_date: Optional[datetime]):
+    keys = [_storage_key(row.file_url) for row in rows]
+    # Sizes of the whole batch at once (concurrent HEADs with S3)
+    sizes = object_storage.sizes(key for key in keys if key is not None)
+    text = io.StringIO()
+    writer = csv.writer(text)
+    for row, key in zip(rows, keys):
+        writer.writerow(_manifest_row(row, key, sizes.get(key), due_date))
+    entry.write(text.getvalue().encode("utf-8"))
+
+
+def _compress_type(key: str) -> int:
+    suffix = file_suffix(key)
+    if suffix in _STORED_SUFFIXES or file_kind(suffix) in _STORED_KINDS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _copy_chunk(source, entry, chunk_size: int) -> int:
+    data = source.read(chunk_size)
+    if data:
+        entry.write(data)
+    return len(data)
+
+
+async def export_milestone_submissions(milestone: Milestone) -> AsyncIterator[bytes]:
+    """Bytes of the ZIP export of a milestone, in the order they are produced"""
+    chunk_size = settings.FILE_STREAM_CHUNK_BYTES
+    milestone_id = milestone.milestone_id
+    due_date = milestone.due_date
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, "w", allowZip64=True)
+
+    # Pass 1: manifest
+    info = zipfile.ZipInfo("manifest.csv", _zip_time(None))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    with archive.open(info, "w") as entry:
+        # BOM so spreadsheet apps read Vietnamese names as UTF-8
+        header = io.StringIO()
+        csv.writer(header).writerow(MANIFEST_COLUMNS)
+        entry.write(("\ufeff" + header.getvalue()).encode("utf-8"))
+        async for rows in _batches(milestone_id):
+            await asyncio.to_thread(_write_manifest_rows, entry, rows, due_date)
+            if data := sink.drain():
+                yield data
+
+    # Pass 2: files
+    async for rows in _batches(milestone_id):
+        for row in rows:
+            key = _storage_key(row.file_url)
+            if key is None:
+                continue
+            try:
+                source, size = await asyncio.to_thread(object_storage.open, key)
+            except OSError:
+                continue
+            try:
+                info = zipfile.ZipInfo(_arcname(row), _zip_time(row.submitted_at))
+                info.compress_type = _compress_type(key)
+                with archive.open(info, "w", force_zip64=size >= _ZIP64_THRESHOLD) as entry:
+                    while await asyncio.to_thread(_copy_chunk, source, entry, chunk_size):
+                        if data := sink.drain():
+                            yield data
+            finally:
+                await asyncio.to_thread(source.close)
+
+    archive.close()
+    yield sink.drain()
@@ -0,0 +1,334 @@
+"""
+Reconnect Sync Service - Phase 3 BE1
+Gửi lại các thay đổi client bỏ lỡ khi mất kết nối (socket event `sync`)
+
+Client gửi message_id cuối cùng đã thấy của mỗi channel và marker (thời
+điểm thay đổi task cuối cùng đã thấy) của mỗi team. Server chỉ stream phần
+chênh lệch theo từng batch thay vì client refetch toàn bộ qua REST:
+
+- `sync_messages`: {channel_id, messages, has_more}; messages theo message_id
+  tăng dần, đọc theo (channel_id, message_id > last_seen)
+- `sync_tasks`: {team_id, tasks, task_ids, marker, has_more}; task_ids là
+  toàn bộ task hiện có của team để client bỏ các task đã bị xóa
+
+Mỗi channel/team bị giới hạn số bản ghi ngay trong SQL; vượt quá thì
+`truncated` (hoặc `task_ids_truncated`) = true và client nên tải lại trang
+mới nhất qua REST. Cursor không hợp lệ chỉ làm hỏng mục đó
+({"error": "invalid_cursor"}), không làm hỏng cả lần sync.
+
+Author: BE1
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import logging
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import DateTime, Integer, cast, column, func, select, true, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.dao.user_loader import UserLoader
+from app.db.session import AsyncSessionLocal
+from app.models.all_models import Channel, Message, Sprint, Task, TeamMember
+from app.services.socket_manager import sio
+
+logger = logging.getLogger(__name__)
+
+# Giới hạn số sync chạy đồng thời trên một worker: sau một đợt mass reconnect
+# các sync xếp hàng thay vì chiếm hết connection pool
+_sync_slots = asyncio.Semaphore(settings.SYNC_MAX_CONCURRENT)
+
+
+def _parse_ids(raw: Any, limit: int) -> Dict[int, Any]:
+    """{"12": 345, ...} -> {12: 345}; bỏ qua key không hợp lệ, tối đa `limit` mục"""
+    parsed: Dict[int, Any] = {}
+    if not isinstance(raw, dict):
+        return parsed
+    for key, value in raw.items():
+        try:
+            parsed[int(key)] = value
+        except (TypeError, ValueError):
+            continue
+        if len(parsed) >= limit:
+            break
+    return parsed
+
+
+def _parse_last_id(value: Any) -> Optional[int]:
+    """message_id cuối đã thấy; null/0 = từ đầu, None nếu không hợp lệ"""
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if value >= 0 else None
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _parse_marker(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def changed_tasks_query(markers: Dict[int, Optional[datetime]], limit: int):
+    """
+    Tối đa `limit` task thay đổi sau marker của mỗi team (LATERAL ... LIMIT),
+    marker None = mọi task. Trả về (team_id, Task).
+    """
+    cursors = values(
+        column("team_id", Integer), column("marker", DateTime(timezone=True)), name="cursors"
+    ).data(list(markers.items()))
+    # Khi mọi marker là None, asyncpg gửi NULL không kiểu và Postgres suy ra
+    # cột `marker` là text -> phải ép kiểu tường minh
+    marker = cast(cursors.c.marker, DateTime(timezone=True))
+    changed_at = func.coalesce(Task.updated_at, Task.created_at)
+    latest = (
+        select(Task)
+        .join(Sprint, Sprint.sprint_id == Task.sprint_id)
+        .where(
+            Sprint.team_id == cursors.c.team_id,
+            marker.is_(None) | (changed_at > marker),
+        )
+        .order_by(changed_at, Task.task_id)
+        .limit(limit)
+        .lateral("changed_tasks")
+    )
+    changed = aliased(Task, latest)
+    return select(cursors.c.team_id, changed).select_from(cursors).join(latest, true())
+
+
+def task_ids_query(team_ids: List[int], limit: int):
+    """Tối đa `limit` task_id hiện có của mỗi team. Trả về (team_id, task_id)."""
+    teams = values(column("team_id", Integer), name="teams").data([(tid,) for tid in team_ids])
+    ids = (
+        select(Task.task_id)
+        .join(Sprint, Sprint.sprint_id == Task.sprint_id)
+        .where(Sprint.team_id == teams.c.team_id)
+        .order_by(Task.task_id)
+        .limit(limit)
+        .lateral("team_task_ids")
+    )
+    return select(teams.c.team_id, ids.c.task_id).select_from(teams).join(ids, true())
+
+
+def _message_payload(message: Message, users: UserLoader) -> dict:
+    """Cùng field với MessageResponse"""
+    return {
+        "message_id": message.message_id,
+        "channel_id": message.channel_id,
+        "sender_id": message.sender_id,
+        "sender_name": users.name(message.sender_id),
+        "content": message.content,
+        "sent_at": message.sent_at,
+        "is_edited": False,
+    }
+
+
+def _task_payload(task: Task) -> dict:
+    return {
+        "task_id": task.task_id,
+        "sprint_id": task.sprint_id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "priority": task.priority,
+        "assigned_to": task.assigned_to,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+        "due_date": task.due_date,
+        "blocked_reason": task.blocked_reason,
+        "depends_on": task.depends_on,
+    }
+
+
+def _changed_at(task: Task) -> datetime:
+    return task.updated_at or task.created_at
+
+
+async def _emit(event: str, sid: str, data: dict):
+    await sio.emit(event, jsonable_encoder(data), to=sid)
+    # Nhường event loop giữa các batch
+    await asyncio.sleep(0)
+
+
+# ============ MESSAGES ============
+
+async def _sync_channels(db: AsyncSession, sid: str, user_id: UUID, raw: Dict[int, Any]) -> Dict[str, Any]:
+    batch_size = settings.SYNC_BATCH_SIZE
+    cap = settings.SYNC_MAX_MESSAGES_PER_CHANNEL
+
+    summary: Dict[str, Any] = {}
+    since: Dict[int, int] = {}
+    for cid, value in raw.items():
+        last_id = _parse_last_id(value)
+        if last_id is None:
+            summary[str(cid)] = {"error": "invalid_cursor"}
+        else:
+            since[cid] = last_id
+    if not since:
+        return summary
+
+    # Chỉ các channel thuộc team user đang là thành viên
+    result = await db.execute(
+        select(Channel.channel_id)
+        .join(TeamMember, TeamMember.team_id == Channel.team_id)
+        .where(Channel.channel_id.in_(since.keys()), TeamMember.user_id == user_id)
+    )
+    allowed = {row[0] for row in result.all()}
+    summary.update({
+        str(cid): {"error": "forbidden"} for cid in since if cid not in allowed
+    })
+    if not allowed:
+        return summary
+
+    # Batch đầu của mọi channel trong một query (LATERAL ... LIMIT mỗi channel)
+    cursors = values(
+        column("channel_id", Integer), column("last_id", Integer), name="cursors"
+    ).data([(cid, since[cid]) for cid in allowed])
+    first = (
+        select(Message)
+        .where(Message.channel_id == cursors.c.channel_id, Message.message_id > cursors.c.last_id)
+        .order_by(Message.message_id)
+        .limit(batch_size + 1)
+        .lateral("first_batch")
+    )
+    missed = aliased(Message, first)
+    result = await db.execute(select(missed).select_from(cursors).join(first, true()))
+    first_batches: Dict[int, List[Message]] = {cid: [] for cid in allowed}
+    for message in result.scalars().all():
+        first_batches[message.channel_id].append(message)
+
+    users = UserLoader(db)
+    await users.load_many(m.sender_id for batch in first_batches.values() for m in batch)
+
+    for channel_id in sorted(allowed):
+        last_id = since[channel_id]
+        batch = sorted(first_batches[channel_id], key=lambda m: m.message_id)
+        sent = 0
+        truncated = False
+        page = min(batch_size, cap)
+        while True:
+            has_more = len(batch) > page
+            batch = batch[:page]
+            if batch:
+                await users.load_many(m.sender_id for m in batch)
+                await _emit("sync_messages", sid, {
+                    "channel_id": channel_id,
+                    "messages": [_message_payload(m, users) for m in batch],
+                    "has_more": has_more,
+                })
+                sent += len(batch)
+                last_id = batch[-1].message_id
+            if not has_more:
+                break
+            page = min(batch_size, cap - sent)
+            if page <= 0:
+                truncated = True
+                break
+            result = await db.execute(
+                select(Message)
+                .where(Message.channel_id == channel_id, Message.message_id > last_id)
+                .order_by(Message.message_id)
+                .limit(page + 1)
+            )
+            batch = list(result.scalars().all())
+        summary[str(channel_id)] = {"last_message_id": last_id, "count": sent, "truncated": truncated}
+    return summary
+
+
+# ============ TASKS ============
+
+async def _sync_teams(db: AsyncSession, sid: str, user_id: UUID, since: Dict[int, Any]) -> Dict[str, Any]:
+    batch_size = settings.SYNC_BATCH_SIZE
+    cap = settings.SYNC_MAX_TASKS_PER_TEAM
+
+    result = await db.execute(
+        select(TeamMember.team_id).where(
+            TeamMember.team_id.in_(since.keys()), TeamMember.user_id == user_id
+        )
+    )
+    allowed = {row[0] for row in result.all()}
+    summary: Dict[str, Any] = {
+        str(tid): {"error": "forbidden"} for tid in since if tid not in allowed
+    }
+    if not allowed:
+        return summary
+
+    markers = {tid: _parse_marker(since[tid]) for tid in allowed}
+    ids_cap = settings.SYNC_MAX_TASK_IDS_PER_TEAM
+
+    # task_id hiện có (để client phát hiện task bị xóa) - một query, giới hạn mỗi team
+    result = await db.execute(task_ids_query(sorted(allowed), ids_cap + 1))
+    task_ids: Dict[int, List[int]] = {tid: [] for tid in allowed}
+    for team_id, task_id in result.all():
+        task_ids[team_id].append(task_id)
+
+    # Task thay đổi sau marker của từng team - một query, giới hạn mỗi team
+    result = await db.execute(changed_tasks_query(markers, cap + 1))
+    changed: Dict[int, List[Task]] = {tid: [] for tid in allowed}
+    for team_id, task in result.all():
+        changed[team_id].append(task)
+
+    for team_id in sorted(allowed):
+        tasks = sorted(changed[team_id], key=lambda t: (_changed_at(t), t.task_id))
+        truncated = len(tasks) > cap
+        tasks = tasks[:cap]
+        ids_truncated = len(task_ids[team_id]) > ids_cap
+        ids = task_ids[team_id][:ids_cap]
+        marker = markers[team_id]
+        if tasks:
+            marker = _changed_at(tasks[-1])
+        batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)] or [[]]
+        for i, batch in enumerate(batches):
+            last = i == len(batches) - 1
+            await _emit("sync_tasks", sid, {
+                "team_id": team_id,
+                "tasks": [_task_payload(t) for t in batch],
+                # task_ids/marker chỉ gửi ở batch cuối
+                "task_ids": ids if last else None,
+                "task_ids_truncated": ids_truncated if last else None,
+                "marker": marker if last else None,
+                "has_more": not last,
+            })
+        summary[str(team_id)] = {
+            "marker": jsonable_encoder(marker),
+            "count": len(tasks),
+            "truncated": truncated,
+            "task_ids_truncated": ids_truncated,
+        }
+    return summary
+
+
+async def sync_client(sid: str, user_id: str, data: Any) -> Dict[str, Any]:
+    """
+    Stream các thay đổi bị bỏ lỡ cho một socket.
+
+    data = {
+        "channels": {"12": 3456, ...},                  # channel_id -> last seen message_id
+        "teams": {"7": "2026-02-01T10:00:00+00:00"}     # team_id -> last seen marker (null = tất cả)
+    }
+
+    Returns:
+        Tóm tắt theo channel/team (dùng làm ack): last_message_id / marker mới,
+        count, truncated, hoặc error
+    """
+    data = data if isinstance(data, dict) else {}
+    channels = _parse_ids(data.get("channels"), settings.SYNC_MAX_CHANNELS)
+    teams = _parse_ids(data.get("teams"), settings.SYNC_MAX_TEAMS)
+    uid = UUID(str(user_id))
+
+    async with _sync_slots:
+        async with AsyncSessionLocal() as db:
+            channel_summary = await _sync_channels(db, sid, uid, channels) if channels else {}
+            team_summary = await _sync_teams(db, sid, uid, teams) if teams else {}
+    return {"channels": channel_summary, "teams": team_summary}
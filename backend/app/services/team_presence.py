@@ -0,0 +1,138 @@
+"""
+Team Presence - Phase 3 BE1
+Thành viên nào của team đang online
+
+Index theo team = danh sách thành viên (TeamMember, cache PRESENCE_ROSTER_TTL_SECONDS,
+bỏ cache khi có người join/leave - qua cache_invalidation nên mọi worker đều
+bỏ) giao với presence store (một lệnh lookup
+cho cả team, Redis: ZMSCORE trên tập online). Chi phí một lần tra cứu tăng
+theo số thành viên của team, không theo tổng số connection của server.
+
+- REST: GET /teams/{team_id}/presence
+- Socket: client emit `presence` {"team_id"} -> ack snapshot
+- Push: khi user connect/disconnect, các team room của user nhận
+  `presence_snapshot` (trạng thái đầy đủ, nên bỏ được khi client chậm)
+
+Snapshot: {"team_id": 7, "online": ["uuid", ...], "member_count": 5}
+
+Presence hết hạn theo heartbeat (SOCKETIO_PRESENCE_TTL_SECONDS): user của một
+worker bị crash tự biến mất khỏi snapshot sau TTL.
+
+Author: BE1
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import logging
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.all_models import TeamMember
+from app.services.cache_invalidation import cache_invalidation
+from app.services.socket_manager import emit_to_room, manager
+
+logger = logging.getLogger(__name__)
+
+# Giữ reference tới các task push snapshot đang chạy
+_background: Set[asyncio.Task] = set()
+
+
+class TeamPresence:
+    """Roster cache theo team + tra cứu online theo lô"""
+
+    def __init__(self, ttl: float = 60, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # team_id -> (hết hạn, user_ids thành viên)
+        self._rosters: Dict[int, Tuple[float, List[str]]] = {}
+        # user_id -> (hết hạn, team_ids) - dùng để push khi user connect/disconnect
+        self._user_teams: Dict[str, Tuple[float, Set[int]]] = {}
+
+    async def members(self, team_id: int) -> List[str]:
+        cached = self._rosters.get(team_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(TeamMember.user_id).where(TeamMember.team_id == team_id)
+            )
+            roster = [str(user_id) for user_id in result.scalars().all()]
+        if len(self._rosters) >= self.max_entries:
+            self._rosters.clear()
+        self._rosters[team_id] = (time.monotonic() + self.ttl, roster)
+        return roster
+
+    async def user_teams(self, user_id: str) -> Set[int]:
+        cached = self._user_teams.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(TeamMember.team_id).where(TeamMember.user_id == UUID(user_id))
+            )
+            teams = set(result.scalars().all())
+        if len(self._user_teams) >= self.max_entries:
+            self._user_teams.clear()
+        self._user_teams[user_id] = (time.monotonic() + self.ttl, teams)
+        return teams
+
+    async def snapshot(self, team_id: int, viewer_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Snapshot online của team; None nếu viewer không thuộc team"""
+        roster = await self.members(team_id)
+        if viewer_id is not None and viewer_id not in roster:
+            return None
+        online = await manager.presence.online_among(roster)
+        return {
+            "team_id": team_id,
+            "online": sorted(online),
+            "member_count": len(roster),
+        }
+
+    def forget(self, team_id: int, user_id: Optional[str] = None):
+        """Membership thay đổi (join/leave) trên worker này"""
+        self._rosters.pop(team_id, None)
+        if user_id is not None:
+            self._user_teams.pop(user_id, None)
+
+    def apply_change(self, change: Dict[str, Any]):
+        """Thay đổi membership từ cache_invalidation (worker này hoặc worker khác)"""
+        if change["op"] == "member":
+            self.forget(change["team_id"], change["user_id"])
+        elif change["op"] == "team":
+            team_id = change["team_id"]
+            self._rosters.pop(team_id, None)
+            for user_id in [u for u, (_, teams) in self._user_teams.items() if team_id in teams]:
+                del self._user_teams[user_id]
+
+    def clear(self):
+        self._rosters.clear()
+        self._user_teams.clear()
+
+    async def publish(self, team_id: int):
+        snapshot = await self.snapshot(team_id)
+        await emit_to_room('presence_snapshot', snapshot, f"team_{team_id}")
+
+    async def announce(self, user_id: str):
+        """User vừa online/offline: push snapshot cho mọi team của user"""
+        for team_id in await self.user_teams(user_id):
+            await self.publish(team_id)
+
+    def announce_later(self, user_id: str):
+        """announce() chạy nền để không làm chậm connect/disconnect"""
+        task = asyncio.create_task(self._announce_safe(user_id))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+    async def _announce_safe(self, user_id: str):
+        try:
+            await self.announce(user_id)
+        except Exception as e:
+            logger.error(f"Presence announce for {user_id} failed: {e}")
+
+
+team_presence = TeamPresence(ttl=settings.PRESENCE_ROSTER_TTL_SECONDS)
+cache_invalidation.subscribe("team_presence", team_presence.apply_change, team_presence.clear)
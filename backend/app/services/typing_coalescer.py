@@ -0,0 +1,139 @@
+"""
+Typing Coalescer - Phase 3 BE1
+Gom typing indicator theo (channel, user) thành snapshot định kỳ
+
+Event `typing` trước đây được broadcast lại cho cả room theo từng phím gõ.
+Giờ mỗi event chỉ gia hạn trạng thái "đang gõ" của (channel, user); cứ
+TYPING_SNAPSHOT_INTERVAL_SECONDS một lần, mỗi channel có người đang gõ nhận
+đúng một event `typing_snapshot`:
+
+    {"channel_id": 12, "user_ids": [...], "stopped": [...], "ttl_ms": 3000}
+
+- user_ids: đang gõ (client giữ mỗi user trong ttl_ms, snapshot sau gia hạn)
+- stopped: vừa ngừng gõ (hết TYPING_TTL_SECONDS, gửi tin nhắn, disconnect)
+
+Mỗi worker gửi snapshot cho các socket của chính nó; client hợp các snapshot
+lại nên chạy được với nhiều worker (SOCKETIO_MANAGER=redis).
+
+Author: BE1
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+Emit = Callable[[int, Dict[str, Any]], Awaitable[None]]
+
+
+class TypingCoalescer:
+    """Trạng thái typing của các socket trên worker hiện tại"""
+
+    def __init__(self, emit: Emit, interval: float = 1.5, ttl: float = 3.0):
+        self.emit = emit
+        self.interval = interval
+        self.ttl = ttl
+        # channel_id -> user_id -> thời điểm hết hạn (monotonic)
+        self._typers: Dict[int, Dict[str, float]] = {}
+        # channel_id -> user_id đã ngừng gõ từ snapshot trước
+        self._stopped: Dict[int, Set[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Counters
+        self.received = 0
+        self.suppressed = 0
+        self.rejected = 0
+        self.expired = 0
+        self.snapshots = 0
+
+    def touch(self, channel_id: int, user_id: str) -> None:
+        """Một event `typing`: gia hạn, không emit gì ngay"""
+        self.received += 1
+        typers = self._typers.setdefault(channel_id, {})
+        if user_id in typers:
+            # Đã có trong snapshot kế tiếp -> event thừa
+            self.suppressed += 1
+        typers[user_id] = time.monotonic() + self.ttl
+        stopped = self._stopped.get(channel_id)
+        if stopped:
+            stopped.discard(user_id)
+        self._ensure_task()
+
+    def reject(self) -> None:
+        """Event không hợp lệ (chưa join channel, thiếu channel_id)"""
+        self.received += 1
+        self.rejected += 1
+
+    def release(self, channel_id: int, user_id: str) -> None:
+        """User ngừng gõ (vừa gửi tin nhắn): báo ở snapshot kế tiếp"""
+        typers = self._typers.get(channel_id)
+        if typers and typers.pop(user_id, None) is not None:
+            self._stopped.setdefault(channel_id, set()).add(user_id)
+            self._ensure_task()
+
+    def release_user(self, user_id: str) -> None:
+        """User không còn socket nào trên worker này"""
+        for channel_id in [c for c, typers in self._typers.items() if user_id in typers]:
+            self.release(channel_id, user_id)
+
+    def typing_users(self, channel_id: int) -> Set[str]:
+        now = time.monotonic()
+        return {u for u, expires_at in self._typers.get(channel_id, {}).items() if expires_at > now}
+
+    def _ensure_task(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        # Dừng khi không còn ai gõ; touch() sau đó sẽ khởi động lại
+        while self._typers or self._stopped:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Typing snapshot failed: {e}")
+
+    async def flush(self) -> int:
+        """Hết hạn các typer cũ rồi gửi một snapshot cho mỗi channel có thay đổi"""
+        now = time.monotonic()
+        snapshots = []
+        for channel_id in list(self._typers.keys() | self._stopped.keys()):
+            typers = self._typers.get(channel_id, {})
+            stopped = self._stopped.pop(channel_id, set())
+            for user_id in [u for u, expires_at in typers.items() if expires_at <= now]:
+                del typers[user_id]
+                stopped.add(user_id)
+                self.expired += 1
+            if not typers:
+                self._typers.pop(channel_id, None)
+            if typers or stopped:
+                snapshots.append({
+                    "channel_id": channel_id,
+                    "user_ids": sorted(typers),
+                    "stopped": sorted(stopped),
+                    "ttl_ms": int((self.ttl + self.interval) * 1000),
+                })
+        for snapshot in snapshots:
+            await self.emit(snapshot["channel_id"], snapshot)
+        self.snapshots += len(snapshots)
+        return len(snapshots)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._typers.clear()
+        self._stopped.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channels": len(self._typers),
+            "typers": sum(len(t) for t in self._typers.values()),
+            "received": self.received,
+            "suppressed": self.suppressed,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "snapshots": self.snapshots,
+        }
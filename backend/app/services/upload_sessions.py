@@ -0,0 +1,277 @@
+"""
+Upload Sessions - Phase 4
+Resumable, chunked uploads for large submissions (videos, zipped repos)
+
+A dropped connection near the deadline no longer means starting over:
+
+1. POST   /submissions/uploads                      {file_name, file_size, sha256?}
+   -> upload_id, chunk_size, chunk_count (size limit checked before any byte)
+2. PUT    /submissions/uploads/{id}/chunks/{index}   raw bytes of chunk `index`
+   (chunk_size bytes, the last one shorter; any order, retries are harmless)
+3. GET    /submissions/uploads/{id}                  offset (contiguous bytes
+   received), missing_chunks -> the client resends only those
+4. POST   /submissions/uploads/{id}/complete         hash, de-duplicate and move
+   into submission storage; same response as POST /submissions/upload
+
+State lives on disk so any worker can serve any request of a session:
+
+    upload_sessions/<id>/meta.json   what was declared at creation (immutable)
+    upload_sessions/<id>/data        sparse file, chunk i written at i * chunk_size
+    upload_sessions/<id>/chunk-<i>   marker, created after chunk i is fully written
+                                     and removed before it is written again
+
+A session expires UPLOAD_SESSION_TTL_SECONDS after its last received chunk;
+expired sessions are removed when touched and by a sweep on session creation.
+
+Author: BE4
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional, Set
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.services.file_storage import (
+    FileStorage,
+    StoredFile,
+    file_kind,
+    file_suffix,
+    file_too_large,
+    size_limit,
+    submission_files,
+)
+
+SWEEP_INTERVAL_SECONDS = 60
+
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    user_id: str
+    file_name: str
+    suffix: str
+    size: int
+    chunk_size: int
+    sha256: Optional[str] = None
+
+    @property
+    def chunk_count(self) -> int:
+        return (self.size + self.chunk_size - 1) // self.chunk_size
+
+    def chunk_length(self, index: int) -> int:
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Upload session not found or expired",
+    )
+
+
+class UploadSessions:
+    """Upload sessions stored under one directory"""
+
+    def __init__(self, root: Path, storage: FileStorage, chunk_size: int, ttl: float):
+        self.root = root
+        self.storage = storage
+        self.chunk_size = chunk_size
+        self.ttl = ttl
+        self._last_sweep = 0.0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, upload_id: str) -> Path:
+        return self.root / upload_id
+
+    # ----- create / load -----
+
+    async def create(self, user_id: UUID, file_name: str, size: int,
+                     sha256: Optional[str] = None) -> UploadSession:
+        suffix = file_suffix(file_name)
+        kind = file_kind(suffix)
+        limit = size_limit(kind)
+        if size > limit:
+            raise file_too_large(kind, limit)
+        session = UploadSession(
+            upload_id=uuid4().hex,
+            user_id=str(user_id),
+            file_name=file_name,
+            suffix=suffix,
+            size=size,
+            chunk_size=self.chunk_size,
+            sha256=sha256.lower() if sha256 else None,
+        )
+        await asyncio.to_thread(self._create, session)
+        if time.monotonic() - self._last_sweep > SWEEP_INTERVAL_SECONDS:
+            self._last_sweep = time.monotonic()
+            await asyncio.to_thread(self.sweep)
+        return session
+
+    def _create(self, session: UploadSession):
+        directory = self._dir(session.upload_id)
+        directory.mkdir()
+        with open(directory / "data", "wb") as f:
+            f.truncate(session.size)
+        (directory / "meta.json").write_text(json.dumps(asdict(session)))
+
+    async def get(self, upload_id: str, user_id: UUID) -> UploadSession:
+        """Session of this user; 404 if unknown, expired or someone else's"""
+        if not upload_id.isalnum():
+            raise _not_found()
+        session = await asyncio.to_thread(self._load, upload_id)
+        if session is None or session.user_id != str(user_id):
+            raise _not_found()
+        return session
+
+    def _load(self, upload_id: str) -> Optional[UploadSession]:
+        directory = self._dir(upload_id)
+        try:
+            if self._expired(directory):
+                shutil.rmtree(directory, ignore_errors=True)
+                return None
+            return UploadSession(**json.loads((directory / "meta.json").read_text()))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def _expired(self, directory: Path) -> bool:
+        # Directory mtime = last received chunk
+        return directory.stat().st_mtime + self.ttl < time.time()
+
+    # ----- progress -----
+
+    def _received(self, session: UploadSession) -> Set[int]:
+        received = set()
+        for name in os.listdir(self._dir(session.upload_id)):
+            if name.startswith("chunk-"):
+                received.add(int(name[6:]))
+        return received
+
+    async def status(self, session: UploadSession) -> dict:
+        received = await asyncio.to_thread(self._received, session)
+        contiguous = 0
+        while contiguous in received:
+            contiguous += 1
+        directory = self._dir(session.upload_id)
+        last_activity = (await asyncio.to_thread(directory.stat)).st_mtime
+        return {
+            "upload_id": session.upload_id,
+            "file_name": session.file_name,
+            "file_size": session.size,
+            "chunk_size": session.chunk_size,
+            "chunk_count": session.chunk_count,
+            "offset": min(session.size, contiguous * session.chunk_size),
+            "received_chunks": len(received),
+            "missing_chunks": [i for i in range(session.chunk_count) if i not in received],
+            "expires_at": datetime.fromtimestamp(last_activity + self.ttl, tz=timezone.utc),
+        }
+
+    async def write_chunk(self, session: UploadSession, index: int, body: AsyncIterator[bytes]):
+        """Write chunk `index` from a request body stream, flushing every storage chunk"""
+        if not 0 <= index < session.chunk_count:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk index must be between 0 and {session.chunk_count - 1}",
+            )
+        expected = session.chunk_length(index)
+        position = index * session.chunk_size
+        written = 0
+        buffer = bytearray()
+        # A resent chunk overwrites bytes already marked received: drop the
+        # marker first, so a resend that breaks off shows up as missing again
+        await asyncio.to_thread(self._unmark_received, session, index)
+        fd = await asyncio.to_thread(os.open, self._dir(session.upload_id) / "data", os.O_WRONLY)
+        try:
+            async for piece in body:
+                if written + len(buffer) + len(piece) > expected:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Chunk {index} must be {expected} bytes",
+                    )
+                buffer += piece
+                if len(buffer) >= self.storage.chunk_size:
+                    await asyncio.to_thread(os.pwrite, fd, bytes(buffer), position + written)
+                    written += len(buffer)
+                    buffer.clear()
+            if buffer:
+                await asyncio.to_thread(os.pwrite, fd, bytes(buffer), position + written)
+                written += len(buffer)
+        finally:
+            await asyncio.to_thread(os.close, fd)
+        if written != expected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk {index} must be {expected} bytes, received {written}",
+            )
+        await asyncio.to_thread(self._mark_received, session, index)
+
+    def _unmark_received(self, session: UploadSession, index: int):
+        try:
+            os.unlink(self._dir(session.upload_id) / f"chunk-{index}")
+        except FileNotFoundError:
+            pass
+
+    def _mark_received(self, session: UploadSession, index: int):
+        directory = self._dir(session.upload_id)
+        (directory / f"chunk-{index}").touch()
+        os.utime(directory)  # last activity, for expiry
+
+    # ----- finish -----
+
+    async def complete(self, session: UploadSession) -> StoredFile:
+        received = await asyncio.to_thread(self._received, session)
+        missing = [i for i in range(session.chunk_count) if i not in received]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload incomplete: {len(missing)} chunk(s) missing, first {missing[0]}",
+            )
+        # Renaming the directory claims the session: a concurrent complete
+        # (double click, retried request) gets a 404 instead of a half move
+        claimed = self.root / f".{session.upload_id}.completing"
+        try:
+            await asyncio.to_thread(os.rename, self._dir(session.upload_id), claimed)
+        except FileNotFoundError:
+            raise _not_found()
+        try:
+            stored = await self.storage.adopt(claimed / "data", session.suffix)
+        finally:
+            await asyncio.to_thread(shutil.rmtree, claimed, True)
+        if session.sha256 and stored.sha256 != session.sha256:
+            # The assembled bytes are not what the client declared; keep
+            # nothing that other submissions might start pointing at
+            if not stored.deduplicated:
+                await asyncio.to_thread(self.storage.storage.delete, self.storage.key(stored.name))
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Uploaded file does not match the declared sha256; start a new upload",
+            )
+        return stored
+
+    async def abort(self, session: UploadSession):
+        await asyncio.to_thread(shutil.rmtree, self._dir(session.upload_id), True)
+
+    def sweep(self) -> int:
+        """Remove expired sessions; returns how many were removed"""
+        removed = 0
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and entry.stat().st_mtime + self.ttl < time.time():
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+upload_sessions = UploadSessions(
+    root=Path(settings.ROOT_DIR) / "upload_sessions",
+    storage=submission_files,
+    chunk_size=settings.UPLOAD_SESSION_CHUNK_BYTES,
+    ttl=settings.UPLOAD_SESSION_TTL_SECONDS,
+)
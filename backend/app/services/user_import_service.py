@@ -7,10 +7,7 @@ from typing import List, Tuple
 
 from app.schemas.user_import import UserImportRow, UserImportStats, UserImportResultRow
 from app.models.all_models import User, Role, Department
-from passlib.context import CryptContext
-
-# Use sha256_crypt to avoid bcrypt 72-byte limit issues in this environment
-import_pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+from app.core.security import get_import_password_hash_async
 
 async def parse_import_file(file: UploadFile) -> List[UserImportRow]:
     """Parse uploaded file into list of UserImportRow objects."""
@@ -109,7 +106,7 @@ async def import_users(db: AsyncSession, users: List[UserImportRow]) -> Tuple[Us
             new_user = User(
                 email=user_in.email,
                 full_name=user_in.full_name,
-                password_hash=import_pwd_context.hash(password),
+                password_hash=await get_import_password_hash_async(password),
                 role_id=role_id,
                 dept_id=dept_id,
                 phone=user_in.phone,
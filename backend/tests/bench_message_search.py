@@ -0,0 +1,200 @@
+"""
+GET /messages/search latency as the messages table grows.
+
+Seeds one searcher in a team with `--own` messages, then grows the rest of
+the messages table in steps (other teams' channels, same vocabulary, so the
+searched words are common everywhere). After each step it runs ANALYZE and
+times `--requests` search calls through the app (ASGI, no network) for a
+handful of queries: a frequent word, a rare word, a phrase and a second page
+via next_cursor. Latency should stay roughly flat across steps because the
+GIN index plus the channel scope only ever touch the searcher's matches.
+
+Also prints the plan of the search statement at the largest step. Seeded rows
+are deleted at the end.
+
+Run (from backend/, against a migrated database, with requirements-dev.txt installed):
+    python -m tests.bench_message_search
+    python -m tests.bench_message_search --steps 0,200000,1000000 --requests 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+PREFIX = "bench-search-"
+WORDS = [
+    "deploy", "review", "sprint", "backend", "frontend", "login", "api", "server",
+    "database", "test", "merge", "branch", "bug", "fix", "meeting", "deadline",
+    "báo", "cáo", "nhóm", "họp", "triển", "khai", "giao", "diện", "lỗi", "sửa",
+]
+QUERIES = {
+    "frequent word": "deploy",
+    "two words": "login bug",
+    "phrase": '"api server"',
+    "rare word": "kubernetes",
+}
+BACKGROUND_CHANNELS = 200
+
+# Random sentence of 6-14 words from WORDS; 1 in 500 mentions the rare word
+CONTENT_SQL = f"""
+    (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+     FROM (SELECT ARRAY{WORDS!r}::text[] AS w) v,
+          generate_series(1, 6 + (g % 9)) n)
+    || CASE WHEN g % 500 = 0 THEN ' kubernetes' ELSE '' END
+"""
+
+
+async def _seed_base(own: int):
+    from sqlalchemy import insert, select, text
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import Channel, Role, Team, TeamMember, User
+
+    async with AsyncSessionLocal() as db:
+        role_id = await db.scalar(select(Role.role_id).limit(1))
+        if role_id is None:
+            raise SystemExit("No roles found - seed the database first")
+        user_ids = (await db.execute(
+            insert(User).returning(User.user_id, sort_by_parameter_order=True),
+            [{"email": f"{PREFIX}{name}@example.com", "full_name": name,
+              "role_id": role_id, "is_active": True} for name in ("searcher", "background")],
+        )).scalars().all()
+        team_ids = (await db.execute(
+            insert(Team).returning(Team.team_id, sort_by_parameter_order=True),
+            [{"team_name": f"{PREFIX}{t}", "is_finalized": False}
+             for t in range(BACKGROUND_CHANNELS + 1)],
+        )).scalars().all()
+        await db.execute(insert(TeamMember), [
+            {"team_id": team_id, "user_id": user_ids[0 if t == 0 else 1], "role": "MEMBER"}
+            for t, team_id in enumerate(team_ids)
+        ])
+        channel_ids = (await db.execute(
+            insert(Channel).returning(Channel.channel_id, sort_by_parameter_order=True),
+            [{"team_id": team_id, "name": "general"} for team_id in team_ids],
+        )).scalars().all()
+        await db.execute(text(f"""
+            INSERT INTO messages (channel_id, sender_id, content, sent_at)
+            SELECT :channel_id, :sender_id, {CONTENT_SQL}, now() - g * interval '1 minute'
+            FROM generate_series(1, :own) g
+        """), {"channel_id": channel_ids[0], "sender_id": user_ids[0], "own": own})
+        await db.commit()
+    return user_ids, channel_ids
+
+
+async def _grow(rows: int, sender_id, channel_ids):
+    from sqlalchemy import text
+
+    from app.db.session import AsyncSessionLocal
+
+    background = channel_ids[1:]
+    async with AsyncSessionLocal() as db:
+        await db.execute(text(f"""
+            INSERT INTO messages (channel_id, sender_id, content, sent_at)
+            SELECT (CAST(:channels AS integer[]))[1 + g % {len(background)}], :sender_id, {CONTENT_SQL},
+                   now() - g * interval '1 second'
+            FROM generate_series(1, :rows) g
+        """), {"channels": background, "sender_id": sender_id, "rows": rows})
+        await db.commit()
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("ANALYZE messages"))
+        await db.commit()
+
+
+async def _time(client, headers, params: dict, requests: int) -> list:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/api/v1/messages/search", params=params, headers=headers)
+        timings.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise SystemExit(f"search failed: {response.status_code} {response.text}")
+    return timings
+
+
+async def _explain(user_id) -> str:
+    from sqlalchemy import text
+
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("""
+            EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF)
+            SELECT m.message_id, ts_rank_cd(m.search_vector, q) AS rank
+            FROM messages m, websearch_to_tsquery('simple', 'deploy') q
+            WHERE m.channel_id IN (SELECT c.channel_id FROM channels c
+                                   JOIN team_members tm ON tm.team_id = c.team_id
+                                   WHERE tm.user_id = :user_id)
+              AND m.search_vector @@ q
+            ORDER BY rank DESC, m.message_id DESC LIMIT 21
+        """), {"user_id": user_id})
+        return "\n".join(row[0] for row in result)
+
+
+async def _cleanup():
+    from sqlalchemy import delete, select
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import AuditLog, Channel, Message, Team, TeamMember, User
+
+    async with AsyncSessionLocal() as db:
+        teams = select(Team.team_id).where(Team.team_name.like(f"{PREFIX}%"))
+        users = select(User.user_id).where(User.email.like(f"{PREFIX}%"))
+        channels = select(Channel.channel_id).where(Channel.team_id.in_(teams))
+        await db.execute(delete(Message).where(Message.channel_id.in_(channels)))
+        await db.execute(delete(Channel).where(Channel.team_id.in_(teams)))
+        await db.execute(delete(TeamMember).where(TeamMember.team_id.in_(teams)))
+        await db.execute(delete(Team).where(Team.team_id.in_(teams)))
+        await db.execute(delete(AuditLog).where(AuditLog.actor_id.in_(users)))
+        await db.execute(delete(User).where(User.email.like(f"{PREFIX}%")))
+        await db.commit()
+
+
+async def main(args) -> int:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.db.session import engine
+    from app.main import app
+
+    steps = sorted(int(s) for s in args.steps.split(","))
+    await _cleanup()
+    try:
+        (searcher, background), channel_ids = await _seed_base(args.own)
+        headers = {"Authorization": f"Bearer {create_access_token(searcher)}"}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            first = (await client.get("/api/v1/messages/search", params={"q": "deploy"},
+                                      headers=headers)).json()
+            page_two = {"q": "deploy", "cursor": first["next_cursor"]}
+
+            print(f"{'other rows':>10}  " + "  ".join(f"{name:>14}" for name in QUERIES)
+                  + f"  {'page 2':>14}   (p50 / p95 ms)")
+            seeded = 0
+            for step in steps:
+                if step > seeded:
+                    await _grow(step - seeded, background, channel_ids)
+                    seeded = step
+                cells = []
+                for params in [{"q": q} for q in QUERIES.values()] + [page_two]:
+                    await _time(client, headers, params, 3)  # warm up
+                    timings = sorted(await _time(client, headers, params, args.requests))
+                    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                    cells.append(f"{statistics.median(timings) * 1000:6.1f} / {p95 * 1000:5.1f}")
+                print(f"{seeded:>10}  " + "  ".join(f"{c:>14}" for c in cells))
+
+        print("\nPlan at the largest step (frequent word):")
+        print(await _explain(searcher))
+    finally:
+        await _cleanup()
+        await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--own", type=int, default=2000, help="messages in the searcher's channel")
+    parser.add_argument("--steps", default="0,100000,500000",
+                        help="total rows in other teams' channels at each step")
+    parser.add_argument("--requests", type=int, default=30, help="timed calls per query and step")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,148 @@
+"""
+Login throughput and event-loop lag under concurrent logins.
+
+Seeds a batch of users, fires concurrent POST /auth/login requests at the app
+in-process and, in parallel, runs a probe that sleeps 5ms in a loop and
+records how late it wakes up. Inline hashing shows up as probe lag of a full
+PBKDF2 run per queued login; the hashing executor keeps it near zero.
+
+Each executor mode runs in its own interpreter because settings are read at
+import time.
+
+Run (from backend/, against a migrated database, with requirements-dev.txt installed):
+    python -m tests.bench_password_hashing                  # inline, thread, process
+    python -m tests.bench_password_hashing --mode process --logins 400 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODES = {
+    # mode: (PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS)
+    "inline": ("thread", "0"),
+    "thread": ("thread", None),
+    "process": ("process", None),
+}
+EMAIL_PREFIX = "bench-login-"
+PASSWORD = "Bench@12345"
+PROBE_INTERVAL = 0.005
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _probe(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def run(mode: str, users: int, logins: int, concurrency: int) -> None:
+    import httpx
+    from sqlalchemy import delete, select
+
+    from app.core import security
+    from app.core.config import settings
+    from app.db.session import AsyncSessionLocal, engine
+    from app.main import app
+    from app.models.all_models import Role, User
+
+    async with AsyncSessionLocal() as db:
+        # Roles are seeded with fixed ids; reuse any existing one
+        role = (await db.execute(select(Role).limit(1))).scalars().first()
+        if role is None:
+            raise SystemExit("No roles found - seed the database first")
+        password_hash = security.get_password_hash(PASSWORD)
+        db.add_all([
+            User(email=f"{EMAIL_PREFIX}{i}@example.com", password_hash=password_hash,
+                 full_name=f"Bench {i}", role_id=role.role_id, is_active=True)
+            for i in range(users)
+        ])
+        await db.commit()
+
+    latencies = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up the executor (process workers are spawned lazily)
+        await client.post(f"{settings.API_V1_STR}/auth/login",
+                          data={"username": f"{EMAIL_PREFIX}0@example.com", "password": PASSWORD})
+
+        async def login(i: int):
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    f"{settings.API_V1_STR}/auth/login",
+                    data={"username": f"{EMAIL_PREFIX}{i % users}@example.com", "password": PASSWORD},
+                )
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+
+        lags: list = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(stop, lags))
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.email.like(f"{EMAIL_PREFIX}%")))
+            await db.commit()
+    finally:
+        security.shutdown_hash_executor()
+        await engine.dispose()
+
+    print(
+        f"{mode:<8} workers={settings.PASSWORD_HASH_WORKERS:<2} "
+        f"logins/s={logins / elapsed:7.1f}  "
+        f"latency p50={_percentile(latencies, 0.5) * 1000:6.1f}ms "
+        f"p99={_percentile(latencies, 0.99) * 1000:6.1f}ms  "
+        f"loop lag mean={statistics.mean(lags) * 1000:6.1f}ms "
+        f"p99={_percentile(lags, 0.99) * 1000:6.1f}ms "
+        f"max={max(lags) * 1000:6.1f}ms  "
+        f"failures={failures}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=sorted(MODES), help="run a single mode (default: all)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.mode is None:
+        status = 0
+        for mode in MODES:
+            status |= subprocess.call(
+                [sys.executable, "-m", "tests.bench_password_hashing", "--mode", mode,
+                 "--users", str(args.users), "--logins", str(args.logins),
+                 "--concurrency", str(args.concurrency)]
+            )
+        return status
+
+    executor, workers = MODES[args.mode]
+    os.environ["PASSWORD_HASH_EXECUTOR"] = executor
+    if workers is not None:
+        os.environ["PASSWORD_HASH_WORKERS"] = workers
+    asyncio.run(run(args.mode, args.users, args.logins, args.concurrency))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Socket.IO load test for the realtime stack: how many sockets can a worker hold.
+
+Seeds `--clients` users in teams of `--team-size` (one channel per team),
+starts the app from app.main in a single uvicorn worker, then drives one
+python-socketio AsyncClient per user, authenticated with a JWT from
+create_access_token:
+
+1. connect (at most `--connect-concurrency` handshakes in flight), then
+   join_team + join_channel
+2. typing: every client emits `typing` every 300ms for `--typing-seconds`
+3. fan-out: for `--rounds` rounds, one member per team sends a message with
+   the socket `new_message` event; every member of the channel must receive it
+
+Reports connect rate and latency, server memory per connection (RSS delta of
+the uvicorn process, Linux only), typing events in vs snapshots out, and
+fan-out latency percentiles. Seeded rows are deleted at the end.
+
+Run (from backend/, against a migrated database, with requirements-dev.txt installed):
+    python -m tests.bench_realtime
+    python -m tests.bench_realtime --clients 5000 --team-size 6 --rounds 10 --port 8198
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+PREFIX = "bench-rt-"
+
+
+def _percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _rss_bytes(pid: int):
+    """Resident memory of a process from /proc (None where unavailable)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+async def _wait_ready(base_url: str, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health")).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not start")
+
+
+async def _socket_stats(base_url: str) -> dict:
+    import httpx
+
+    async with httpx.AsyncClient() as client:
+        return (await client.get(f"{base_url}/health/sockets")).json()
+
+
+async def _seed(clients: int, team_size: int):
+    """Returns [(user_id, team_id, channel_id)], one entry per client."""
+    from sqlalchemy import insert, select
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import Channel, Role, Team, TeamMember, User
+
+    teams = (clients + team_size - 1) // team_size
+    async with AsyncSessionLocal() as db:
+        # Roles are seeded with fixed ids; reuse any existing one
+        role_id = await db.scalar(select(Role.role_id).limit(1))
+        if role_id is None:
+            raise SystemExit("No roles found - seed the database first")
+        run = uuid.uuid4().hex[:8]
+        team_ids = (await db.execute(
+            insert(Team).returning(Team.team_id, sort_by_parameter_order=True),
+            [{"team_name": f"{PREFIX}{run}-{t}", "is_finalized": False} for t in range(teams)],
+        )).scalars().all()
+        channel_ids = (await db.execute(
+            insert(Channel).returning(Channel.channel_id, sort_by_parameter_order=True),
+            [{"team_id": team_id, "name": "load"} for team_id in team_ids],
+        )).scalars().all()
+        user_ids = (await db.execute(
+            insert(User).returning(User.user_id, sort_by_parameter_order=True),
+            [{"email": f"{PREFIX}{run}-{i}@example.com", "full_name": f"Load {i}",
+              "role_id": role_id, "is_active": True} for i in range(clients)],
+        )).scalars().all()
+        await db.execute(insert(TeamMember), [
+            {"team_id": team_ids[i // team_size], "user_id": user_id, "role": "MEMBER"}
+            for i, user_id in enumerate(user_ids)
+        ])
+        await db.commit()
+    return [(user_id, team_ids[i // team_size], channel_ids[i // team_size])
+            for i, user_id in enumerate(user_ids)]
+
+
+async def _cleanup():
+    from sqlalchemy import delete, select
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.all_models import AuditLog, Channel, Message, Team, TeamMember, User
+
+    async with AsyncSessionLocal() as db:
+        teams = select(Team.team_id).where(Team.team_name.like(f"{PREFIX}%"))
+        users = select(User.user_id).where(User.email.like(f"{PREFIX}%"))
+        channels = select(Channel.channel_id).where(Channel.team_id.in_(teams))
+        await db.execute(delete(Message).where(Message.channel_id.in_(channels)))
+        await db.execute(delete(Channel).where(Channel.team_id.in_(teams)))
+        await db.execute(delete(TeamMember).where(TeamMember.team_id.in_(teams)))
+        await db.execute(delete(Team).where(Team.team_id.in_(teams)))
+        await db.execute(delete(AuditLog).where(AuditLog.actor_id.in_(users)))
+        await db.execute(delete(User).where(User.email.like(f"{PREFIX}%")))
+        await db.commit()
+    await engine.dispose()
+
+
+class LoadClient:
+    """One simulated user: a socket plus what it has received."""
+
+    def __init__(self, user_id, team_id, channel_id, sent_at: dict, fanout: list):
+        import socketio
+
+        self.user_id = user_id
+        self.team_id = team_id
+        self.channel_id = channel_id
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.typing_snapshots = 0
+        self.sio.on("message_received", self._on_message)
+        self.sio.on("typing_snapshot", self._on_typing)
+        self._sent_at = sent_at
+        self._fanout = fanout
+
+    def _on_message(self, data):
+        started = self._sent_at.get(data["message"]["content"])
+        if started is not None:
+            self._fanout.append(time.perf_counter() - started)
+
+    def _on_typing(self, data):
+        self.typing_snapshots += 1
+
+    async def connect(self, base_url: str, token: str):
+        await self.sio.connect(base_url, auth={"token": token}, transports=["websocket"],
+                               socketio_path="/socket.io/socket.io", wait_timeout=30)
+        await self.sio.call("join_team", {"team_id": self.team_id}, timeout=30)
+        await self.sio.call("join_channel", {"channel_id": self.channel_id}, timeout=30)
+
+
+async def connect_all(clients, base_url, tokens, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(client, token):
+        nonlocal failures
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await client.connect(base_url, token)
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(c, t) for c, t in zip(clients, tokens)))
+    return time.perf_counter() - started, latencies, failures
+
+
+async def typing_phase(clients, seconds: float):
+    sent = 0
+    deadline = time.monotonic() + seconds
+
+    async def typer(client):
+        nonlocal sent
+        while time.monotonic() < deadline:
+            await client.sio.emit("typing", {"channel_id": client.channel_id})
+            sent += 1
+            await asyncio.sleep(0.3)
+
+    live = [c for c in clients if c.sio.connected]
+    before = sum(c.typing_snapshots for c in live)
+    await asyncio.gather(*(typer(c) for c in live))
+    # Let the last snapshots arrive
+    await asyncio.sleep(2)
+    return sent, sum(c.typing_snapshots for c in live) - before
+
+
+async def fanout_phase(clients, rounds: int, interval: float, sent_at: dict, fanout: list):
+    senders = {}
+    members = {}
+    for client in clients:
+        if client.sio.connected:
+            senders.setdefault(client.channel_id, client)
+            members[client.channel_id] = members.get(client.channel_id, 0) + 1
+    expected = rounds * sum(members.values())
+    failures = 0
+
+    async def send(client, content):
+        nonlocal failures
+        sent_at[content] = time.perf_counter()
+        ack = await client.sio.call("new_message", {
+            "channel_id": client.channel_id, "content": content,
+        }, timeout=60)
+        if not ack or "message_id" not in ack:
+            failures += 1
+
+    for r in range(rounds):
+        await asyncio.gather(*(send(c, f"load {r}:{cid}") for cid, c in senders.items()))
+        await asyncio.sleep(interval)
+    deadline = time.monotonic() + 10
+    while len(fanout) < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.2)
+    return expected, failures
+
+
+def _mb(value):
+    return f"{value / 2**20:.1f}MB" if value is not None else "n/a"
+
+
+async def main(args) -> int:
+    from app.core.security import create_access_token
+
+    await _cleanup()
+    seeded = await _seed(args.clients, args.team_size)
+    tokens = [create_access_token(user_id) for user_id, _, _ in seeded]
+    sent_at: dict = {}
+    fanout: list = []
+    clients = [LoadClient(u, t, c, sent_at, fanout) for u, t, c in seeded]
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning"],
+        env={**os.environ, "DB_QUERY_STATS": "false"},
+        # socketio logs every emit at INFO; keep the report readable
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    ok = True
+    try:
+        await _wait_ready(base_url)
+        rss_idle = _rss_bytes(server.pid)
+
+        elapsed, latencies, failures = await connect_all(
+            clients, base_url, tokens, args.connect_concurrency)
+        connected = len(latencies)
+        rss_connected = _rss_bytes(server.pid)
+        print(f"connect   sockets={connected}/{args.clients} rate={connected / elapsed:7.1f}/s "
+              f"p50={_percentile(latencies, 0.5) * 1000:6.1f}ms "
+              f"p99={_percentile(latencies, 0.99) * 1000:6.1f}ms failures={failures}")
+        if rss_idle is not None and rss_connected is not None and connected:
+            per_socket = (rss_connected - rss_idle) / connected
+            print(f"memory    idle={_mb(rss_idle)} connected={_mb(rss_connected)} "
+                  f"per_socket={per_socket / 1024:.1f}KB")
+        else:
+            print("memory    n/a (needs /proc)")
+
+        typed, snapshots = await typing_phase(clients, args.typing_seconds)
+        print(f"typing    events_in={typed} snapshots_out={snapshots} "
+              f"(per-keystroke broadcast would be ~{typed * (args.team_size - 1)})")
+
+        expected, send_failures = await fanout_phase(
+            clients, args.rounds, args.round_interval, sent_at, fanout)
+        print(f"fanout    delivered={len(fanout)}/{expected} "
+              f"p50={_percentile(fanout, 0.5) * 1000:6.1f}ms "
+              f"p95={_percentile(fanout, 0.95) * 1000:6.1f}ms "
+              f"p99={_percentile(fanout, 0.99) * 1000:6.1f}ms "
+              f"max={max(fanout, default=float('nan')) * 1000:6.1f}ms send_failures={send_failures}")
+
+        outbound = (await _socket_stats(base_url))["outbound"]
+        print(f"outbound  max_depth={outbound['max_depth']} dropped={outbound['dropped']} "
+              f"evicted={outbound['evicted']}")
+        ok = failures == 0 and send_failures == 0 and len(fanout) >= expected
+    finally:
+        await asyncio.gather(*(c.sio.disconnect() for c in clients if c.sio.connected),
+                             return_exceptions=True)
+        server.terminate()
+        server.wait()
+        await _cleanup()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--team-size", type=int, default=5)
+    parser.add_argument("--connect-concurrency", type=int, default=100)
+    parser.add_argument("--typing-seconds", type=float, default=5.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--round-interval", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8198)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,126 @@
+"""
+Connect/join/disconnect churn micro-benchmark for ConnectionManager.
+
+Simulates a reconnect storm: N sockets connect, join their team room and two
+team channels, then all disconnect. Runs against the in-memory Socket.IO
+manager and presence store (no network), so it measures only the bookkeeping.
+
+`indexed` is the current setup (per-sid reverse room index in both
+ConnectionManager and the Socket.IO client manager). `scan` replays the
+previous behaviour, where both walked every room per disconnect; it is
+quadratic, so it runs with fewer sockets by default.
+
+Run (from backend/):
+    python -m tests.bench_socket_churn
+    python -m tests.bench_socket_churn --sockets 50000 --scan-sockets 10000
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+import socketio
+
+from app.services import socket_manager
+from app.services.presence import MemoryPresenceStore
+from app.services.socket_manager import ConnectionManager
+
+MEMBERS_PER_TEAM = 5
+CHANNELS_PER_TEAM = 2
+
+
+class ScanConnectionManager(ConnectionManager):
+    """ConnectionManager with the old O(rooms) disconnect, for comparison."""
+
+    async def disconnect(self, sid: str):
+        user_id = self.socket_to_user.pop(sid, None)
+        if user_id and user_id in self.user_connections:
+            self.user_connections[user_id].discard(sid)
+            if not self.user_connections[user_id]:
+                del self.user_connections[user_id]
+        if user_id:
+            await self.presence.remove(user_id, sid)
+        for channel_id, sockets in list(self.channel_rooms.items()):
+            sockets.discard(sid)
+            if not sockets:
+                del self.channel_rooms[channel_id]
+        for team_id, sockets in list(self.team_rooms.items()):
+            sockets.discard(sid)
+            if not sockets:
+                del self.team_rooms[team_id]
+        self.socket_rooms.pop(sid, None)
+
+
+async def churn(manager_cls, sio_manager, sockets: int) -> dict:
+    manager = manager_cls(presence=MemoryPresenceStore())
+
+    started = time.perf_counter()
+    sids = []
+    for i in range(sockets):
+        # What AsyncServer does on handshake, before our connect handler runs
+        sid = await sio_manager.connect(f"eio-{i}", "/")
+        sids.append(sid)
+        team_id = i // MEMBERS_PER_TEAM
+        await manager.connect(sid, f"user-{i}")
+        await manager.join_team(sid, team_id)
+        for c in range(CHANNELS_PER_TEAM):
+            await manager.join_channel(sid, team_id * CHANNELS_PER_TEAM + c, team_id)
+    connect_time = time.perf_counter() - started
+    rooms = len(manager.channel_rooms) + len(manager.team_rooms)
+
+    started = time.perf_counter()
+    for sid in sids:
+        await manager.disconnect(sid)
+        await sio_manager.disconnect(sid, "/")
+    disconnect_time = time.perf_counter() - started
+
+    leftovers = (len(manager.channel_rooms) + len(manager.team_rooms)
+                 + len(manager.socket_to_user) + len(manager.socket_rooms))
+    return {
+        "rooms": rooms,
+        "connect_join_s": connect_time,
+        "disconnect_s": disconnect_time,
+        "per_disconnect_us": disconnect_time / sockets * 1e6,
+        "leftovers": leftovers,
+    }
+
+
+async def main(args) -> int:
+    logging.getLogger(socket_manager.__name__).setLevel(logging.WARNING)
+    socket_manager.sio.logger.setLevel(logging.WARNING)
+    status = 0
+    sio = socket_manager.sio
+    indexed_sio_manager = sio.manager
+    # Stock python-socketio manager: basic_disconnect scans every room
+    scan_sio_manager = socketio.AsyncManager()
+    scan_sio_manager.set_server(sio)
+
+    for name, cls, sio_manager, sockets in (
+        ("indexed", ConnectionManager, indexed_sio_manager, args.sockets),
+        ("scan", ScanConnectionManager, scan_sio_manager, args.scan_sockets),
+    ):
+        if sockets <= 0:
+            continue
+        sio.manager = sio_manager
+        try:
+            r = await churn(cls, sio_manager, sockets)
+        finally:
+            sio.manager = indexed_sio_manager
+        print(
+            f"{name:<8} sockets={sockets:<6} rooms={r['rooms']:<6} "
+            f"connect+join={r['connect_join_s']:7.2f}s  "
+            f"disconnect={r['disconnect_s']:7.2f}s ({r['per_disconnect_us']:8.1f}us/socket)  "
+            f"leftovers={r['leftovers']}"
+        )
+        if r["leftovers"]:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sockets", type=int, default=50000)
+    parser.add_argument("--scan-sockets", type=int, default=5000,
+                        help="sockets for the old O(rooms) disconnect (0 to skip)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,158 @@
+"""
+Socket.IO payload size and encode cost: JSON vs the opt-in msgpack encoding.
+
+Builds representative payloads for the broadcast events (message_received,
+task_updated, notification, presence_snapshot) and encodes each one the way
+the server puts it on the wire: a Socket.IO EVENT packet with the JSON dict,
+or a BINARY_EVENT packet whose single attachment is socket_codec's msgpack
+(UUIDs as 16-byte ext, datetimes as msgpack timestamps). Reports bytes per
+event (Engine.IO message payloads, all frames) and encode time per event,
+and checks that every msgpack payload decodes back to the JSON structure.
+
+No database or server is needed.
+
+Run (from backend/):
+    python -m tests.bench_socket_payloads
+    python -m tests.bench_socket_payloads --iterations 50000
+"""
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from socketio import packet
+
+from app.services.socket_codec import decode_compact, encode_compact, msgpack
+
+
+def _payloads() -> dict:
+    now = datetime.now(timezone.utc)
+    team = [uuid.uuid4() for _ in range(6)]
+    return {
+        "message_received": {
+            "type": "message:new",
+            "channel_id": 1234,
+            "message": {
+                "message_id": 987654,
+                "channel_id": 1234,
+                "sender_id": team[0],
+                "sender_name": "Nguyễn Văn An",
+                "content": "Mình đã push phần API cho sprint này, mọi người review giúp nhé!",
+                "sent_at": now,
+                "is_edited": False,
+            },
+        },
+        "task_updated": {
+            "type": "task:updated",
+            "team_id": 42,
+            "task": {
+                "task_id": 5511,
+                "change": "status_changed",
+                "sprint_id": 310,
+                "title": "Implement login page",
+                "description": "Form validation, remember me, error states",
+                "status": "IN_PROGRESS",
+                "priority": "HIGH",
+                "assigned_to": team[1],
+                "created_at": now - timedelta(days=3),
+                "updated_at": now,
+                "due_date": now + timedelta(days=4),
+                "blocked_reason": None,
+                "depends_on": None,
+            },
+        },
+        "notification": {
+            "type": "notification:new",
+            "notification": {
+                "notification_id": 77120,
+                "user_id": team[2],
+                "title": "Task assigned",
+                "content": "Trần Thị Bình assigned you to 'Implement login page'",
+                "type": "TASK_ASSIGNED",
+                "is_read": False,
+                "created_at": now,
+                "link": "/tasks/5511",
+                "metadata": {"task_id": 5511, "actor_id": str(team[1])},
+            },
+        },
+        "presence_snapshot": {
+            "team_id": 42,
+            "online": sorted(str(u) for u in team[:4]),
+            "member_count": 6,
+        },
+    }
+
+
+def _wire_json(event: str, data: dict) -> list:
+    encoded = packet.Packet(packet.EVENT, data=[event, data]).encode()
+    return [encoded.encode()]
+
+
+def _wire_msgpack(event: str, data: dict) -> list:
+    # A bytes argument makes python-socketio send a BINARY_EVENT: a text
+    # header frame plus one binary frame with the attachment
+    encoded = packet.Packet(packet.EVENT, data=[event, encode_compact(data)]).encode()
+    return [encoded[0].encode()] + encoded[1:]
+
+
+def _time_per_op(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def _same(left, right) -> bool:
+    """JSON payload vs decoded msgpack payload (UUID/datetime compared as strings)."""
+    if isinstance(left, dict):
+        return isinstance(right, dict) and left.keys() == right.keys() and all(
+            _same(left[k], right[k]) for k in left)
+    if isinstance(left, list):
+        return isinstance(right, list) and len(left) == len(right) and all(
+            _same(a, b) for a, b in zip(left, right))
+    if isinstance(right, uuid.UUID):
+        return left == str(right)
+    if isinstance(right, datetime):
+        return datetime.fromisoformat(left.replace("Z", "+00:00")) == right
+    return left == right
+
+
+def main(args) -> int:
+    if msgpack is None:
+        print("msgpack is not installed (pip install -r requirements.txt)")
+        return 1
+
+    ok = True
+    totals = {"json": [0, 0.0], "msgpack": [0, 0.0]}
+    print(f"{'event':<18} {'json B':>7} {'msgpack B':>9} {'size':>6}   "
+          f"{'json us':>8} {'msgpack us':>10} {'cpu':>6}")
+    for event, payload in _payloads().items():
+        # Broadcast helpers receive jsonable dicts
+        data = jsonable_encoder(payload)
+        json_wire = _wire_json(event, data)
+        mp_wire = _wire_msgpack(event, data)
+        json_bytes = sum(len(frame) for frame in json_wire)
+        mp_bytes = sum(len(frame) for frame in mp_wire)
+        json_us = _time_per_op(lambda: _wire_json(event, data), args.iterations) * 1e6
+        mp_us = _time_per_op(lambda: _wire_msgpack(event, data), args.iterations) * 1e6
+        if not _same(data, decode_compact(mp_wire[-1])):
+            print(f"{event}: msgpack payload does not round-trip")
+            ok = False
+        for name, size, cost in (("json", json_bytes, json_us), ("msgpack", mp_bytes, mp_us)):
+            totals[name][0] += size
+            totals[name][1] += cost
+        print(f"{event:<18} {json_bytes:>7} {mp_bytes:>9} {mp_bytes / json_bytes:>6.0%}   "
+              f"{json_us:>8.1f} {mp_us:>10.1f} {mp_us / json_us:>5.1f}x")
+
+    (jb, jt), (mb, mt) = totals["json"], totals["msgpack"]
+    print(f"{'total':<18} {jb:>7} {mb:>9} {mb / jb:>6.0%}   {jt:>8.1f} {mt:>10.1f} {mt / jt:>5.1f}x")
+    print("msgpack events are sent as 2 frames (header + attachment), JSON as 1")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20000, help="encodes per event and format")
+    sys.exit(main(parser.parse_args()))
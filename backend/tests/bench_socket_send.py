@@ -0,0 +1,192 @@
+"""
+Chat send throughput: POST /messages/ vs the socket `new_message` event.
+
+Seeds a team with one channel and `--clients` members, starts a single
+uvicorn worker, then has every member send `--messages` messages back to
+back (one in flight per client, like a user typing) - first over REST with
+httpx, then over Socket.IO waiting for each ack. Reports messages/s and
+per-message latency for both paths and checks that every message was
+persisted.
+
+Run (from backend/, against a migrated database, with requirements-dev.txt installed):
+    python -m tests.bench_socket_send
+    python -m tests.bench_socket_send --clients 100 --messages 50 --port 8199
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+EMAIL_PREFIX = "bench-send-"
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _wait_ready(base_url: str, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/")).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not start")
+
+
+async def _seed(clients: int):
+    from sqlalchemy import select
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import Channel, Role, Team, TeamMember, User
+
+    async with AsyncSessionLocal() as db:
+        # Roles are seeded with fixed ids; reuse any existing one
+        role = (await db.execute(select(Role).limit(1))).scalars().first()
+        if role is None:
+            raise SystemExit("No roles found - seed the database first")
+        team = Team(team_name=f"bench-send-{uuid.uuid4().hex[:8]}", is_finalized=False)
+        db.add(team)
+        await db.flush()
+        users = [
+            User(email=f"{EMAIL_PREFIX}{uuid.uuid4().hex}@example.com", full_name=f"Sender {i}",
+                 role_id=role.role_id, is_active=True)
+            for i in range(clients)
+        ]
+        db.add_all(users)
+        await db.flush()
+        db.add_all(TeamMember(team_id=team.team_id, user_id=u.user_id, role="MEMBER") for u in users)
+        channel = Channel(team_id=team.team_id, name="bench")
+        db.add(channel)
+        await db.commit()
+        return team.team_id, channel.channel_id, [u.user_id for u in users]
+
+
+async def _cleanup(team_id: int, channel_id: int):
+    from sqlalchemy import delete, func, select
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.all_models import AuditLog, Channel, Message, Team, TeamMember, User
+
+    async with AsyncSessionLocal() as db:
+        persisted = await db.scalar(select(func.count()).where(Message.channel_id == channel_id))
+        await db.execute(delete(Message).where(Message.channel_id == channel_id))
+        await db.execute(delete(Channel).where(Channel.channel_id == channel_id))
+        await db.execute(delete(TeamMember).where(TeamMember.team_id == team_id))
+        await db.execute(delete(Team).where(Team.team_id == team_id))
+        bench_users = select(User.user_id).where(User.email.like(f"{EMAIL_PREFIX}%"))
+        await db.execute(delete(AuditLog).where(AuditLog.actor_id.in_(bench_users)))
+        await db.execute(delete(User).where(User.email.like(f"{EMAIL_PREFIX}%")))
+        await db.commit()
+    await engine.dispose()
+    return persisted
+
+
+async def bench_rest(base_url, api, channel_id, tokens, messages):
+    import httpx
+
+    latencies = []
+    failures = 0
+    limits = httpx.Limits(max_connections=len(tokens), max_keepalive_connections=len(tokens))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def sender(token):
+            nonlocal failures
+            headers = {"Authorization": f"Bearer {token}"}
+            for i in range(messages):
+                started = time.perf_counter()
+                response = await client.post(f"{api}/messages/", headers=headers,
+                                             json={"channel_id": channel_id, "content": f"rest {i}"})
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 201:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(sender(t) for t in tokens))
+        elapsed = time.perf_counter() - started
+    return elapsed, latencies, failures
+
+
+async def bench_socket(base_url, channel_id, tokens, messages):
+    import socketio
+
+    clients = []
+    for token in tokens:
+        client = socketio.AsyncClient()
+        await client.connect(base_url, auth={"token": token}, transports=["websocket"],
+                             socketio_path="/socket.io/socket.io")
+        clients.append(client)
+
+    latencies = []
+    failures = 0
+
+    async def sender(client):
+        nonlocal failures
+        for i in range(messages):
+            started = time.perf_counter()
+            ack = await client.call("new_message", {
+                "channel_id": channel_id, "content": f"socket {i}", "client_id": str(i),
+            }, timeout=60)
+            latencies.append(time.perf_counter() - started)
+            if not ack or "message_id" not in ack:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(sender(c) for c in clients))
+    elapsed = time.perf_counter() - started
+    await asyncio.gather(*(c.disconnect() for c in clients))
+    return elapsed, latencies, failures
+
+
+def _report(name, total, elapsed, latencies, failures):
+    rate = total / elapsed
+    print(
+        f"{name:<7} msgs={total:<6} msgs/s={rate:8.1f}  "
+        f"latency p50={_percentile(latencies, 0.5) * 1000:6.1f}ms "
+        f"p99={_percentile(latencies, 0.99) * 1000:6.1f}ms  failures={failures}"
+    )
+    return rate
+
+
+async def main(args) -> int:
+    from app.core.config import settings
+    from app.core.security import create_access_token
+
+    team_id, channel_id, user_ids = await _seed(args.clients)
+    tokens = [create_access_token(uid) for uid in user_ids]
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning"],
+        env={**os.environ, "DB_QUERY_STATS": "false"},
+    )
+    try:
+        await _wait_ready(base_url)
+        total = args.clients * args.messages
+        rest = _report("rest", total, *await bench_rest(
+            base_url, settings.API_V1_STR, channel_id, tokens, args.messages))
+        sock = _report("socket", total, *await bench_socket(
+            base_url, channel_id, tokens, args.messages))
+    finally:
+        server.terminate()
+        server.wait()
+        persisted = await _cleanup(team_id, channel_id)
+
+    print(f"socket/rest throughput = {sock / rest:.1f}x  persisted={persisted}/{2 * total}")
+    return 0 if persisted == 2 * total else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=40, help="messages per client and path")
+    parser.add_argument("--port", type=int, default=8199)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,174 @@
+"""
+Memory check for GET /milestones/{id}/submissions/export (streamed ZIP).
+
+Seeds a class with one milestone and a growing number of teams (`--teams`),
+each with a checkpoint and one submitted file of `--file-mb` MB, starts the
+app in a single uvicorn worker and downloads the export without keeping it.
+For every class size it prints time to first byte, throughput, archive size
+and the worker's peak resident memory (VmHWM, Linux only): the peak should
+stay flat while the archive grows. The end of each archive is parsed to
+check that the central directory lists every file plus manifest.csv.
+
+Seeded rows and files are removed at the end.
+
+Run (from backend/, against a migrated database, with requirements-dev.txt installed):
+    python -m tests.bench_submission_export
+    python -m tests.bench_submission_export --teams 100,1000 --file-mb 4 --port 8198
+"""
+import argparse
+import asyncio
+import os
+import struct
+import subprocess
+import sys
+import time
+import uuid
+
+from tests.bench_uploads import _mb, _peak_rss, _wait_ready
+
+PREFIX = "bench-export-"
+# Distinct files shared by the seeded submissions, to keep disk use low
+FILE_VARIANTS = 4
+
+
+def _entry_count(tail: bytes):
+    """Entries listed by the end-of-central-directory record (None if absent)."""
+    position = tail.rfind(b"PK\x05\x06")
+    if position < 0:
+        return None
+    count = struct.unpack("<H", tail[position + 10:position + 12])[0]
+    if count == 0xFFFF:
+        zip64 = tail.rfind(b"PK\x06\x06", 0, position)
+        count = struct.unpack("<Q", tail[zip64 + 32:zip64 + 40])[0]
+    return count
+
+
+async def _seed(teams: int, file_urls):
+    from sqlalchemy import insert, select
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import (
+        AcademicClass, Checkpoint, Milestone, Semester, Subject, Submission, Team, User,
+    )
+
+    async with AsyncSessionLocal() as db:
+        semester_id = await db.scalar(select(Semester.semester_id).limit(1))
+        subject_id = await db.scalar(select(Subject.subject_id).limit(1))
+        if semester_id is None or subject_id is None:
+            raise SystemExit("No semester/subject found - seed the database first")
+        lecturer_id = await db.scalar(insert(User).returning(User.user_id).values(
+            email=f"{PREFIX}{uuid.uuid4().hex[:8]}@example.com", full_name="Export bench",
+            role_id=4, is_active=True))
+        class_id = await db.scalar(insert(AcademicClass).returning(AcademicClass.class_id).values(
+            class_code=f"{PREFIX}{uuid.uuid4().hex[:8]}", semester_id=semester_id,
+            subject_id=subject_id, lecturer_id=lecturer_id))
+        milestone_id = await db.scalar(insert(Milestone).returning(Milestone.milestone_id).values(
+            class_id=class_id, title="Export bench", created_by=lecturer_id))
+        team_ids = (await db.scalars(insert(Team).returning(Team.team_id), [
+            {"class_id": class_id, "team_name": f"Team {i}", "created_by": lecturer_id}
+            for i in range(teams)
+        ])).all()
+        checkpoint_ids = (await db.scalars(insert(Checkpoint).returning(Checkpoint.checkpoint_id), [
+            {"team_id": team_id, "milestone_id": milestone_id, "title": "Final report"}
+            for team_id in team_ids
+        ])).all()
+        await db.execute(insert(Submission), [
+            {"checkpoint_id": checkpoint_id, "submitted_by": lecturer_id,
+             "file_url": file_urls[i % len(file_urls)]}
+            for i, checkpoint_id in enumerate(checkpoint_ids)
+        ])
+        await db.commit()
+    return lecturer_id, milestone_id
+
+
+async def _cleanup():
+    from sqlalchemy import delete, select
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.all_models import (
+        AcademicClass, Checkpoint, Milestone, Submission, Team, User,
+    )
+
+    async with AsyncSessionLocal() as db:
+        classes = select(AcademicClass.class_id).where(AcademicClass.class_code.like(f"{PREFIX}%"))
+        milestones = select(Milestone.milestone_id).where(Milestone.class_id.in_(classes))
+        checkpoints = select(Checkpoint.checkpoint_id).where(Checkpoint.milestone_id.in_(milestones))
+        await db.execute(delete(Submission).where(Submission.checkpoint_id.in_(checkpoints)))
+        await db.execute(delete(Checkpoint).where(Checkpoint.milestone_id.in_(milestones)))
+        await db.execute(delete(Milestone).where(Milestone.class_id.in_(classes)))
+        await db.execute(delete(Team).where(Team.class_id.in_(classes)))
+        await db.execute(delete(AcademicClass).where(AcademicClass.class_code.like(f"{PREFIX}%")))
+        await db.execute(delete(User).where(User.email.like(f"{PREFIX}%")))
+        await db.commit()
+    await engine.dispose()
+
+
+async def main(args) -> int:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.services.file_storage import submission_files
+    from app.services.object_storage import object_storage
+
+    names = []
+    for i in range(FILE_VARIANTS):
+        part = submission_files.root / f".bench-export-{i}.part"
+        part.write_bytes(os.urandom(args.file_mb * 1024 * 1024))
+        names.append((await submission_files.adopt(part, ".pdf")).name)
+    file_urls = [f"/uploads/submissions/{name}" for name in names]
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning"],
+        env={**os.environ, "DB_QUERY_STATS": "false"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    ok = True
+    try:
+        await _wait_ready(base_url)
+        print(f"idle        peak_rss={_mb(_peak_rss(server.pid))}")
+        async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+            for teams in (int(t) for t in args.teams.split(",")):
+                lecturer_id, milestone_id = await _seed(teams, file_urls)
+                headers = {"Authorization": f"Bearer {create_access_token(lecturer_id)}"}
+                started = time.perf_counter()
+                first_byte = None
+                total = 0
+                tail = b""
+                async with client.stream(
+                    "GET", f"/api/v1/milestones/{milestone_id}/submissions/export",
+                    headers=headers,
+                ) as response:
+                    if response.status_code != 200:
+                        print(f"{teams} teams: export failed with {response.status_code}")
+                        ok = False
+                        continue
+                    async for chunk in response.aiter_bytes():
+                        if first_byte is None:
+                            first_byte = time.perf_counter() - started
+                        total += len(chunk)
+                        tail = (tail + chunk)[-1024 * 1024:]
+                elapsed = time.perf_counter() - started
+                entries = _entry_count(tail)
+                print(f"{teams:>5} teams ttfb={first_byte * 1000:6.1f}ms "
+                      f"{total / 2**20 / elapsed:7.1f}MB/s zip={_mb(total)} entries={entries} "
+                      f"peak_rss={_mb(_peak_rss(server.pid))}")
+                if entries != teams + 1:
+                    print(f"{teams} teams: expected {teams + 1} entries")
+                    ok = False
+    finally:
+        server.terminate()
+        server.wait()
+        for name in names:
+            object_storage.delete(submission_files.key(name))
+        await _cleanup()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--teams", default="20,200,1000", help="class sizes (teams) to export")
+    parser.add_argument("--file-mb", type=int, default=2, help="size of each submitted file")
+    parser.add_argument("--port", type=int, default=8198)
+    sys.exit(asyncio.run(main(parser.parse_args())))
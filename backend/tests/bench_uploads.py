@@ -0,0 +1,164 @@
+"""
+Upload memory and de-duplication check for POST /submissions/upload.
+
+Starts the app in a single uvicorn worker, then uploads generated files of
+increasing size (`--sizes`, MB) as multipart bodies streamed from disk. After
+each upload it reads the worker's peak resident memory (VmHWM, Linux only):
+with streaming storage the peak should not grow with the file size. Each file
+is then uploaded a second time; the response must point at the same stored
+file and the uploads directory must not grow.
+
+Stored files and the seeded user are removed at the end.
+
+Run (from backend/, against a migrated database, with requirements-dev.txt installed):
+    python -m tests.bench_uploads
+    python -m tests.bench_uploads --sizes 10,200,800 --port 8197
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+PREFIX = "bench-upload-"
+
+
+def _peak_rss(pid: int):
+    """Peak resident memory of a process from /proc (None where unavailable)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def _dir_bytes(path) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def _mb(value):
+    return f"{value / 2**20:7.1f}MB" if value is not None else "    n/a"
+
+
+def _make_file(directory: str, size_mb: int) -> str:
+    path = os.path.join(directory, f"upload-{size_mb}mb.zip")
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        f.write(uuid.uuid4().bytes)  # distinct content per run
+        for _ in range(size_mb):
+            f.write(block)
+    return path
+
+
+async def _wait_ready(base_url: str, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health")).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not start")
+
+
+async def _seed_user():
+    from sqlalchemy import insert, select
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import Role, User
+
+    async with AsyncSessionLocal() as db:
+        role_id = await db.scalar(select(Role.role_id).limit(1))
+        if role_id is None:
+            raise SystemExit("No roles found - seed the database first")
+        user_id = await db.scalar(insert(User).returning(User.user_id).values(
+            email=f"{PREFIX}{uuid.uuid4().hex[:8]}@example.com", full_name="Upload bench",
+            role_id=role_id, is_active=True))
+        await db.commit()
+    return user_id
+
+
+async def _cleanup():
+    from sqlalchemy import delete
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.all_models import User
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.email.like(f"{PREFIX}%")))
+        await db.commit()
+    await engine.dispose()
+
+
+async def main(args) -> int:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.services.file_storage import submission_files
+    from app.services.object_storage import object_storage
+
+    user_id = await _seed_user()
+    headers = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning"],
+        env={**os.environ, "DB_QUERY_STATS": "false"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    stored = []
+    ok = True
+    try:
+        await _wait_ready(base_url)
+        print(f"idle      peak_rss={_mb(_peak_rss(server.pid))}")
+        with tempfile.TemporaryDirectory() as tmp:
+            async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+                for size_mb in (int(s) for s in args.sizes.split(",")):
+                    path = _make_file(tmp, size_mb)
+                    urls = []
+                    for attempt in ("first", "repeat"):
+                        disk_before = _dir_bytes(submission_files.root)
+                        started = time.perf_counter()
+                        with open(path, "rb") as f:
+                            response = await client.post(
+                                "/api/v1/submissions/upload", headers=headers,
+                                files={"file": (os.path.basename(path), f)})
+                        elapsed = time.perf_counter() - started
+                        if response.status_code != 200:
+                            print(f"{size_mb}MB upload failed: {response.status_code} {response.text}")
+                            ok = False
+                            break
+                        urls.append(response.json()["file_url"])
+                        grown = _dir_bytes(submission_files.root) - disk_before
+                        print(f"{size_mb:>5}MB {attempt:<6} {size_mb / elapsed:7.1f}MB/s "
+                              f"peak_rss={_mb(_peak_rss(server.pid))} disk_growth={_mb(grown)}")
+                    if len(urls) == 2:
+                        stored.append(urls[0].rsplit("/", 1)[1])
+                        if urls[0] != urls[1]:
+                            print(f"{size_mb}MB: repeat upload was stored again")
+                            ok = False
+                    os.unlink(path)
+    finally:
+        server.terminate()
+        server.wait()
+        for name in stored:
+            object_storage.delete(submission_files.key(name))
+        await _cleanup()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="10,100,400", help="file sizes in MB")
+    parser.add_argument("--port", type=int, default=8197)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,210 @@
+"""
+End-to-end check of STORAGE_BACKEND=s3 against an S3-compatible server.
+
+Starts the app in a single uvicorn worker configured for the bucket, then:
+uploads a submission file (multipart) and a resumable upload, and checks
+that both objects landed in the bucket with nothing left in local staging;
+uploads the same file again and checks that no new object was written;
+downloads through /uploads/... and /api/v1/resources/download/... and
+checks the API answers only a 307 to a presigned URL, and that the bytes and
+Content-Disposition come from the bucket itself.
+
+Any S3-compatible server works as the stand-in: the MinIO service of
+docker-compose.yml (`docker compose --profile s3 up minio minio-init`,
+port 9002), or `moto_server -p 9002` (moto is in requirements-dev.txt). The
+bucket is created if it does not exist. Objects and the seeded users are
+removed at the end.
+
+Run (from backend/, against a migrated database, with requirements-dev.txt installed):
+    STORAGE_BACKEND=s3 S3_ENDPOINT_URL=http://localhost:9002 \\
+    S3_ACCESS_KEY_ID=collabsphere S3_SECRET_ACCESS_KEY=collabsphere_password \\
+        python -m tests.check_object_storage
+    ... python -m tests.check_object_storage --size-mb 64 --port 8199
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import subprocess
+import sys
+import time
+import uuid
+from urllib.parse import parse_qs, urlparse
+
+from tests.bench_uploads import _wait_ready
+
+PREFIX = "check-storage-"
+
+
+async def _seed_users():
+    from sqlalchemy import insert
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import User
+
+    async with AsyncSessionLocal() as db:
+        ids = []
+        for role_id in (5, 4):  # student (submissions), lecturer (resources)
+            ids.append(await db.scalar(insert(User).returning(User.user_id).values(
+                email=f"{PREFIX}{uuid.uuid4().hex[:8]}@example.com", full_name="Storage check",
+                role_id=role_id, is_active=True)))
+        await db.commit()
+    return ids
+
+
+async def _cleanup():
+    from sqlalchemy import delete
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.all_models import AuditLog, User
+
+    async with AsyncSessionLocal() as db:
+        users = User.__table__.select().with_only_columns(User.user_id).where(
+            User.email.like(f"{PREFIX}%"))
+        await db.execute(delete(AuditLog).where(AuditLog.actor_id.in_(users)))
+        await db.execute(delete(User).where(User.email.like(f"{PREFIX}%")))
+        await db.commit()
+    await engine.dispose()
+
+
+class Checks:
+    def __init__(self):
+        self.failed = 0
+
+    def __call__(self, name: str, ok: bool, detail: str = ""):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail else ''}")
+        if not ok:
+            self.failed += 1
+
+
+async def main(args) -> int:
+    import httpx
+    from botocore.exceptions import ClientError
+
+    from app.core.config import settings
+    from app.core.security import create_access_token
+    from app.services.file_storage import resource_files, submission_files
+    from app.services.object_storage import S3Storage, object_storage
+
+    if not isinstance(object_storage, S3Storage):
+        raise SystemExit("Set STORAGE_BACKEND=s3 and S3_* for the server to check")
+    try:
+        object_storage.client.head_bucket(Bucket=settings.S3_BUCKET)
+    except ClientError:
+        object_storage.client.create_bucket(Bucket=settings.S3_BUCKET)
+
+    check = Checks()
+    student_id, lecturer_id = await _seed_users()
+    student = {"Authorization": f"Bearer {create_access_token(student_id)}"}
+    lecturer = {"Authorization": f"Bearer {create_access_token(lecturer_id)}"}
+    data = uuid.uuid4().bytes + os.urandom(args.size_mb * 1024 * 1024)
+    sha = hashlib.sha256(data).hexdigest()
+    keys = []
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning"],
+        env={**os.environ, "DB_QUERY_STATS": "false"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        await _wait_ready(base_url)
+        async with httpx.AsyncClient(base_url=base_url, timeout=300) as api, \
+                httpx.AsyncClient(timeout=300) as bucket:
+            # Upload: object in the bucket, nothing left in local staging
+            started = time.perf_counter()
+            r = await api.post("/api/v1/submissions/upload", headers=student,
+                               files={"file": ("report.pdf", data)})
+            elapsed = time.perf_counter() - started
+            check("upload", r.status_code == 200 and r.json()["sha256"] == sha,
+                  f"{r.status_code}, {len(data) / 2**20 / elapsed:.1f}MB/s")
+            name = urlparse(r.json()["file_url"]).path.rsplit("/", 1)[-1]
+            check("public name not derived from the content", sha not in name, name)
+            key = submission_files.key(name)
+            keys.append(key)
+            head = object_storage._head(key)
+            check("object stored", head is not None and head["ContentLength"] == len(data))
+            check("immutable Cache-Control on object",
+                  head is not None and head.get("CacheControl") == "public, max-age=31536000, immutable")
+            staged = [p.name for p in submission_files.root.iterdir() if p.name == name or p.suffix == ".part"]
+            check("local staging empty", not staged, ", ".join(staged))
+
+            # Same bytes again: de-duplicated, object not rewritten
+            r2 = await api.post("/api/v1/submissions/upload", headers=student,
+                                files={"file": ("copy.pdf", data)})
+            head2 = object_storage._head(key)
+            check("repeat upload deduplicated",
+                  r2.status_code == 200 and r2.json()["file_url"] == r.json()["file_url"]
+                  and head2["LastModified"] == head["LastModified"])
+
+            # Download: the API answers a redirect, the bucket sends the bytes
+            path = urlparse(r.json()["file_url"]).path
+            redirect = await api.get(path)
+            location = redirect.headers.get("location", "")
+            query = parse_qs(urlparse(location).query)
+            check("download redirects", redirect.status_code == 307 and not redirect.content,
+                  f"{redirect.status_code}, {len(redirect.content)} body bytes from the API")
+            check("presigned URL",
+                  query.get("X-Amz-Expires") == [str(settings.STORAGE_PRESIGN_EXPIRE_SECONDS)]
+                  and "X-Amz-Signature" in query)
+            public = urlparse(settings.S3_PUBLIC_ENDPOINT_URL or settings.S3_ENDPOINT_URL)
+            check("presigned host is the public endpoint", urlparse(location).netloc == public.netloc,
+                  urlparse(location).netloc)
+            started = time.perf_counter()
+            direct = await bucket.get(location)
+            elapsed = time.perf_counter() - started
+            check("bucket serves the bytes", direct.status_code == 200 and direct.content == data,
+                  f"{direct.status_code}, {len(data) / 2**20 / elapsed:.1f}MB/s")
+            tampered = location.replace("X-Amz-Signature=", "X-Amz-Signature=0")
+            denied = await bucket.get(tampered)
+            print(f"info tampered signature -> {denied.status_code} "
+                  f"(403 on MinIO/AWS; some stand-ins do not verify)")
+
+            # Resumable upload completes into the bucket
+            small = os.urandom(3 * 1024 * 1024 + 17)
+            small_sha = hashlib.sha256(small).hexdigest()
+            r = await api.post("/api/v1/submissions/uploads", headers=student, json={
+                "file_name": "video.mp4", "file_size": len(small), "sha256": small_sha})
+            session = r.json()
+            for index in range(session["chunk_count"]):
+                start = index * session["chunk_size"]
+                await api.put(f"/api/v1/submissions/uploads/{session['upload_id']}/chunks/{index}",
+                              headers=student, content=small[start:start + session["chunk_size"]])
+            r = await api.post(f"/api/v1/submissions/uploads/{session['upload_id']}/complete",
+                               headers=student)
+            key = submission_files.key(urlparse(r.json().get("file_url", "")).path.rsplit("/", 1)[-1])
+            keys.append(key)
+            check("resumable upload stored", r.status_code == 200
+                  and object_storage.size(key) == len(small))
+
+            # Resources: attachment disposition signed into the URL
+            r = await api.post("/api/v1/resources/upload-file", headers=lecturer,
+                               files={"file": ("slides.pptx", small)})
+            name = r.json().get("filename", "")
+            keys.append(resource_files.key(name))
+            redirect = await api.get(f"/api/v1/resources/download/{name}")
+            direct = await bucket.get(redirect.headers.get("location", ""))
+            check("resource download", redirect.status_code == 307 and direct.status_code == 200
+                  and direct.headers.get("content-disposition", "").startswith("attachment"),
+                  direct.headers.get("content-disposition", ""))
+
+            missing = await api.get("/uploads/submissions/" + "0" * 64 + ".pdf")
+            missing_direct = await bucket.get(missing.headers.get("location", ""))
+            # 403 instead of 404 where the credentials may not list the bucket
+            check("missing object refused by the bucket", missing.status_code == 307
+                  and missing_direct.status_code in (403, 404), str(missing_direct.status_code))
+    finally:
+        server.terminate()
+        server.wait()
+        for key in keys:
+            object_storage.delete(key)
+        await _cleanup()
+    return 1 if check.failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=int, default=16, help="size of the uploaded file")
+    parser.add_argument("--port", type=int, default=8199)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,108 @@
+"""
+Query budget check for handlers that used to issue one query per row.
+
+Seeds a team per size in `--members` (every member reviewed by every other
+member), then calls GET /peer-reviews/summary/{team_id} in-process through
+the ASGI app inside app.db.query_stats.query_budget: the statement count
+must stay within `--max-queries` whatever the team size, and no statement
+shape may repeat (an N+1 loop over the members would).
+
+Seeded rows are removed at the end.
+
+Run (from backend/, against a migrated database, with requirements-dev.txt installed):
+    python -m tests.check_query_budgets
+    python -m tests.check_query_budgets --members 2,50 --max-queries 5
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+
+PREFIX = "check-budget-"
+
+
+async def _seed(members: int):
+    from sqlalchemy import insert
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import PeerReview, Team, TeamMember, User
+
+    async with AsyncSessionLocal() as db:
+        lecturer_id = await db.scalar(insert(User).returning(User.user_id).values(
+            email=f"{PREFIX}{uuid.uuid4().hex[:8]}@example.com", full_name="Budget check",
+            role_id=4, is_active=True))
+        user_ids = (await db.scalars(insert(User).returning(User.user_id), [
+            {"email": f"{PREFIX}{uuid.uuid4().hex[:8]}@example.com", "full_name": f"Member {i}",
+             "role_id": 5, "is_active": True}
+            for i in range(members)
+        ])).all()
+        team_id = await db.scalar(insert(Team).returning(Team.team_id).values(
+            team_name=f"{PREFIX}team", created_by=lecturer_id))
+        await db.execute(insert(TeamMember), [
+            {"team_id": team_id, "user_id": user_id} for user_id in user_ids
+        ])
+        await db.execute(insert(PeerReview), [
+            {"team_id": team_id, "reviewer_id": reviewer, "reviewee_id": reviewee,
+             "score": 4, "comment": "Good work"}
+            for reviewer in user_ids for reviewee in user_ids if reviewer != reviewee
+        ])
+        await db.commit()
+    return lecturer_id, team_id
+
+
+async def _cleanup():
+    from sqlalchemy import delete
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.all_models import Team, User
+
+    async with AsyncSessionLocal() as db:
+        # Members and peer reviews cascade with the team
+        await db.execute(delete(Team).where(Team.team_name.like(f"{PREFIX}%")))
+        await db.execute(delete(User).where(User.email.like(f"{PREFIX}%")))
+        await db.commit()
+    await engine.dispose()
+
+
+def _check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"{'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail else ''}")
+    return ok
+
+
+async def main(args) -> int:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.db.query_stats import QueryBudgetExceeded, query_budget
+    from app.main import app
+
+    results = []
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check") as client:
+            for members in (int(m) for m in args.members.split(",")):
+                lecturer_id, team_id = await _seed(members)
+                headers = {"Authorization": f"Bearer {create_access_token(lecturer_id)}"}
+                url = f"/api/v1/peer-reviews/summary/{team_id}"
+                # Warm the principal cache so only the handler's own statements count
+                await client.get(url, headers=headers)
+                try:
+                    with query_budget(max_queries=args.max_queries, max_repeats=1) as stats:
+                        response = await client.get(url, headers=headers)
+                    ok, detail = True, f"{stats.count} queries"
+                except QueryBudgetExceeded as e:
+                    ok, detail = False, str(e)
+                results.append(_check(f"peer review summary, {members} members", ok, detail))
+                results.append(_check(f"peer review summary, {members} members, response",
+                                      response.status_code == 200 and len(response.json()) == members
+                                      and all(s["total_reviews"] == members - 1 for s in response.json()),
+                                      str(response.status_code)))
+    finally:
+        await _cleanup()
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--members", default="3,30", help="team sizes to check")
+    parser.add_argument("--max-queries", type=int, default=4)
+    sys.exit(asyncio.run(main(parser.parse_args())))
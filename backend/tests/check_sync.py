@@ -0,0 +1,134 @@
+"""
+Regression check for the socket `sync` catch-up (services/sync_service.py).
+
+1. Compiles the changed-tasks query for asyncpg with every team marker set
+   to None (the first sync of a client) and checks the marker column is cast
+   to timestamptz; without the cast Postgres types the all-NULL VALUES
+   column as text and the comparison fails.
+2. Seeds a team (tasks, a channel with messages) and runs sync_client with
+   emits captured: first sync (all markers null), a later marker, caps
+   smaller than the data (enforced in SQL, reported as truncated), and
+   malformed channel cursors (reported per channel, the rest still syncs).
+
+Seeded rows are removed at the end.
+
+Run (from backend/, against a migrated database):
+    python -m tests.check_sync
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+PREFIX = "check-sync-"
+
+
+async def _seed(tasks: int, messages: int):
+    from sqlalchemy import insert
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.all_models import Channel, Message, Sprint, Task, Team, TeamMember, User
+
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(insert(User).returning(User.user_id).values(
+            email=f"{PREFIX}{uuid.uuid4().hex[:8]}@example.com", full_name="Sync check",
+            role_id=5, is_active=True))
+        team_id = await db.scalar(insert(Team).returning(Team.team_id).values(
+            team_name=f"{PREFIX}team", created_by=user_id))
+        await db.execute(insert(TeamMember).values(team_id=team_id, user_id=user_id))
+        sprint_id = await db.scalar(insert(Sprint).returning(Sprint.sprint_id).values(
+            team_id=team_id, name="Sprint"))
+        await db.execute(insert(Task), [
+            {"sprint_id": sprint_id, "title": f"Task {i}", "status": "TODO",
+             "created_at": base + timedelta(minutes=i)}
+            for i in range(tasks)
+        ])
+        channel_id = await db.scalar(insert(Channel).returning(Channel.channel_id).values(
+            team_id=team_id, name="general"))
+        await db.execute(insert(Message), [
+            {"channel_id": channel_id, "sender_id": user_id, "content": f"m{i}"}
+            for i in range(messages)
+        ])
+        await db.commit()
+    return user_id, team_id, channel_id, base
+
+
+async def _cleanup():
+    from sqlalchemy import delete
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.all_models import Team, User
+
+    async with AsyncSessionLocal() as db:
+        # Sprints, tasks, channels, messages and members cascade with the team
+        await db.execute(delete(Team).where(Team.team_name.like(f"{PREFIX}%")))
+        await db.execute(delete(User).where(User.email.like(f"{PREFIX}%")))
+        await db.commit()
+    await engine.dispose()
+
+
+def _check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"{'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail else ''}")
+    return ok
+
+
+async def main(args) -> int:
+    from sqlalchemy.dialects import postgresql
+
+    from app.core.config import settings
+    from app.services import sync_service
+
+    results = []
+    sql = str(sync_service.changed_tasks_query({1: None, 2: None}, 10).compile(
+        dialect=postgresql.asyncpg.dialect()))
+    results.append(_check("all-null markers cast to timestamptz",
+                          "CAST(cursors.marker AS TIMESTAMP WITH TIME ZONE)" in sql))
+
+    emitted = []
+
+    async def capture(event, sid, data):
+        emitted.append((event, data))
+
+    sync_service._emit = capture
+    user_id, team_id, channel_id, base = await _seed(args.tasks, args.messages)
+    try:
+        settings.SYNC_MAX_TASKS_PER_TEAM = args.tasks - 5
+        settings.SYNC_MAX_TASK_IDS_PER_TEAM = args.tasks - 3
+        summary = await sync_service.sync_client("sid", str(user_id), {
+            "teams": {str(team_id): None},
+            "channels": {str(channel_id): None, "999999999": "abc", "1": -4},
+        })
+        team = summary["teams"].get(str(team_id), {})
+        tasks = [t for event, data in emitted if event == "sync_tasks" for t in data["tasks"]]
+        last = [data for event, data in emitted if event == "sync_tasks"][-1]
+        results.append(_check("first sync (null marker)", team.get("count") == args.tasks - 5
+                              and team.get("truncated") is True, str(team)))
+        results.append(_check("tasks oldest change first",
+                              [t["title"] for t in tasks] == [f"Task {i}" for i in range(args.tasks - 5)]))
+        results.append(_check("task_ids capped", len(last["task_ids"]) == args.tasks - 3
+                              and last["task_ids_truncated"] is True))
+        channels = summary["channels"]
+        results.append(_check("invalid cursors reported per channel",
+                              channels.get("999999999") == {"error": "invalid_cursor"}
+                              and channels.get("1") == {"error": "invalid_cursor"}, str(channels)))
+        results.append(_check("valid channel still synced",
+                              channels.get(str(channel_id), {}).get("count") == args.messages))
+
+        emitted.clear()
+        marker = (base + timedelta(minutes=args.tasks - 3)).isoformat()
+        summary = await sync_service.sync_client("sid", str(user_id), {"teams": {str(team_id): marker}})
+        team = summary["teams"].get(str(team_id), {})
+        results.append(_check("sync after marker", team.get("count") == 2
+                              and team.get("truncated") is False, str(team)))
+    finally:
+        await _cleanup()
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=30)
+    parser.add_argument("--messages", type=int, default=12)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,360 @@
+"""
+EXPLAIN regression check for the hot-lookup indexes.
+
+Seeds a large synthetic dataset inside a single transaction, runs EXPLAIN on the
+queries issued by the main list endpoints and fails if any of them falls back
+to a sequential scan on the table it filters. The transaction is rolled back at
+the end, so the script can be pointed at a dev database without leaving data.
+
+Run (from backend/, against a migrated database):
+    python -m tests.explain_indexes
+"""
+import asyncio
+import json
+import sys
+from uuid import UUID
+
+from sqlalchemy import and_, desc, func, literal_column, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.db.session import engine
+from app.models.all_models import (
+    Channel,
+    Checkpoint,
+    ClassEnrollment,
+    MentoringLog,
+    Message,
+    Notification,
+    PeerReview,
+    Resource,
+    Sprint,
+    Submission,
+    Task,
+    Team,
+    TeamMember,
+)
+
+PREFIX = "explain-"
+
+USERS = 5000
+CLASSES = 50
+TEAMS = 1000
+SPRINTS_PER_TEAM = 2
+TASKS_PER_SPRINT = 20
+MESSAGES_PER_TEAM = 100
+NOTIFICATIONS_PER_USER = 20
+MILESTONES_PER_CLASS = 4
+SUBMISSIONS_PER_CHECKPOINT = 3
+REVIEWS_PER_TEAM = 20
+RESOURCES_PER_TEAM = 10
+ENROLLMENTS_PER_USER = 3
+
+SEED_SQL = [
+    "INSERT INTO roles (role_name) VALUES ('explain-role')",
+    "INSERT INTO departments (dept_name) VALUES ('explain-dept')",
+    "INSERT INTO semesters (semester_code) VALUES ('explain-sem')",
+    """
+    INSERT INTO subjects (subject_code, dept_id)
+    SELECT 'explain-subj', dept_id FROM departments WHERE dept_name = 'explain-dept'
+    """,
+    f"""
+    INSERT INTO users (user_id, email, full_name, role_id, is_active)
+    SELECT gen_random_uuid(), 'explain-' || g || '@example.invalid', 'User ' || g,
+           (SELECT role_id FROM roles WHERE role_name = 'explain-role'), true
+    FROM generate_series(1, {USERS}) g
+    """,
+    f"""
+    INSERT INTO academic_classes (class_code, semester_id, subject_id, lecturer_id)
+    SELECT 'explain-class-' || g,
+           (SELECT semester_id FROM semesters WHERE semester_code = 'explain-sem'),
+           (SELECT subject_id FROM subjects WHERE subject_code = 'explain-subj'),
+           (SELECT user_id FROM users WHERE email = 'explain-1@example.invalid')
+    FROM generate_series(1, {CLASSES}) g
+    """,
+    f"""
+    INSERT INTO teams (team_name, class_id, is_finalized)
+    SELECT 'explain-team-' || g,
+           (SELECT min(class_id) FROM academic_classes WHERE class_code LIKE 'explain-%') + g % {CLASSES},
+           false
+    FROM generate_series(1, {TEAMS}) g
+    """,
+    f"""
+    INSERT INTO team_members (team_id, user_id, role, is_active)
+    SELECT t.team_id, u.user_id, 'MEMBER', true
+    FROM (SELECT team_id, row_number() OVER (ORDER BY team_id) - 1 AS rn
+          FROM teams WHERE team_name LIKE 'explain-%') t
+    JOIN (SELECT user_id, row_number() OVER (ORDER BY email) - 1 AS rn
+          FROM users WHERE email LIKE 'explain-%') u
+      ON u.rn % {TEAMS} = t.rn
+    """,
+    f"""
+    INSERT INTO sprints (team_id, name)
+    SELECT team_id, 'explain-sprint-' || g
+    FROM teams, generate_series(1, {SPRINTS_PER_TEAM}) g
+    WHERE team_name LIKE 'explain-%'
+    """,
+    f"""
+    INSERT INTO tasks (sprint_id, title, status, priority)
+    SELECT sprint_id, 'task ' || g,
+           (ARRAY['TODO', 'DOING', 'DONE', 'BLOCKED'])[1 + g % 4], 'MEDIUM'
+    FROM sprints, generate_series(1, {TASKS_PER_SPRINT}) g
+    WHERE name LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO channels (team_id, name, type)
+    SELECT team_id, 'explain-general', 'general' FROM teams WHERE team_name LIKE 'explain-%'
+    """,
+    f"""
+    INSERT INTO messages (channel_id, sender_id, content, sent_at)
+    SELECT c.channel_id, tm.user_id, 'message ' || g, now() - g * interval '1 minute'
+    FROM channels c
+    JOIN LATERAL (SELECT user_id FROM team_members WHERE team_id = c.team_id LIMIT 1) tm ON true
+    CROSS JOIN generate_series(1, {MESSAGES_PER_TEAM}) g
+    WHERE c.name = 'explain-general'
+    """,
+    f"""
+    INSERT INTO notifications (user_id, title, message, notification_type, is_read, created_at)
+    SELECT user_id, 'n' || g, 'body', 'info', g % 3 = 0, now() - g * interval '1 hour'
+    FROM users, generate_series(1, {NOTIFICATIONS_PER_USER}) g
+    WHERE email LIKE 'explain-%'
+    """,
+    f"""
+    INSERT INTO milestones (class_id, title, created_by)
+    SELECT class_id, 'explain-milestone-' || g, lecturer_id
+    FROM academic_classes, generate_series(1, {MILESTONES_PER_CLASS}) g
+    WHERE class_code LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO checkpoints (team_id, milestone_id, title, status)
+    SELECT t.team_id, m.milestone_id, m.title, 'pending'
+    FROM teams t JOIN milestones m ON m.class_id = t.class_id
+    WHERE t.team_name LIKE 'explain-%'
+    """,
+    f"""
+    INSERT INTO submissions (checkpoint_id, submitted_by, content, submitted_at)
+    SELECT c.checkpoint_id, tm.user_id, 'submission', now() - g * interval '1 day'
+    FROM checkpoints c
+    JOIN LATERAL (SELECT user_id FROM team_members WHERE team_id = c.team_id LIMIT 1) tm ON true
+    CROSS JOIN generate_series(1, {SUBMISSIONS_PER_CHECKPOINT}) g
+    WHERE c.title LIKE 'explain-%'
+    """,
+    f"""
+    INSERT INTO peer_reviews (reviewer_id, reviewee_id, team_id, criteria_name, score)
+    SELECT tm.user_id, tm.user_id, tm.team_id, 'criteria ' || g, 1 + g % 5
+    FROM (SELECT DISTINCT ON (team_id) team_id, user_id FROM team_members
+          WHERE team_id IN (SELECT team_id FROM teams WHERE team_name LIKE 'explain-%')) tm
+    CROSS JOIN generate_series(1, {REVIEWS_PER_TEAM}) g
+    """,
+    """
+    INSERT INTO mentoring_logs (team_id, mentor_id, session_notes, created_at)
+    SELECT t.team_id, ac.lecturer_id, 'notes', now() - g * interval '1 week'
+    FROM teams t JOIN academic_classes ac ON ac.class_id = t.class_id
+    CROSS JOIN generate_series(1, 5) g
+    WHERE t.team_name LIKE 'explain-%'
+    """,
+    f"""
+    INSERT INTO resources (uploaded_by, team_id, title, file_url, file_type, created_at)
+    SELECT ac.lecturer_id, t.team_id, 'resource ' || g, '/uploads/x', 'document',
+           now() - g * interval '1 day'
+    FROM teams t JOIN academic_classes ac ON ac.class_id = t.class_id
+    CROSS JOIN generate_series(1, {RESOURCES_PER_TEAM}) g
+    WHERE t.team_name LIKE 'explain-%'
+    """,
+    f"""
+    INSERT INTO class_enrollments (class_id, student_id)
+    SELECT c.min_id + (u.rn + g) % {CLASSES}, u.user_id
+    FROM (SELECT user_id, row_number() OVER (ORDER BY email) AS rn
+          FROM users WHERE email LIKE 'explain-%') u
+    CROSS JOIN (SELECT min(class_id) AS min_id FROM academic_classes
+                WHERE class_code LIKE 'explain-%') c
+    CROSS JOIN generate_series(1, {ENROLLMENTS_PER_USER}) g
+    """,
+]
+
+ANALYZE_TABLES = [
+    "users", "teams", "team_members", "sprints", "tasks", "channels", "messages",
+    "notifications", "milestones", "checkpoints", "submissions", "peer_reviews",
+    "mentoring_logs", "resources", "class_enrollments",
+]
+
+
+async def _sample(conn, sql: str):
+    result = await conn.execute(text(sql))
+    return result.first()
+
+
+def build_queries(s) -> dict:
+    """Statements mirroring what the list endpoints send, keyed by endpoint."""
+    user_id: UUID = s["user_id"]
+    return {
+        "GET /messages (history page)": (
+            "messages",
+            select(Message)
+            .where(Message.channel_id == s["channel_id"])
+            .order_by(desc(Message.sent_at), desc(Message.message_id))
+            .limit(51),
+        ),
+        "GET /messages/search": (
+            "messages",
+            select(Message.message_id)
+            .where(
+                Message.channel_id.in_(
+                    select(Channel.channel_id)
+                    .join(TeamMember, TeamMember.team_id == Channel.team_id)
+                    .where(TeamMember.user_id == user_id)
+                ),
+                Message.search_vector.op("@@")(
+                    func.websearch_to_tsquery(literal_column("'simple'::regconfig"), "42")
+                ),
+            )
+            .order_by(desc(Message.message_id))
+            .limit(21),
+        ),
+        "GET /notifications (unread)": (
+            "notifications",
+            select(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read == False)  # noqa: E712
+            .order_by(Notification.created_at.desc())
+            .limit(20),
+        ),
+        "GET /notifications (all)": (
+            "notifications",
+            select(Notification)
+            .where(Notification.user_id == user_id)
+            .order_by(Notification.created_at.desc())
+            .limit(20),
+        ),
+        "membership lookup by user": (
+            "team_members",
+            select(TeamMember.team_id).where(TeamMember.user_id == user_id),
+        ),
+        "GET /tasks/sprints/{id}/tasks": (
+            "tasks",
+            select(Task).where(Task.sprint_id == s["sprint_id"], Task.status == "DOING"),
+        ),
+        "GET /tasks/teams/{id}/sprints": (
+            "sprints",
+            select(Sprint).where(Sprint.team_id == s["team_id"]).order_by(Sprint.created_at.desc()),
+        ),
+        "GET /milestones/{id}/checkpoints?team_id=": (
+            "checkpoints",
+            select(Checkpoint)
+            .where(Checkpoint.milestone_id == s["milestone_id"], Checkpoint.team_id == s["team_id"])
+            .order_by(Checkpoint.checkpoint_id),
+        ),
+        "GET /milestones/{id}/checkpoints": (
+            "checkpoints",
+            select(Checkpoint)
+            .where(Checkpoint.milestone_id == s["milestone_id"])
+            .order_by(Checkpoint.checkpoint_id),
+        ),
+        "GET /submissions?checkpoint_id=": (
+            "submissions",
+            select(Submission)
+            .where(Submission.checkpoint_id == s["checkpoint_id"])
+            .order_by(Submission.submitted_at.desc())
+            .limit(20),
+        ),
+        "GET /peer-reviews?reviewee_id=": (
+            "peer_reviews",
+            select(PeerReview).where(
+                PeerReview.team_id == s["team_id"], PeerReview.reviewee_id == user_id
+            ),
+        ),
+        "GET /mentoring/logs": (
+            "mentoring_logs",
+            select(MentoringLog)
+            .where(MentoringLog.team_id == s["team_id"])
+            .order_by(MentoringLog.created_at.desc())
+            .limit(20),
+        ),
+        "GET /resources?team_id=": (
+            "resources",
+            select(Resource)
+            .where(Resource.team_id == s["team_id"])
+            .order_by(Resource.created_at.desc())
+            .limit(20),
+        ),
+        "POST /enrollments (duplicate check)": (
+            "class_enrollments",
+            select(ClassEnrollment).where(
+                and_(
+                    ClassEnrollment.class_id == s["class_id"],
+                    ClassEnrollment.student_id == user_id,
+                )
+            ),
+        ),
+        "GET /enrollments/class/{id}": (
+            "class_enrollments",
+            select(ClassEnrollment).where(ClassEnrollment.class_id == s["class_id"]),
+        ),
+    }
+
+
+def find_seq_scans(plan: dict, table: str) -> list:
+    """Return the Seq Scan nodes in an EXPLAIN JSON plan that read `table`."""
+    hits = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") == table:
+        hits.append(plan)
+    for child in plan.get("Plans", []):
+        hits.extend(find_seq_scans(child, table))
+    return hits
+
+
+async def main() -> int:
+    failures = []
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            print("Seeding synthetic dataset...")
+            for sql in SEED_SQL:
+                await conn.execute(text(sql))
+            for table in ANALYZE_TABLES:
+                await conn.execute(text(f"ANALYZE {table}"))
+
+            team = await _sample(conn, "SELECT team_id, class_id FROM teams WHERE team_name = 'explain-team-500'")
+            member = await _sample(conn, f"SELECT user_id FROM team_members WHERE team_id = {team.team_id} LIMIT 1")
+            channel = await _sample(conn, f"SELECT channel_id FROM channels WHERE team_id = {team.team_id}")
+            sprint = await _sample(conn, f"SELECT sprint_id FROM sprints WHERE team_id = {team.team_id} LIMIT 1")
+            checkpoint = await _sample(
+                conn, f"SELECT checkpoint_id, milestone_id FROM checkpoints WHERE team_id = {team.team_id} LIMIT 1"
+            )
+            sample = {
+                "team_id": team.team_id,
+                "class_id": team.class_id,
+                "user_id": member.user_id,
+                "channel_id": channel.channel_id,
+                "sprint_id": sprint.sprint_id,
+                "checkpoint_id": checkpoint.checkpoint_id,
+                "milestone_id": checkpoint.milestone_id,
+            }
+
+            for name, (table, stmt) in build_queries(sample).items():
+                sql = str(
+                    stmt.compile(
+                        dialect=postgresql.dialect(),
+                        compile_kwargs={"literal_binds": True},
+                    )
+                )
+                result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                raw = result.scalar()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                seq_scans = find_seq_scans(plan, table)
+                if seq_scans:
+                    failures.append(name)
+                    print(f"[FAIL] {name}: Seq Scan on {table}")
+                else:
+                    print(f"[PASS] {name}: {plan['Node Type']}")
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+    if failures:
+        print(f"\n{len(failures)} query(ies) fell back to a sequential scan")
+        return 1
+    print("\nAll hot lookups use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
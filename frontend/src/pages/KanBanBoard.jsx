@@ -3,6 +3,7 @@ import { Layout, Typography, Button, Card, Col, Row, Select, Modal, Form, Input,
 import { PlusOutlined, DeleteOutlined, CalendarOutlined, FlagOutlined } from '@ant-design/icons';
 import { tasksService } from '../services/tasksService';
 import { teamService } from '../services/api';
+import { joinTeam, leaveTeam, onTaskUpdated, removeListener } from '../services/socketService';
 import MainLayout from '../components/MainLayout';
 import dayjs from 'dayjs';
 
@@ -113,6 +114,31 @@ const KanBanBoard = () => {
         }
     }, [currentSprintId]);
 
+    // Task changes of the team arrive over the socket instead of refetching
+    useEffect(() => {
+        if (!selectedTeamId) return;
+
+        joinTeam(selectedTeamId);
+        onTaskUpdated((payload) => {
+            const task = payload?.task;
+            if (!task || payload.team_id !== selectedTeamId) return;
+
+            if (task.change === 'created') {
+                if (task.sprint_id === currentSprintId) fetchSprintTasks(currentSprintId);
+                return;
+            }
+            const { change, ...fields } = task;
+            setTasks(prev => (change === 'deleted' || fields.sprint_id !== currentSprintId)
+                ? prev.filter(t => t.task_id !== task.task_id)
+                : prev.map(t => t.task_id === task.task_id ? { ...t, ...fields } : t));
+        });
+
+        return () => {
+            removeListener('task_updated');
+            leaveTeam(selectedTeamId);
+        };
+    }, [selectedTeamId, currentSprintId]);
+
     // Load sprints for task modal when it opens
     useEffect(() => {
         if (isTaskModalOpen && selectedTeamId) {
@@ -140,11 +166,7 @@ const KanBanBoard = () => {
             setIsTaskModalOpen(false);
             taskForm.resetFields();
             setTaskModalSprints([]); // Clear task modal sprints
-
-            // Refresh tasks if the created task belongs to current sprint
-            if (values.sprint_id === currentSprintId) {
-                fetchSprintTasks(currentSprintId);
-            }
+            // The board picks the new task up from the task_updated event
         } catch (error) {
             console.error("Create task error:", error);
             message.error(error.response?.data?.detail || 'Failed to create task');
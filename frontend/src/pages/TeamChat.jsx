@@ -128,8 +128,9 @@ const TeamChat = () => {
         if (!selectedChannelId || loadingMessages) return;
         setLoadingMessages(true);
         try {
-            const skip = reset ? 0 : messagesRef.current.length;
-            const res = await getMessages(selectedChannelId, { skip, limit: PAGE_SIZE });
+            const oldest = reset ? null : messagesRef.current[0];
+            const beforeId = oldest?.message_id || oldest?.id || null;
+            const res = await getMessages(selectedChannelId, { beforeId, limit: PAGE_SIZE });
             const list = res?.items || res?.data || res || [];
             const normalized = normalizeMessages(list);
 
@@ -208,24 +209,31 @@ const TeamChat = () => {
             setMessages((prev) => prev.filter((msg) => String(msg.id || msg.message_id) !== String(messageId)));
         };
 
+        const removeTypingUser = (userId) => {
+            if (typingTimeoutsRef.current.has(userId)) {
+                clearTimeout(typingTimeoutsRef.current.get(userId));
+                typingTimeoutsRef.current.delete(userId);
+            }
+            setTypingUsers((prev) => prev.filter((id) => id !== userId));
+        };
+
         const handleTypingEvent = (payload) => {
             if (String(payload.channel_id) !== String(selectedChannelId)) return;
-            if (payload.user_id && String(payload.user_id) === String(currentUserId)) return;
+            const isOther = (userId) => String(userId) !== String(currentUserId);
+            const typing = (payload.user_ids || []).filter(isOther);
 
-            setTypingUsers((prev) => {
-                const next = new Set(prev);
-                next.add(payload.user_id || 'unknown');
-                return Array.from(next);
-            });
+            (payload.stopped || []).forEach(removeTypingUser);
+            if (typing.length === 0) return;
 
-            if (typingTimeoutsRef.current.has(payload.user_id)) {
-                clearTimeout(typingTimeoutsRef.current.get(payload.user_id));
-            }
-            const timeout = setTimeout(() => {
-                setTypingUsers((prev) => prev.filter((id) => id !== payload.user_id));
-                typingTimeoutsRef.current.delete(payload.user_id);
-            }, 2000);
-            typingTimeoutsRef.current.set(payload.user_id, timeout);
+            setTypingUsers((prev) => Array.from(new Set([...prev, ...typing])));
+            typing.forEach((userId) => {
+                if (typingTimeoutsRef.current.has(userId)) {
+                    clearTimeout(typingTimeoutsRef.current.get(userId));
+                }
+                // Snapshot kế tiếp sẽ gia hạn nếu user vẫn đang gõ
+                const timeout = setTimeout(() => removeTypingUser(userId), payload.ttl_ms || 3000);
+                typingTimeoutsRef.current.set(userId, timeout);
+            });
         };
 
         onNewMessage(handleIncomingMessage);
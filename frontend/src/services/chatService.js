@@ -35,19 +35,29 @@ export const sendMessage = async (data) => {
     return response.data;
 };
 
-export const getMessages = async (channelId, { skip = 0, limit = 50 } = {}) => {
-    const response = await api.get('/messages', {
-        params: {
-            channel_id: channelId,
-            skip,
-            limit
-        }
-    });
+export const getMessages = async (channelId, { skip = 0, limit = 50, beforeId = null } = {}) => {
+    const params = { channel_id: channelId, limit };
+    // Cursor paging (before_id) seeks on the index; skip is kept for old callers
+    if (beforeId) {
+        params.before_id = beforeId;
+    } else {
+        params.skip = skip;
+    }
+    const response = await api.get('/messages', { params });
     if (Array.isArray(response.data?.messages)) return response.data.messages;
     if (Array.isArray(response.data?.items)) return response.data.items;
     return response.data;
 };
 
+// Full-text search across the user's channels; highlight is escaped HTML with <mark> tags
+export const searchMessages = async (query, { channelId = null, limit = 20, cursor = null } = {}) => {
+    const params = { q: query, limit };
+    if (channelId) params.channel_id = channelId;
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/messages/search', { params });
+    return response.data;
+};
+
 export const getMessage = async (messageId) => {
     const response = await api.get(`/messages/${messageId}`);
     return response.data;
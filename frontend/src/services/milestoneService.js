@@ -56,6 +56,24 @@ export const deleteMilestone = async (milestoneId) => {
   await api.delete(`/milestones/${milestoneId}`);
 };
 
+/**
+ * Tải ZIP tất cả bài nộp của milestone (kèm manifest.csv: thời gian nộp, trễ hạn)
+ * @param {number} milestoneId - ID của milestone
+ */
+export const downloadMilestoneSubmissions = async (milestoneId) => {
+  const response = await api.get(`/milestones/${milestoneId}/submissions/export`, {
+    responseType: 'blob'
+  });
+  const url = URL.createObjectURL(response.data);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = `milestone-${milestoneId}-submissions.zip`;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  URL.revokeObjectURL(url);
+};
+
 
 // ============ CHECKPOINTS ============
 
@@ -162,6 +180,7 @@ export default {
   getMilestone,
   updateMilestone,
   deleteMilestone,
+  downloadMilestoneSubmissions,
   createCheckpoint,
   listCheckpoints,
   updateCheckpoint,
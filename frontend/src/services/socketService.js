@@ -101,12 +101,17 @@ export const leaveChannel = (channelId) => {
  * Gửi tin nhắn qua socket (real-time)
  * @param {number} channelId - ID của channel
  * @param {string} content - Nội dung tin nhắn
+ * @param {string} [clientId] - ID tạm phía client, được trả lại trong ack
+ * @returns {Promise<object|null>} Ack { message_id, sent_at, client_id } hoặc { error, client_id }
  */
-export const sendMessageSocket = (channelId, content) => {
-    if (!socket) return;
-    socket.emit('new_message', {
-        channel_id: channelId,
-        content: content
+export const sendMessageSocket = (channelId, content, clientId = null) => {
+    if (!socket) return Promise.resolve(null);
+    return new Promise((resolve) => {
+        socket.emit('new_message', {
+            channel_id: channelId,
+            content: content,
+            client_id: clientId
+        }, resolve);
     });
 };
 
@@ -141,13 +146,35 @@ export const onMessageDeleted = (callback) => {
 };
 
 /**
- * Lắng nghe typing indicator
- * @param {function} callback - Handler function({ user_id, user_name, channel_id })
+ * Lấy danh sách thành viên đang online của team
+ * @param {number} teamId - ID của team
+ * @returns {Promise<object|null>} { team_id, online, member_count } hoặc { error }
+ */
+export const requestPresence = (teamId) => {
+    if (!socket) return Promise.resolve(null);
+    return new Promise((resolve) => {
+        socket.emit('presence', { team_id: teamId }, resolve);
+    });
+};
+
+/**
+ * Lắng nghe thay đổi online của team (cần joinTeam trước)
+ * @param {function} callback - Handler function({ team_id, online, member_count })
+ */
+export const onPresence = (callback) => {
+    if (!socket) return;
+    socket.on('presence_snapshot', callback);
+    listeners.set('presence_snapshot', callback);
+};
+
+/**
+ * Lắng nghe typing indicator (snapshot định kỳ của mỗi channel)
+ * @param {function} callback - Handler function({ channel_id, user_ids, stopped, ttl_ms })
  */
 export const onTyping = (callback) => {
     if (!socket) return;
-    socket.on('user_typing', callback);
-    listeners.set('user_typing', callback);
+    socket.on('typing_snapshot', callback);
+    listeners.set('typing_snapshot', callback);
 };
 
 /**
@@ -204,6 +231,44 @@ export const onTaskUpdated = (callback) => {
 };
 
 
+// ============ RECONNECT SYNC ============
+
+/**
+ * Yêu cầu server gửi lại các thay đổi bị bỏ lỡ (gọi sau khi reconnect)
+ * Kết quả đến qua onSyncMessages / onSyncTasks theo từng batch.
+ * @param {Object} channels - { channelId: lastSeenMessageId }
+ * @param {Object} teams - { teamId: lastSeenMarker } (marker = updated_at/created_at của task mới nhất, null = tất cả)
+ * @returns {Promise<Object>} Tóm tắt: last_message_id / marker mới, truncated (true = tải lại qua REST)
+ */
+export const requestSync = (channels = {}, teams = {}) => {
+    if (!socket) return Promise.resolve(null);
+    return new Promise((resolve) => {
+        socket.emit('sync', { channels, teams }, resolve);
+    });
+};
+
+/**
+ * Lắng nghe batch tin nhắn bị bỏ lỡ
+ * @param {function} callback - Handler function({ channel_id, messages, has_more })
+ */
+export const onSyncMessages = (callback) => {
+    if (!socket) return;
+    socket.on('sync_messages', callback);
+    listeners.set('sync_messages', callback);
+};
+
+/**
+ * Lắng nghe batch task thay đổi bị bỏ lỡ
+ * @param {function} callback - Handler function({ team_id, tasks, task_ids, task_ids_truncated, marker, has_more })
+ * (task_ids_truncated = true: task_ids chưa đủ, không dùng để xóa task)
+ */
+export const onSyncTasks = (callback) => {
+    if (!socket) return;
+    socket.on('sync_tasks', callback);
+    listeners.set('sync_tasks', callback);
+};
+
+
 // ============ CLEANUP ============
 
 /**
@@ -241,10 +306,15 @@ export default {
     onNewMessage,
     onTyping,
     sendTyping,
+    requestPresence,
+    onPresence,
     onNotification,
     joinTeam,
     leaveTeam,
     onTaskUpdated,
+    requestSync,
+    onSyncMessages,
+    onSyncTasks,
     removeAllListeners,
     removeListener
 };
@@ -18,11 +18,19 @@ export const createSubmission = async (submissionData) => {
   return response.data;
 };
 
+// File lớn hơn ngưỡng này dùng resumable upload (gửi theo chunk)
+const RESUMABLE_THRESHOLD = 20 * 1024 * 1024;
+const CHUNK_RETRIES = 3;
+
 /**
  * Upload submission file
  * @param {File} file - File object
+ * @param {object} options - { onProgress?(fraction) } (chỉ dùng cho file lớn)
  */
-export const uploadSubmissionFile = async (file) => {
+export const uploadSubmissionFile = async (file, options = {}) => {
+  if (file.size > RESUMABLE_THRESHOLD) {
+    return uploadSubmissionFileResumable(file, options);
+  }
   const formData = new FormData();
   formData.append('file', file);
   const response = await api.post('/submissions/upload', formData, {
@@ -31,6 +39,56 @@ export const uploadSubmissionFile = async (file) => {
   return response.data;
 };
 
+const sessionKey = (file) => `upload-session:${file.name}:${file.size}:${file.lastModified}`;
+
+/**
+ * Upload file lớn theo chunk; gọi lại với cùng file sau khi mất mạng thì chỉ
+ * gửi các chunk còn thiếu (upload_id lưu trong localStorage)
+ * @param {File} file - File object
+ * @param {object} options - { onProgress?(fraction) }
+ */
+export const uploadSubmissionFileResumable = async (file, { onProgress } = {}) => {
+  const key = sessionKey(file);
+  let session = null;
+  const savedId = localStorage.getItem(key);
+  if (savedId) {
+    try {
+      session = (await api.get(`/submissions/uploads/${savedId}`)).data;
+    } catch {
+      localStorage.removeItem(key);  // hết hạn hoặc đã xong
+    }
+  }
+  if (!session) {
+    session = (await api.post('/submissions/uploads', {
+      file_name: file.name,
+      file_size: file.size
+    })).data;
+    localStorage.setItem(key, session.upload_id);
+  }
+
+  const { upload_id: uploadId, chunk_size: chunkSize, chunk_count: chunkCount } = session;
+  let done = chunkCount - session.missing_chunks.length;
+  for (const index of session.missing_chunks) {
+    const chunk = file.slice(index * chunkSize, (index + 1) * chunkSize);
+    for (let attempt = 1; ; attempt++) {
+      try {
+        await api.put(`/submissions/uploads/${uploadId}/chunks/${index}`, chunk, {
+          headers: { 'Content-Type': 'application/octet-stream' }
+        });
+        break;
+      } catch (error) {
+        if (attempt >= CHUNK_RETRIES || error.response?.status === 404) throw error;
+      }
+    }
+    done += 1;
+    onProgress?.(done / chunkCount);
+  }
+
+  const response = await api.post(`/submissions/uploads/${uploadId}/complete`);
+  localStorage.removeItem(key);
+  return response.data;
+};
+
 /**
  * Lấy danh sách submissions
  * @param {object} options - { milestone_id?, team_id?, graded_only?, page?, limit? }
@@ -127,6 +185,7 @@ export const formatSubmissionTime = (submittedAt) => {
 export default {
   createSubmission,
   uploadSubmissionFile,
+  uploadSubmissionFileResumable,
   getSubmissions,
   getSubmission,
   updateSubmission,